@@ -1,5 +1,7 @@
 from app.core.config import CORE_SETTINGS
 from app.models.pollution_data import Base
+from app.models.weather_data import WeatherData  # noqa: F401 - registers weather_data on Base.metadata
+from app.models import alert, data_version, rollups, sensor  # noqa: F401 - registers these tables on Base.metadata
 from alembic import context
 from sqlalchemy import create_engine
 
@@ -0,0 +1,167 @@
+"""Partition pollution_data and weather_data by month
+
+Revision ID: 7c3f2a91d0b4
+Revises: 236672482991
+Create Date: 2026-10-18 09:12:44.118204
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3f2a91d0b4'
+down_revision: Union[str, None] = '236672482991'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Number of months created ahead of the current one; app.scripts.create_partitions keeps this topped up
+MONTHS_AHEAD = 3
+
+# Column definitions mirror app/models. The partition key (date) must be NOT NULL and part of the primary key.
+TABLE_COLUMNS = {
+    "pollution_data": """
+        id SERIAL,
+        air_quality_index INTEGER NOT NULL,
+        water_quality_index INTEGER NOT NULL,
+        ph_level DOUBLE PRECISION NOT NULL,
+        temperature DOUBLE PRECISION NOT NULL,
+        date TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+        PRIMARY KEY (id, date)
+    """,
+    "weather_data": """
+        id SERIAL,
+        temperature DOUBLE PRECISION,
+        feels_like DOUBLE PRECISION,
+        humidity INTEGER,
+        weather_description VARCHAR,
+        wind_speed DOUBLE PRECISION,
+        rain_mm DOUBLE PRECISION,
+        sunrise INTEGER,
+        sunset INTEGER,
+        city VARCHAR,
+        country VARCHAR,
+        date TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+        PRIMARY KEY (id, date)
+    """,
+}
+
+TABLE_COLUMN_NAMES = {
+    "pollution_data": "id, air_quality_index, water_quality_index, ph_level, temperature, date",
+    "weather_data": "id, temperature, feels_like, humidity, weather_description, wind_speed, rain_mm, "
+                    "sunrise, sunset, city, country, date",
+}
+
+CREATE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION create_monthly_partitions(parent regclass, from_month date, months integer)
+RETURNS integer AS $$
+DECLARE
+    month_start date := date_trunc('month', from_month)::date;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    FOR i IN 1..months LOOP
+        partition_name := format('%s_%s', parent::text, to_char(month_start, 'YYYY_MM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                partition_name, parent, month_start, (month_start + interval '1 month')::date
+            );
+            created := created + 1;
+        END IF;
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+RENAME_INDEXES = """
+DO $$
+DECLARE idx record;
+BEGIN
+    FOR idx IN SELECT indexname FROM pg_indexes
+               WHERE schemaname = current_schema() AND tablename = '{table}'
+    LOOP
+        EXECUTE format('ALTER INDEX %I RENAME TO %I', idx.indexname, idx.indexname || '_old');
+    END LOOP;
+END $$;
+"""
+
+
+def _relkind(table: str):
+    return op.get_bind().execute(
+        sa.text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+    ).scalar()
+
+
+def _months_between(start: date, end: date) -> int:
+    return (end.year - start.year) * 12 + (end.month - start.month) + 1
+
+
+def _set_aside(table: str) -> str:
+    """
+    Rename an existing table (and its indexes/sequence) so the new one can take its names.
+    """
+    old = f"{table}_old"
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(RENAME_INDEXES.format(table=old))
+    op.execute(f"ALTER SEQUENCE IF EXISTS {table}_id_seq RENAME TO {old}_id_seq")
+    return old
+
+
+def upgrade() -> None:
+    op.execute(CREATE_PARTITION_FUNCTION)
+
+    today = date.today()
+    for table, columns in TABLE_COLUMNS.items():
+        # Tables created earlier by Base.metadata.create_all are plain heaps: move their rows over
+        old = _set_aside(table) if _relkind(table) == "r" else None
+
+        op.execute(f"CREATE TABLE {table} ({columns}) PARTITION BY RANGE (date)")
+        # Indexes on the parent cascade to every partition, including ones created later
+        op.execute(f"CREATE INDEX ix_{table}_date_brin ON {table} USING brin (date)")
+        op.execute(f"CREATE INDEX ix_{table}_date_id ON {table} (date, id)")
+        op.execute(f"CREATE INDEX ix_{table}_id ON {table} (id)")
+
+        first_month = today
+        if old:
+            oldest = op.get_bind().execute(sa.text(f"SELECT min(date) FROM {old}")).scalar()
+            if oldest and oldest.date() < today:
+                first_month = oldest.date()
+        months = _months_between(first_month, today) + MONTHS_AHEAD
+        op.execute(
+            sa.text("SELECT create_monthly_partitions(CAST(:parent AS regclass), :from_month, :months)")
+            .bindparams(parent=table, from_month=first_month, months=months)
+        )
+        # Catch-all so inserts beyond the prepared months never fail
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+        if old:
+            column_names = TABLE_COLUMN_NAMES[table]
+            op.execute(
+                f"INSERT INTO {table} ({column_names}) "
+                f"SELECT {column_names.replace('date', 'COALESCE(date, now())')} FROM {old}"
+            )
+            op.execute(f"SELECT setval('{table}_id_seq', COALESCE((SELECT max(id) FROM {table}), 0) + 1, false)")
+            op.execute(f"DROP TABLE {old}")
+
+
+def downgrade() -> None:
+    for table, columns in TABLE_COLUMNS.items():
+        if _relkind(table) != "p":
+            continue
+        old = _set_aside(table)
+        plain_columns = columns.replace("PRIMARY KEY (id, date)", "PRIMARY KEY (id)")
+        op.execute(f"CREATE TABLE {table} ({plain_columns})")
+        op.execute(f"CREATE INDEX ix_{table}_id ON {table} (id)")
+        column_names = TABLE_COLUMN_NAMES[table]
+        op.execute(f"INSERT INTO {table} ({column_names}) SELECT {column_names} FROM {old}")
+        op.execute(f"SELECT setval('{table}_id_seq', COALESCE((SELECT max(id) FROM {table}), 0) + 1, false)")
+        # Dropping the parent drops all of its partitions
+        op.execute(f"DROP TABLE {old}")
+
+    op.execute("DROP FUNCTION IF EXISTS create_monthly_partitions(regclass, date, integer)")
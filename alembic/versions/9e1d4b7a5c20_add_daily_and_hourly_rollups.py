@@ -0,0 +1,107 @@
+"""Add daily and hourly rollups for pollution and weather data
+
+Revision ID: 9e1d4b7a5c20
+Revises: 7c3f2a91d0b4
+Create Date: 2026-10-18 11:40:02.583911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e1d4b7a5c20'
+down_revision: Union[str, None] = '7c3f2a91d0b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+POLLUTION_METRICS = ("air_quality_index", "water_quality_index", "ph_level", "temperature")
+WEATHER_METRICS = ("temperature", "humidity", "rain_mm", "wind_speed")
+
+# Source name recorded in rollup_dirty_days for each raw table
+SOURCES = {"pollution_data": "pollution", "weather_data": "weather"}
+
+MARK_DIRTY_FUNCTION = """
+CREATE OR REPLACE FUNCTION mark_rollup_days_dirty() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO rollup_dirty_days (source, day)
+        SELECT DISTINCT TG_ARGV[0], date::date FROM new_rows
+        ON CONFLICT DO NOTHING;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO rollup_dirty_days (source, day)
+        SELECT DISTINCT TG_ARGV[0], date::date FROM old_rows
+        ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Transition tables can only be attached to single-event triggers
+TRIGGER_EVENTS = {
+    "insert": "INSERT REFERENCING NEW TABLE AS new_rows",
+    "update": "UPDATE REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "delete": "DELETE REFERENCING OLD TABLE AS old_rows",
+}
+
+
+def _metric_columns(metric: str, nullable: bool):
+    columns = [sa.Column(f"{metric}_count", sa.Integer(), nullable=False)] if nullable else []
+    return columns + [
+        sa.Column(f"{metric}_{suffix}", sa.Float(), nullable=nullable)
+        for suffix in ("sum", "sumsq", "min", "max")
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "pollution_rollup",
+        sa.Column("granularity", sa.String(), nullable=False),
+        sa.Column("bucket", sa.DateTime(), nullable=False),
+        sa.Column("sample_count", sa.Integer(), nullable=False),
+        *[column for metric in POLLUTION_METRICS for column in _metric_columns(metric, nullable=False)],
+        sa.Column("air_quality_index_temperature_sum", sa.Float(), nullable=False),
+        sa.Column("water_quality_index_temperature_sum", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("granularity", "bucket"),
+    )
+    op.create_table(
+        "weather_rollup",
+        sa.Column("granularity", sa.String(), nullable=False),
+        sa.Column("bucket", sa.DateTime(), nullable=False),
+        sa.Column("sample_count", sa.Integer(), nullable=False),
+        *[column for metric in WEATHER_METRICS for column in _metric_columns(metric, nullable=True)],
+        sa.PrimaryKeyConstraint("granularity", "bucket"),
+    )
+    op.create_table(
+        "rollup_dirty_days",
+        sa.Column("source", sa.String(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint("source", "day"),
+    )
+
+    op.execute(MARK_DIRTY_FUNCTION)
+    for table, source in SOURCES.items():
+        for event, clause in TRIGGER_EVENTS.items():
+            op.execute(
+                f"CREATE TRIGGER {table}_rollup_{event} AFTER {clause} ON {table} "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION mark_rollup_days_dirty('{source}')"
+            )
+        # Existing history is queued so the first refresh builds its rollups
+        op.execute(
+            f"INSERT INTO rollup_dirty_days (source, day) "
+            f"SELECT DISTINCT '{source}', date::date FROM {table} ON CONFLICT DO NOTHING"
+        )
+
+
+def downgrade() -> None:
+    for table in SOURCES:
+        for event in TRIGGER_EVENTS:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_rollup_{event} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS mark_rollup_days_dirty()")
+    op.drop_table("rollup_dirty_days")
+    op.drop_table("weather_rollup")
+    op.drop_table("pollution_rollup")
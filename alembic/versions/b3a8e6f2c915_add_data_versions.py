@@ -0,0 +1,54 @@
+"""Add per-table data versions bumped by write triggers
+
+Revision ID: b3a8e6f2c915
+Revises: 9e1d4b7a5c20
+Create Date: 2026-10-18 14:05:37.402265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3a8e6f2c915'
+down_revision: Union[str, None] = '9e1d4b7a5c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ("pollution_data", "weather_data")
+
+BUMP_VERSION_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE data_versions SET version = version + 1, updated_at = now() WHERE table_name = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "data_versions",
+        sa.Column("table_name", sa.String(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("table_name"),
+    )
+    op.execute(BUMP_VERSION_FUNCTION)
+    for table in VERSIONED_TABLES:
+        op.execute(f"INSERT INTO data_versions (table_name, version) VALUES ('{table}', 1)")
+        # One bump per statement, so a batched insert costs a single extra UPDATE
+        op.execute(
+            f"CREATE TRIGGER {table}_data_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version()"
+        )
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_data_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_data_version()")
+    op.drop_table("data_versions")
@@ -0,0 +1,56 @@
+"""Add sensor registry and pollution_data.sensor_id
+
+Revision ID: c7d2e9f4a613
+Revises: b3a8e6f2c915
+Create Date: 2026-10-18 15:22:09.731540
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e9f4a613'
+down_revision: Union[str, None] = 'b3a8e6f2c915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Sensor that existing readings (and writers that don't send a sensor yet) belong to
+DEFAULT_SENSOR_ID = 1
+DEFAULT_SENSOR_CODE = "phewa-001"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sensors",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("code", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("latitude", sa.Float(), nullable=True),
+        sa.Column("longitude", sa.Float(), nullable=True),
+        sa.Column("active", sa.Boolean(), server_default=sa.true(), nullable=False),
+        sa.Column("installed_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("code"),
+    )
+    op.execute(
+        f"INSERT INTO sensors (id, code, name, latitude, longitude) "
+        f"VALUES ({DEFAULT_SENSOR_ID}, '{DEFAULT_SENSOR_CODE}', 'Phewa Lake', 28.2099, 83.9805)"
+    )
+    op.execute("SELECT setval('sensors_id_seq', (SELECT max(id) FROM sensors))")
+
+    # A constant default is stored in the catalog, so existing partitions are not rewritten
+    op.execute(
+        f"ALTER TABLE pollution_data ADD COLUMN sensor_id INTEGER NOT NULL DEFAULT {DEFAULT_SENSOR_ID} "
+        f"REFERENCES sensors (id)"
+    )
+    # Created on the parent, so it cascades to every partition (including future ones)
+    op.execute("CREATE INDEX ix_pollution_data_sensor_id_date ON pollution_data (sensor_id, date)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_pollution_data_sensor_id_date")
+    op.execute("ALTER TABLE pollution_data DROP COLUMN IF EXISTS sensor_id")
+    op.drop_table("sensors")
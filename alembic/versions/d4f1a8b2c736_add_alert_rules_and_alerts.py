@@ -0,0 +1,60 @@
+"""Add alert rules and fired alerts
+
+Revision ID: d4f1a8b2c736
+Revises: c7d2e9f4a613
+Create Date: 2026-10-18 16:48:51.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f1a8b2c736'
+down_revision: Union[str, None] = 'c7d2e9f4a613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "alert_rules",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("metric", sa.String(), nullable=False),
+        sa.Column("sensor_id", sa.Integer(), nullable=True),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("operator", sa.String(), nullable=False),
+        sa.Column("threshold", sa.Float(), nullable=False),
+        sa.Column("window_seconds", sa.Integer(), nullable=True),
+        sa.Column("cooldown_seconds", sa.Integer(), server_default="300", nullable=False),
+        sa.Column("enabled", sa.Boolean(), server_default=sa.true(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["sensor_id"], ["sensors.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "alerts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("rule_id", sa.Integer(), nullable=False),
+        sa.Column("sensor_id", sa.Integer(), nullable=False),
+        sa.Column("metric", sa.String(), nullable=False),
+        sa.Column("value", sa.Float(), nullable=False),
+        sa.Column("threshold", sa.Float(), nullable=False),
+        sa.Column("reading_date", sa.DateTime(), nullable=False),
+        sa.Column("fired_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column("message", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(["rule_id"], ["alert_rules.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_alerts_fired_at", "alerts", ["fired_at"])
+    op.create_index("ix_alerts_sensor_id_fired_at", "alerts", ["sensor_id", "fired_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_alerts_sensor_id_fired_at", table_name="alerts")
+    op.drop_index("ix_alerts_fired_at", table_name="alerts")
+    op.drop_table("alerts")
+    op.drop_table("alert_rules")
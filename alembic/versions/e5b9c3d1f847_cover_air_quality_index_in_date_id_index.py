@@ -0,0 +1,30 @@
+"""Cover air_quality_index in the pollution_data (date, id) index
+
+Revision ID: e5b9c3d1f847
+Revises: d4f1a8b2c736
+Create Date: 2026-10-18 18:05:37.412908
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b9c3d1f847'
+down_revision: Union[str, None] = 'd4f1a8b2c736'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Pages of `fields=date,air_quality_index` become index-only scans (on vacuumed partitions);
+    # the key is unchanged, so keyset pagination seeks exactly as before
+    op.execute("DROP INDEX IF EXISTS ix_pollution_data_date_id")
+    op.execute("CREATE INDEX ix_pollution_data_date_id ON pollution_data (date, id) INCLUDE (air_quality_index)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_pollution_data_date_id")
+    op.execute("CREATE INDEX ix_pollution_data_date_id ON pollution_data (date, id)")
@@ -0,0 +1,114 @@
+"""Move rows out of the default partition when creating a monthly partition
+
+Revision ID: f6c2d8e4a915
+Revises: e5b9c3d1f847
+Create Date: 2026-10-18 20:41:09.538217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6c2d8e4a915'
+down_revision: Union[str, None] = 'e5b9c3d1f847'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Once rows for a month have landed in <parent>_default, CREATE TABLE ... PARTITION OF for that month
+# fails on the default partition's constraint. The default partition is then detached, the month's
+# partition created, its rows moved over and the default partition attached again, all in the
+# caller's transaction (the parent is locked exclusively meanwhile).
+CREATE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION create_monthly_partitions(parent regclass, from_month date, months integer)
+RETURNS integer AS $$
+DECLARE
+    month_start date := date_trunc('month', from_month)::date;
+    month_end date;
+    partition_name text;
+    default_partition regclass;
+    column_list text;
+    has_rows boolean;
+    created integer := 0;
+BEGIN
+    SELECT c.oid::regclass INTO default_partition
+    FROM pg_inherits inh JOIN pg_class c ON c.oid = inh.inhrelid
+    WHERE inh.inhparent = parent AND pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT';
+
+    SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) INTO column_list
+    FROM pg_attribute
+    WHERE attrelid = parent AND attnum > 0 AND NOT attisdropped;
+
+    FOR i IN 1..months LOOP
+        month_end := (month_start + interval '1 month')::date;
+        partition_name := format('%s_%s', parent::text, to_char(month_start, 'YYYY_MM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            has_rows := false;
+            IF default_partition IS NOT NULL THEN
+                EXECUTE format('SELECT EXISTS (SELECT 1 FROM %s WHERE date >= %L AND date < %L)',
+                               default_partition, month_start, month_end)
+                INTO has_rows;
+            END IF;
+
+            IF has_rows THEN
+                EXECUTE format('ALTER TABLE %s DETACH PARTITION %s', parent, default_partition);
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, parent, month_start, month_end
+                );
+                EXECUTE format(
+                    'WITH moved AS (DELETE FROM %s WHERE date >= %L AND date < %L RETURNING %s) '
+                    'INSERT INTO %I (%s) SELECT %s FROM moved',
+                    default_partition, month_start, month_end, column_list,
+                    partition_name, column_list, column_list
+                );
+                EXECUTE format('ALTER TABLE %s ATTACH PARTITION %s DEFAULT', parent, default_partition);
+            ELSE
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, parent, month_start, month_end
+                );
+            END IF;
+            created := created + 1;
+        END IF;
+        month_start := month_end;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Definition from revision 7c3f2a91d0b4
+PREVIOUS_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION create_monthly_partitions(parent regclass, from_month date, months integer)
+RETURNS integer AS $$
+DECLARE
+    month_start date := date_trunc('month', from_month)::date;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    FOR i IN 1..months LOOP
+        partition_name := format('%s_%s', parent::text, to_char(month_start, 'YYYY_MM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                partition_name, parent, month_start, (month_start + interval '1 month')::date
+            );
+            created := created + 1;
+        END IF;
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.execute(CREATE_PARTITION_FUNCTION)
+
+
+def downgrade() -> None:
+    op.execute(PREVIOUS_PARTITION_FUNCTION)
@@ -1,6 +1,6 @@
 from pydantic import Field
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 class CoreSettings(BaseSettings):
     """
@@ -15,9 +15,70 @@ class CoreSettings(BaseSettings):
     DB_HOST: str = Field("localhost", env="DB_HOST")  # Default: localhost
     DB_PORT: str = Field("5432", env="DB_PORT")  # Default: 5432
 
+    # Connection pool settings (applied to the primary and every replica engine)
+    DB_POOL_SIZE: int = Field(5, env="DB_POOL_SIZE")  # Connections kept open per engine
+    DB_MAX_OVERFLOW: int = Field(10, env="DB_MAX_OVERFLOW")  # Extra connections allowed under load
+    DB_POOL_TIMEOUT: float = Field(30.0, env="DB_POOL_TIMEOUT")  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = Field(1800, env="DB_POOL_RECYCLE")  # Reconnect after this many seconds (-1 disables)
+    DB_POOL_PRE_PING: bool = Field(True, env="DB_POOL_PRE_PING")  # Test connections on checkout
+
+    # Read replicas: comma-separated postgresql:// URLs. Empty means all reads go to the primary.
+    DB_READ_REPLICA_URLS: str = Field("", env="DB_READ_REPLICA_URLS")
+    DB_REPLICA_RETRY_SECONDS: float = Field(30.0, env="DB_REPLICA_RETRY_SECONDS")  # Skip a failed replica for this long
+
     # API Settings
     API_VERSION: str = "v1"  # Default API version
     WEATHER_API_KEY: Optional[str] = Field(None, env="WEATHER_API_KEY")  # Optional API Key
+    WEATHER_API_TIMEOUT_SECONDS: float = Field(5.0, env="WEATHER_API_TIMEOUT_SECONDS")
+
+    # Rollup settings
+    ROLLUPS_ENABLED: bool = Field(True, env="ROLLUPS_ENABLED")  # Read aggregates from the rollup tables when current
+    ROLLUP_REFRESH_INTERVAL_SECONDS: float = Field(60.0, env="ROLLUP_REFRESH_INTERVAL_SECONDS")  # 0 disables the in-app refresher
+
+    # Pollution overview settings (per-source timeouts)
+    OVERVIEW_LIVE_TIMEOUT_SECONDS: float = Field(1.0, env="OVERVIEW_LIVE_TIMEOUT_SECONDS")
+    OVERVIEW_DB_TIMEOUT_SECONDS: float = Field(2.0, env="OVERVIEW_DB_TIMEOUT_SECONDS")
+    OVERVIEW_WEATHER_TIMEOUT_SECONDS: float = Field(2.0, env="OVERVIEW_WEATHER_TIMEOUT_SECONDS")
+
+    # Export settings
+    EXPORT_BATCH_SIZE: int = Field(5000, env="EXPORT_BATCH_SIZE")  # Rows fetched per server-side cursor batch
+
+    # Ingest settings
+    INGEST_MAX_BUFFERED_READINGS: int = Field(100000, env="INGEST_MAX_BUFFERED_READINGS")  # Beyond this ingest answers 503
+    INGEST_BATCH_SIZE: int = Field(5000, env="INGEST_BATCH_SIZE")  # Rows per INSERT
+    INGEST_FLUSH_INTERVAL_SECONDS: float = Field(0.5, env="INGEST_FLUSH_INTERVAL_SECONDS")
+
+    # Live stream settings
+    LIVE_STREAM_INTERVAL_SECONDS: float = Field(1.0, env="LIVE_STREAM_INTERVAL_SECONDS")  # Sensor read interval while subscribed
+    LIVE_STREAM_QUEUE_SIZE: int = Field(16, env="LIVE_STREAM_QUEUE_SIZE")  # Per-client buffer, oldest dropped when full
+
+    # Startup settings
+    CREATE_SCHEMA_ON_STARTUP: bool = Field(False, env="CREATE_SCHEMA_ON_STARTUP")  # `alembic upgrade head` in the lifespan, single worker only
+
+    # Alert settings
+    ALERTS_ENABLED: bool = Field(True, env="ALERTS_ENABLED")  # Evaluate alert rules on ingested readings; requires a single worker
+    ALERT_FLUSH_INTERVAL_SECONDS: float = Field(1.0, env="ALERT_FLUSH_INTERVAL_SECONDS")  # How often fired alerts are written
+    ALERT_RULES_RELOAD_SECONDS: float = Field(60.0, env="ALERT_RULES_RELOAD_SECONDS")  # Picks up rules created by other workers
+    ALERT_MAX_PENDING: int = Field(10000, env="ALERT_MAX_PENDING")  # Queued alerts kept while writes fail, oldest dropped beyond
+
+    # HTTP caching settings
+    HTTP_CACHE_CLOSED_RANGE_MAX_AGE_SECONDS: int = Field(86400, env="HTTP_CACHE_CLOSED_RANGE_MAX_AGE_SECONDS")
+
+    # Query result cache settings (per process, invalidated through data_versions)
+    RESULT_CACHE_ENABLED: bool = Field(True, env="RESULT_CACHE_ENABLED")
+    RESULT_CACHE_MAX_BYTES: int = Field(64 * 1024 * 1024, env="RESULT_CACHE_MAX_BYTES")  # LRU eviction beyond this
+
+    # Weather cache settings
+    WEATHER_CACHE_TTL_SECONDS: float = Field(300.0, env="WEATHER_CACHE_TTL_SECONDS")  # Fresh for 5 minutes
+    WEATHER_CACHE_STALE_SECONDS: float = Field(600.0, env="WEATHER_CACHE_STALE_SECONDS")  # Served stale while refreshing
+
+    # Weather collector settings
+    WEATHER_COLLECTOR_ENABLED: bool = Field(False, env="WEATHER_COLLECTOR_ENABLED")  # Enable on a single worker only
+    WEATHER_COLLECTOR_INTERVAL_SECONDS: float = Field(600.0, gt=0, env="WEATHER_COLLECTOR_INTERVAL_SECONDS")  # Between snapshots
+    WEATHER_COLLECTOR_BATCH_SIZE: int = Field(1, env="WEATHER_COLLECTOR_BATCH_SIZE")  # Snapshots per INSERT; keep interval x batch well under the max age
+    WEATHER_COLLECTOR_RETRY_SECONDS: float = Field(15.0, env="WEATHER_COLLECTOR_RETRY_SECONDS")  # First backoff after a failed poll
+    WEATHER_COLLECTOR_MAX_BACKOFF_SECONDS: float = Field(1800.0, env="WEATHER_COLLECTOR_MAX_BACKOFF_SECONDS")
+    WEATHER_SNAPSHOT_MAX_AGE_SECONDS: float = Field(1800.0, env="WEATHER_SNAPSHOT_MAX_AGE_SECONDS")  # Older snapshots fall back to OpenWeather
 
     # Derived settings (not directly in .env file)
     @property
@@ -27,6 +88,24 @@ class CoreSettings(BaseSettings):
         """
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """
+        Same database as DATABASE_URL, addressed through the asyncpg driver.
+        """
+        return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
+    @property
+    def ASYNC_READ_REPLICA_URLS(self) -> List[str]:
+        """
+        Replica URLs from DB_READ_REPLICA_URLS, addressed through the asyncpg driver.
+        """
+        return [
+            url.strip().replace("postgresql://", "postgresql+asyncpg://", 1)
+            for url in self.DB_READ_REPLICA_URLS.split(",")
+            if url.strip()
+        ]
+
     class Config:
         # Specify the .env file location and encoding for environment variables
         env_file = ".env"
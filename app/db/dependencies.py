@@ -1,4 +1,4 @@
-from app.db.sessions import SessionLocal
+from app.db.sessions import AsyncSessionLocal, SessionLocal, read_session
 
 def get_db():
     db = SessionLocal()
@@ -6,3 +6,14 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    """
+    Session for read-only endpoints: a healthy read replica if configured, else the primary.
+    """
+    async with read_session() as db:
+        yield db
@@ -0,0 +1,18 @@
+from pathlib import Path
+
+# Project root, where alembic.ini and the alembic/ scripts live
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+def upgrade_to_head() -> None:
+    """
+    Apply the Alembic migrations, like `alembic upgrade head` in run.sh. Besides the tables this
+    creates the partitions, the data_versions/rollup triggers and their seed rows, which
+    Base.metadata.create_all() would leave out. Blocking: call it from a thread.
+    """
+    # Imported here so app startup doesn't pay for Alembic unless it is used
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    command.upgrade(config, "head")
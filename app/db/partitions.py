@@ -0,0 +1,33 @@
+from datetime import date
+from typing import Dict
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Tables range-partitioned by month on their `date` column (see alembic revision 7c3f2a91d0b4)
+PARTITIONED_TABLES = ("pollution_data", "weather_data")
+
+def create_future_partitions(conn: Connection, months_ahead: int = 3, from_month: date = None) -> Dict[str, int]:
+    """
+    Create monthly partitions from `from_month` (default: current month) through `months_ahead` further months.
+    Existing partitions are left untouched. Returns the number of partitions created per table.
+    """
+    from_month = from_month or date.today()
+    created = {}
+    for table in PARTITIONED_TABLES:
+        created[table] = conn.execute(
+            text("SELECT create_monthly_partitions(CAST(:parent AS regclass), :from_month, :months)"),
+            {"parent": table, "from_month": from_month, "months": months_ahead + 1},
+        ).scalar()
+    return created
+
+def create_partitions_for_range(conn: Connection, table: str, first_day: date, last_day: date) -> int:
+    """
+    Create the monthly partitions of `table` covering first_day..last_day, e.g. before loading
+    history older than the existing partitions (rows would otherwise land in <table>_default).
+    Returns the number of partitions created.
+    """
+    months = (last_day.year - first_day.year) * 12 + last_day.month - first_day.month + 1
+    return conn.execute(
+        text("SELECT create_monthly_partitions(CAST(:parent AS regclass), :from_month, :months)"),
+        {"parent": table, "from_month": first_day, "months": months},
+    ).scalar()
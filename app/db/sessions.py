@@ -1,6 +1,95 @@
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import CORE_SETTINGS
+from app.core.metrics import instrument_engine
 
-engine = create_engine(CORE_SETTINGS.DATABASE_URL)
+logger = logging.getLogger(__name__)
+
+POOL_OPTIONS = {
+    "pool_size": CORE_SETTINGS.DB_POOL_SIZE,
+    "max_overflow": CORE_SETTINGS.DB_MAX_OVERFLOW,
+    "pool_timeout": CORE_SETTINGS.DB_POOL_TIMEOUT,
+    "pool_recycle": CORE_SETTINGS.DB_POOL_RECYCLE,
+    "pool_pre_ping": CORE_SETTINGS.DB_POOL_PRE_PING,
+}
+
+engine = create_engine(CORE_SETTINGS.DATABASE_URL, **POOL_OPTIONS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async engine (asyncpg) used by the read endpoints so queries don't hold a threadpool worker
+async_engine = create_async_engine(CORE_SETTINGS.ASYNC_DATABASE_URL, **POOL_OPTIONS)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+class ReplicaPool:
+    """
+    Round-robin over the read replicas. A replica that fails to hand out a connection is
+    skipped for `retry_seconds`; when none is healthy, reads fall back to the primary.
+    """
+
+    def __init__(self, urls: List[str], retry_seconds: float):
+        self.engines = [create_async_engine(url, **POOL_OPTIONS) for url in urls]
+        self.sessionmakers = [
+            async_sessionmaker(bind=replica, autoflush=False, expire_on_commit=False)
+            for replica in self.engines
+        ]
+        self.retry_seconds = retry_seconds
+        self._retry_at = [0.0] * len(self.engines)
+        self._counter = itertools.count()
+
+    def candidates(self) -> List[int]:
+        """
+        Indexes of healthy replicas, starting at the next one in round-robin order.
+        """
+        if not self.engines:
+            return []
+        start = next(self._counter) % len(self.engines)
+        now = time.monotonic()
+        order = [(start + i) % len(self.engines) for i in range(len(self.engines))]
+        return [index for index in order if self._retry_at[index] <= now]
+
+    def mark_unhealthy(self, index: int) -> None:
+        self._retry_at[index] = time.monotonic() + self.retry_seconds
+
+    def healthy_count(self) -> int:
+        now = time.monotonic()
+        return sum(1 for retry_at in self._retry_at if retry_at <= now)
+
+read_replicas = ReplicaPool(CORE_SETTINGS.ASYNC_READ_REPLICA_URLS, CORE_SETTINGS.DB_REPLICA_RETRY_SECONDS)
+
+@asynccontextmanager
+async def read_session():
+    """
+    Read-only session on a healthy replica, or on the primary when there are none.
+    Writes must keep using AsyncSessionLocal/SessionLocal.
+    """
+    db: Optional[AsyncSession] = None
+    for index in read_replicas.candidates():
+        candidate = read_replicas.sessionmakers[index]()
+        try:
+            # Check out a connection now so a dead replica is detected before the query runs
+            await candidate.connection()
+            db = candidate
+            break
+        except Exception as e:
+            logger.warning("Read replica %d unavailable, skipping for %ss: %s", index, read_replicas.retry_seconds, e)
+            read_replicas.mark_unhealthy(index)
+            await candidate.close()
+
+    if db is None:
+        db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+# Per-statement timing and per-request query counts for /metrics
+instrument_engine(engine, "sync")
+instrument_engine(async_engine.sync_engine, "async")
+for replica_index, replica_engine in enumerate(read_replicas.engines):
+    instrument_engine(replica_engine.sync_engine, f"replica_{replica_index}")
@@ -1,13 +1,55 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
-from app.db.sessions import engine
+from app.core.config import CORE_SETTINGS
+from app.core.metrics import REGISTRY, MetricsMiddleware
+from app.db.migrations import upgrade_to_head
 from app.routers.v1.pollution import router as pollution_router
 from app.routers.v1.weather import router as weather_router
+from app.routers.v1.export import router as export_router
+from app.routers.v1.ingest import router as ingest_router
+from app.routers.v1.sensors import router as sensors_router
+from app.routers.v1.alerts import router as alerts_router
 # from sqlalchemy.ext.declarative import declarative_base
-from app.models.pollution_data import Base
+from app.services.alerts import alert_engine
+from app.services.ingest import pollution_ingest_buffer
+from app.services.live import live_broadcaster
+from app.services.rollups import run_rollup_refresher
+from app.services.weather import weather_collector
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start background workers with the application and stop them on shutdown.
+    """
+    if CORE_SETTINGS.CREATE_SCHEMA_ON_STARTUP:
+        # Single-process development convenience; deployments run `alembic upgrade head` before starting workers
+        await asyncio.to_thread(upgrade_to_head)
+    pollution_ingest_buffer.start()
+    live_broadcaster.start()
+    if CORE_SETTINGS.ALERTS_ENABLED:
+        await alert_engine.start()
+    if CORE_SETTINGS.WEATHER_COLLECTOR_ENABLED:
+        weather_collector.start()
+    background_tasks = []
+    if CORE_SETTINGS.ROLLUPS_ENABLED and CORE_SETTINGS.ROLLUP_REFRESH_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_rollup_refresher(CORE_SETTINGS.ROLLUP_REFRESH_INTERVAL_SECONDS)))
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await live_broadcaster.stop()
+    await alert_engine.stop()
+    await weather_collector.stop()
+    # Write out readings still waiting in the ingest buffer
+    await pollution_ingest_buffer.stop()
+
+app = FastAPI(lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -17,9 +59,19 @@ app.add_middleware(
     allow_methods=["*"],                     # HTTP methods to allow (e.g., GET, POST)
     allow_headers=["*"],                     # HTTP headers to allow
 )
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
+# Per-route latency and SQL statement counts, exposed at /metrics
+app.add_middleware(MetricsMiddleware)
 # Include routers
 app.include_router(pollution_router, prefix="/api/v1", tags=["Pollution Data"])
-app.include_router(weather_router, prefix="/api/v1", tags=["Weather Data"])
\ No newline at end of file
+app.include_router(weather_router, prefix="/api/v1", tags=["Weather Data"])
+app.include_router(export_router, prefix="/api/v1", tags=["Export"])
+app.include_router(ingest_router, prefix="/api/v1", tags=["Ingest"])
+app.include_router(sensors_router, prefix="/api/v1", tags=["Sensors"])
+app.include_router(alerts_router, prefix="/api/v1", tags=["Alerts"])
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus scrape endpoint.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -3,4 +3,8 @@ from sqlalchemy.ext.declarative import declarative_base
 Base = declarative_base()
 
 from .pollution_data import PollutionData
+from .sensor import Sensor
 from .weather_data import WeatherData
+from .rollups import PollutionRollup, WeatherRollup, RollupDirtyDay
+from .data_version import DataVersion
+from .alert import AlertRule, Alert
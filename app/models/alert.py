@@ -0,0 +1,54 @@
+from sqlalchemy import ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from datetime import datetime
+from typing import Optional
+from .pollution_data import Base
+
+# Metrics a rule can watch and the supported rule kinds/operators
+ALERT_METRICS = ("air_quality_index", "water_quality_index", "ph_level", "temperature")
+ALERT_RULE_KINDS = ("threshold", "rate_of_change")
+ALERT_OPERATORS = ("gt", "lt")
+
+class AlertRule(Base):
+    """
+    threshold:       fires when the reading's value is above (gt) / below (lt) `threshold`.
+    rate_of_change:  fires when value minus the oldest value within `window_seconds` is above (gt) / below (lt) `threshold`.
+    A rule without sensor_id applies to every sensor.
+    """
+    __tablename__ = "alert_rules"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(nullable=False)
+    metric: Mapped[str] = mapped_column(nullable=False)
+    sensor_id: Mapped[Optional[int]] = mapped_column(ForeignKey("sensors.id"), nullable=True)
+    kind: Mapped[str] = mapped_column(nullable=False)
+    operator: Mapped[str] = mapped_column(nullable=False)
+    threshold: Mapped[float] = mapped_column(nullable=False)
+    window_seconds: Mapped[Optional[int]] = mapped_column(nullable=True)  # rate_of_change only
+    cooldown_seconds: Mapped[int] = mapped_column(default=300, server_default="300", nullable=False)
+    enabled: Mapped[bool] = mapped_column(default=True, server_default="true", nullable=False)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<AlertRule(id={self.id}, metric={self.metric}, kind={self.kind}, operator={self.operator}, threshold={self.threshold})>"
+
+class Alert(Base):
+    __tablename__ = "alerts"
+    __table_args__ = (
+        Index("ix_alerts_fired_at", "fired_at"),
+        Index("ix_alerts_sensor_id_fired_at", "sensor_id", "fired_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    rule_id: Mapped[int] = mapped_column(ForeignKey("alert_rules.id", ondelete="CASCADE"), nullable=False)
+    sensor_id: Mapped[int] = mapped_column(nullable=False)
+    metric: Mapped[str] = mapped_column(nullable=False)
+    value: Mapped[float] = mapped_column(nullable=False)  # Reading value (threshold) or change over the window (rate_of_change)
+    threshold: Mapped[float] = mapped_column(nullable=False)
+    reading_date: Mapped[datetime] = mapped_column(nullable=False)
+    fired_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+    message: Mapped[str] = mapped_column(nullable=False)
+
+    def __repr__(self):
+        return f"<Alert(id={self.id}, rule_id={self.rule_id}, sensor_id={self.sensor_id}, value={self.value})>"
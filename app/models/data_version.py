@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from datetime import datetime
+from .pollution_data import Base
+
+class DataVersion(Base):
+    """
+    Monotonic version per raw table, bumped by a statement-level trigger on every write.
+    """
+    __tablename__ = "data_versions"
+
+    table_name: Mapped[str] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<DataVersion(table_name={self.table_name}, version={self.version})>"
@@ -2,14 +2,24 @@ from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime
 # from app.models import Base
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.sql import func
 
 Base = declarative_base()
 
 class PollutionData(Base):
     __tablename__ = "pollution_data"
+    # The table is range-partitioned by month on `date` (primary key (id, date)), see the alembic migrations
+    __table_args__ = (
+        Index("ix_pollution_data_date_brin", "date", postgresql_using="brin"),
+        # Covers `fields=date,air_quality_index` pages (index-only scans)
+        Index("ix_pollution_data_date_id", "date", "id", postgresql_include=["air_quality_index"]),
+        Index("ix_pollution_data_sensor_id_date", "sensor_id", "date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    # Defaults to the original Phewa sensor (DEFAULT_SENSOR_ID in app.models.sensor)
+    sensor_id: Mapped[int] = mapped_column(ForeignKey("sensors.id"), nullable=False, server_default="1")
     air_quality_index: Mapped[int] = mapped_column(nullable=False)
     water_quality_index: Mapped[int] = mapped_column(nullable=False)
     ph_level: Mapped[float] = mapped_column(nullable=False)
@@ -17,4 +27,4 @@ class PollutionData(Base):
     date: Mapped[datetime] = mapped_column(default=func.now())
 
     def __repr__(self):
-        return f"<PollutionData(id={self.id}, air_quality_index={self.air_quality_index}, temperature={self.temperature}, date={self.date})>"
+        return f"<PollutionData(id={self.id}, sensor_id={self.sensor_id}, air_quality_index={self.air_quality_index}, temperature={self.temperature}, date={self.date})>"
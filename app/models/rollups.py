@@ -0,0 +1,91 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import date, datetime
+from typing import Optional
+from .pollution_data import Base
+
+# Metrics aggregated per bucket. Each gets <metric>_sum, _sumsq, _min and _max columns
+# (weather metrics are nullable, so they also get a <metric>_count).
+POLLUTION_ROLLUP_METRICS = ("air_quality_index", "water_quality_index", "ph_level", "temperature")
+WEATHER_ROLLUP_METRICS = ("temperature", "humidity", "rain_mm", "wind_speed")
+
+# Within-table cross products (sum of x*y) so sample-level correlations can be derived from the rollups
+POLLUTION_ROLLUP_PRODUCTS = (("air_quality_index", "temperature"), ("water_quality_index", "temperature"))
+
+ROLLUP_GRANULARITIES = ("hour", "day")
+
+class PollutionRollup(Base):
+    __tablename__ = "pollution_rollup"
+
+    granularity: Mapped[str] = mapped_column(primary_key=True)  # "hour" or "day"
+    bucket: Mapped[datetime] = mapped_column(primary_key=True)  # date_trunc(granularity, date)
+    sample_count: Mapped[int] = mapped_column(nullable=False)
+
+    air_quality_index_sum: Mapped[float] = mapped_column(nullable=False)
+    air_quality_index_sumsq: Mapped[float] = mapped_column(nullable=False)
+    air_quality_index_min: Mapped[float] = mapped_column(nullable=False)
+    air_quality_index_max: Mapped[float] = mapped_column(nullable=False)
+
+    water_quality_index_sum: Mapped[float] = mapped_column(nullable=False)
+    water_quality_index_sumsq: Mapped[float] = mapped_column(nullable=False)
+    water_quality_index_min: Mapped[float] = mapped_column(nullable=False)
+    water_quality_index_max: Mapped[float] = mapped_column(nullable=False)
+
+    ph_level_sum: Mapped[float] = mapped_column(nullable=False)
+    ph_level_sumsq: Mapped[float] = mapped_column(nullable=False)
+    ph_level_min: Mapped[float] = mapped_column(nullable=False)
+    ph_level_max: Mapped[float] = mapped_column(nullable=False)
+
+    temperature_sum: Mapped[float] = mapped_column(nullable=False)
+    temperature_sumsq: Mapped[float] = mapped_column(nullable=False)
+    temperature_min: Mapped[float] = mapped_column(nullable=False)
+    temperature_max: Mapped[float] = mapped_column(nullable=False)
+
+    air_quality_index_temperature_sum: Mapped[float] = mapped_column(nullable=False)
+    water_quality_index_temperature_sum: Mapped[float] = mapped_column(nullable=False)
+
+    def __repr__(self):
+        return f"<PollutionRollup(granularity={self.granularity}, bucket={self.bucket}, sample_count={self.sample_count})>"
+
+class WeatherRollup(Base):
+    __tablename__ = "weather_rollup"
+
+    granularity: Mapped[str] = mapped_column(primary_key=True)  # "hour" or "day"
+    bucket: Mapped[datetime] = mapped_column(primary_key=True)  # date_trunc(granularity, date)
+    sample_count: Mapped[int] = mapped_column(nullable=False)
+
+    temperature_count: Mapped[int] = mapped_column(nullable=False)
+    temperature_sum: Mapped[Optional[float]] = mapped_column(nullable=True)
+    temperature_sumsq: Mapped[Optional[float]] = mapped_column(nullable=True)
+    temperature_min: Mapped[Optional[float]] = mapped_column(nullable=True)
+    temperature_max: Mapped[Optional[float]] = mapped_column(nullable=True)
+
+    humidity_count: Mapped[int] = mapped_column(nullable=False)
+    humidity_sum: Mapped[Optional[float]] = mapped_column(nullable=True)
+    humidity_sumsq: Mapped[Optional[float]] = mapped_column(nullable=True)
+    humidity_min: Mapped[Optional[float]] = mapped_column(nullable=True)
+    humidity_max: Mapped[Optional[float]] = mapped_column(nullable=True)
+
+    rain_mm_count: Mapped[int] = mapped_column(nullable=False)
+    rain_mm_sum: Mapped[Optional[float]] = mapped_column(nullable=True)
+    rain_mm_sumsq: Mapped[Optional[float]] = mapped_column(nullable=True)
+    rain_mm_min: Mapped[Optional[float]] = mapped_column(nullable=True)
+    rain_mm_max: Mapped[Optional[float]] = mapped_column(nullable=True)
+
+    wind_speed_count: Mapped[int] = mapped_column(nullable=False)
+    wind_speed_sum: Mapped[Optional[float]] = mapped_column(nullable=True)
+    wind_speed_sumsq: Mapped[Optional[float]] = mapped_column(nullable=True)
+    wind_speed_min: Mapped[Optional[float]] = mapped_column(nullable=True)
+    wind_speed_max: Mapped[Optional[float]] = mapped_column(nullable=True)
+
+    def __repr__(self):
+        return f"<WeatherRollup(granularity={self.granularity}, bucket={self.bucket}, sample_count={self.sample_count})>"
+
+class RollupDirtyDay(Base):
+    """
+    Days whose raw rows changed since the rollups were last rebuilt.
+    Filled by statement-level triggers on pollution_data/weather_data.
+    """
+    __tablename__ = "rollup_dirty_days"
+
+    source: Mapped[str] = mapped_column(primary_key=True)  # "pollution" or "weather"
+    day: Mapped[date] = mapped_column(primary_key=True)
@@ -0,0 +1,26 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from datetime import datetime
+from typing import Optional
+from .pollution_data import Base
+
+# Sensor created by the migration for readings recorded before the registry existed
+DEFAULT_SENSOR_ID = 1
+DEFAULT_SENSOR_CODE = "phewa-001"
+
+class Sensor(Base):
+    """
+    Registry of deployed sensors. pollution_data.sensor_id references sensors.id.
+    """
+    __tablename__ = "sensors"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    code: Mapped[str] = mapped_column(unique=True, nullable=False)  # Identifier reported by the device, e.g. "phewa-001"
+    name: Mapped[Optional[str]] = mapped_column(nullable=True)
+    latitude: Mapped[Optional[float]] = mapped_column(nullable=True)
+    longitude: Mapped[Optional[float]] = mapped_column(nullable=True)
+    active: Mapped[bool] = mapped_column(default=True, server_default="true", nullable=False)
+    installed_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<Sensor(id={self.id}, code={self.code})>"
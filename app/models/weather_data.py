@@ -1,10 +1,16 @@
 from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Index
 from sqlalchemy.sql import func
 from datetime import datetime
 from .pollution_data import Base
 
 class WeatherData(Base):
     __tablename__ = "weather_data"
+    # The table is range-partitioned by month on `date` (primary key (id, date)), see the alembic migrations
+    __table_args__ = (
+        Index("ix_weather_data_date_brin", "date", postgresql_using="brin"),
+        Index("ix_weather_data_date_id", "date", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     temperature: Mapped[float] = mapped_column(nullable=True)
@@ -17,7 +23,7 @@ class WeatherData(Base):
     sunset: Mapped[int] = mapped_column(nullable=True)
     city: Mapped[str] = mapped_column(nullable=True)
     country: Mapped[str] = mapped_column(nullable=True)
-    date: Mapped[datetime] = mapped_column(default=func.now(), nullable=True)
+    date: Mapped[datetime] = mapped_column(default=func.now(), nullable=False)  # Partition key
 
     def __repr__(self):
         return (
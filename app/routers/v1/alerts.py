@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+from app.db.dependencies import get_async_db, get_async_read_db
+from app.models.alert import AlertRule
+from app.schemas.alert import AlertResponse, AlertRuleCreate, AlertRuleResponse
+from app.services.alerts import alert_engine, fetch_alerts
+
+router = APIRouter()
+
+# ------------------------------------------------------
+# 1. Alerts API
+# ------------------------------------------------------
+@router.get("/alerts", response_model=List[AlertResponse])
+async def get_alerts(
+    db: AsyncSession = Depends(get_async_read_db),
+    start_date: Optional[datetime] = Query(None, description="Only alerts fired at or after this time"),
+    end_date: Optional[datetime] = Query(None, description="Only alerts fired before this time"),
+    sensor_id: Optional[List[int]] = Query(None, description="Sensor ids (repeat the parameter)"),
+    rule_id: Optional[int] = Query(None, description="Only alerts of this rule"),
+    limit: int = Query(50, ge=1, le=1000, description="Number of alerts to fetch"),
+    offset: int = Query(0, ge=0, description="Offset for fetching alerts"),
+):
+    """
+    Endpoint to list fired alerts, most recent first.
+    """
+    return await fetch_alerts(
+        db, start_date=start_date, end_date=end_date, sensor_ids=sensor_id,
+        rule_id=rule_id, limit=limit, offset=offset
+    )
+
+# ------------------------------------------------------
+# 2. Alert Rules API
+# ------------------------------------------------------
+@router.get("/alerts/rules", response_model=List[AlertRuleResponse])
+async def get_alert_rules(db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Endpoint to list alert rules.
+    """
+    return (await db.scalars(select(AlertRule).order_by(AlertRule.id))).all()
+
+@router.post("/alerts/rules", response_model=AlertRuleResponse, status_code=201)
+async def create_alert_rule(rule_in: AlertRuleCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Endpoint to add an alert rule. It applies to readings ingested from now on.
+    """
+    rule = AlertRule(**rule_in.model_dump())
+    db.add(rule)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=422, detail=f"Unknown sensor_id: {rule_in.sensor_id}")
+    await db.refresh(rule)
+    await alert_engine.load_rules()
+    return rule
+
+@router.delete("/alerts/rules/{rule_id}", status_code=204)
+async def delete_alert_rule(rule_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Endpoint to remove an alert rule together with the alerts it fired.
+    """
+    rule = await db.get(AlertRule, rule_id)
+    if rule is None:
+        raise HTTPException(status_code=404, detail="Alert rule not found")
+    await db.delete(rule)
+    await db.commit()
+    await alert_engine.load_rules()
+    return Response(status_code=204)
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from datetime import date
+from app.models.pollution_data import PollutionData
+from app.models.weather_data import WeatherData
+from app.services.export import EXPORT_MEDIA_TYPES, stream_export
+from app.services.pollution import default_date_range
+
+router = APIRouter()
+
+def _export_response(model, name: str, export_format: str, start_date: Optional[date], end_date: Optional[date]):
+    start_date, end_date = default_date_range(start_date, end_date)
+    extension = "csv" if export_format == "csv" else "ndjson"
+    return StreamingResponse(
+        stream_export(model, export_format, start_date=start_date, end_date=end_date),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}_{start_date}_{end_date}.{extension}"'},
+    )
+
+# ------------------------------------------------------
+# 1. Pollution Data Export API
+# ------------------------------------------------------
+@router.get("/export/pollution")
+async def export_pollution_data(
+    start_date: Optional[date] = Query(None, description="Start date of the export (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="End date of the export (YYYY-MM-DD)"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Output format: ndjson or csv"),
+):
+    """
+    Endpoint to stream every pollution record in a date range as NDJSON or CSV.
+    """
+    return _export_response(PollutionData, "pollution", format, start_date, end_date)
+
+# ------------------------------------------------------
+# 2. Weather Data Export API
+# ------------------------------------------------------
+@router.get("/export/weather")
+async def export_weather_data(
+    start_date: Optional[date] = Query(None, description="Start date of the export (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="End date of the export (YYYY-MM-DD)"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Output format: ndjson or csv"),
+):
+    """
+    Endpoint to stream every weather record in a date range as NDJSON or CSV.
+    """
+    return _export_response(WeatherData, "weather", format, start_date, end_date)
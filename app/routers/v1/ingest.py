@@ -0,0 +1,47 @@
+from fastapi import APIRouter, HTTPException
+from typing import List, Union
+from app.schemas.ingest import IngestResponse, IngestStatsResponse, PollutionReadingIn
+from app.core.config import CORE_SETTINGS
+from app.services.alerts import alert_engine
+from app.services.ingest import pollution_ingest_buffer
+from app.services.sensors import sensor_registry
+
+router = APIRouter()
+
+# ------------------------------------------------------
+# 1. Pollution Ingest API
+# ------------------------------------------------------
+@router.post("/ingest/pollution", response_model=IngestResponse, status_code=202)
+async def ingest_pollution_readings(readings: Union[List[PollutionReadingIn], PollutionReadingIn]):
+    """
+    Endpoint to accept one sensor reading or a batch of them.
+    Readings are buffered and written to the database in large batches shortly after.
+    """
+    if not isinstance(readings, list):
+        readings = [readings]
+
+    # Reject unknown sensors up front: one bad foreign key would fail the whole batched INSERT
+    unknown = await sensor_registry.unknown_ids({reading.sensor_id for reading in readings})
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown sensor_id: {sorted(unknown)}")
+
+    if not pollution_ingest_buffer.offer(readings):
+        raise HTTPException(
+            status_code=503,
+            detail="Ingest buffer is full, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    # Alert rules see each reading as it arrives, before it is written
+    if CORE_SETTINGS.ALERTS_ENABLED:
+        alert_engine.evaluate(readings)
+    return IngestResponse(accepted=len(readings), buffered=pollution_ingest_buffer.buffered)
+
+# ------------------------------------------------------
+# 2. Ingest Stats API
+# ------------------------------------------------------
+@router.get("/ingest/stats", response_model=IngestStatsResponse)
+async def get_ingest_stats():
+    """
+    Endpoint to inspect accepted/rejected/flushed counters of the ingest buffer.
+    """
+    return pollution_ingest_buffer.stats()
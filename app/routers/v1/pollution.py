@@ -1,18 +1,38 @@
-import pandas as pd
-
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import date
-from app.db.dependencies import get_db
-from app.services.pollution import fetch_historical_pollution_data, fetch_historical_pollution_data, fetch_historical_weather_data, map_live_sensor_data_to_pollution_data
-from app.services.pollution import get_live_sensor_data
-from app.services.weather import get_weather
+import asyncio
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Awaitable, Callable, List, Optional
+from datetime import date, timedelta
+from app.db.dependencies import get_async_read_db
+from app.services.pollution import fetch_correlation_summary, map_live_sensor_data_to_pollution_data
+from app.services.pollution import HISTORICAL_POLLUTION_COLUMNS, HISTORICAL_WEATHER_COLUMNS, fetch_historical_columns_async, fetch_historical_rows_async
+from app.services.pollution import default_date_range, get_live_sensor_data, resolve_fields
+from app.services.pollution import fetch_historical_pollution_by_sensor_async
+from app.services.http_cache import ConditionalCache, conditional_cache
+from app.services.result_cache import result_cache
+from app.services.live import live_broadcaster
+from app.services.columnar import columnar_response, negotiate_columnar_format
+from app.models.pollution_data import PollutionData
+from app.models.weather_data import WeatherData
+from app.services.overview import build_pollution_overview
+from app.services.rollups import fetch_range_statistics
+from app.services.weather import get_latest_weather_snapshot
 from app.schemas.pollution_overview import CorrelationSummaryResponse, HistoricalPollutionResponse,  HistoricalWeatherResponse, LivePollutionData, PollutionOverviewResponse
+from app.schemas.correlation import RollingCorrelationResponse
+from app.schemas.series import PollutionSeriesPoint, PollutionSeriesResponse, SensorSeries
+from app.schemas.statistics import RangeStatisticsResponse
 from app.schemas.weather import WeatherResponse
 
 router = APIRouter()
 
+# Seconds between keep-alive comments on an idle SSE stream
+LIVE_STREAM_KEEPALIVE_SECONDS = 15
+
+# Upper bound on sensor ids accepted by one historical/series request
+MAX_SENSORS_PER_REQUEST = 500
+
 # ------------------------------------------------------
 # 1. Live Pollution Data API
 # ------------------------------------------------------
@@ -20,58 +40,269 @@ router = APIRouter()
 def get_live_pollution_data():
     """
     Endpoint to fetch live pollution data from sensors.
+    Serves the broadcaster's latest reading when streaming is active instead of reading the sensor again.
     """
+    if live_broadcaster.latest is not None:
+        return live_broadcaster.latest
     live_data = get_live_sensor_data()
     live_pollution_data = map_live_sensor_data_to_pollution_data(live_data)
     return live_pollution_data
 
+async def _historical_columnar_response(db: AsyncSession, model, column_names, columnar_format: str, exact_count: bool, **kwargs):
+    """
+    Build an Arrow/Parquet page straight from the selected columns; pagination metadata travels in headers.
+    """
+    try:
+        columns, total_count, next_cursor = await fetch_historical_columns_async(
+            db, model, column_names, exact_count=exact_count, **kwargs
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {"X-Total-Count": str(total_count), "X-Total-Count-Is-Estimate": str(not exact_count).lower()}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return columnar_response(columns, columnar_format, headers=headers)
+
+async def _cached_json_response(cache: ConditionalCache, key: str, make_response: Callable[[], Awaitable[Response]]) -> Response:
+    """
+    Serve the JSON body stored under `key` while the versions of the tables it reads are unchanged,
+    otherwise build it with make_response() and store its body.
+    """
+    body = await result_cache.get(key, cache.versions)
+    status = "hit"
+    if body is None:
+        body = (await make_response()).body
+        await result_cache.set(key, cache.versions, body)
+        status = "miss"
+    return Response(content=body, media_type="application/json", headers={**cache.headers, "X-Result-Cache": status})
+
+async def _historical_json_response(db: AsyncSession, model, column_names, cache_headers, exact_count: bool, extra_fields=None, **kwargs):
+    """
+    JSON page encoded straight from the selected row tuples with orjson, bypassing per-row
+    schema validation. The payload has the shape of the endpoint's response_model
+    (`extra_fields` carries that model's remaining fields).
+    """
+    try:
+        rows, total_count, next_cursor = await fetch_historical_rows_async(
+            db, model, column_names, exact_count=exact_count, **kwargs
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return ORJSONResponse({
+        "total_count": total_count,
+        "total_count_is_estimate": not exact_count,
+        "next_cursor": next_cursor,
+        "historical_data": [dict(zip(column_names, row)) for row in rows],
+        **(extra_fields or {}),
+    }, headers=cache_headers)
+
+# ------------------------------------------------------
+# 1.1 Live Pollution Stream API (SSE and WebSocket)
+# ------------------------------------------------------
+@router.get("/live_pollution_data/stream")
+async def stream_live_pollution_data(request: Request):
+    """
+    Server-Sent Events stream of live pollution readings from the shared broadcaster.
+    """
+    async def events():
+        queue = live_broadcaster.subscribe()
+        try:
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=LIVE_STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {message}\n\n"
+        finally:
+            live_broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@router.websocket("/live_pollution_data/stream")
+async def websocket_live_pollution_data(websocket: WebSocket):
+    """
+    WebSocket stream of live pollution readings from the shared broadcaster.
+    """
+    await websocket.accept()
+    queue = live_broadcaster.subscribe()
+    try:
+        while True:
+            await websocket.send_text(await queue.get())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        live_broadcaster.unsubscribe(queue)
+
+async def _historical_by_sensor_response(db: AsyncSession, sensor_ids: List[int], column_names, columnar_format: Optional[str], cache_headers, exact_count: bool, limit: int, **kwargs):
+    """
+    Pages for many sensors from one query, grouped per sensor (JSON) or flattened with a sensor_id column (Arrow/Parquet).
+    """
+    if len(sensor_ids) > MAX_SENSORS_PER_REQUEST:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SENSORS_PER_REQUEST} sensor ids per request")
+    try:
+        grouped, next_cursor, total_count, per_sensor_counts = await fetch_historical_pollution_by_sensor_async(
+            db, sensor_ids, limit=limit, exact_count=exact_count, column_names=column_names, **kwargs
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if columnar_format:
+        rows = [row for sensor_rows in grouped.values() for row in sensor_rows]
+        # The sensor_id column comes from the grouping, so it is present whatever `fields` selects
+        columns = {"sensor_id": [row.page_sensor_id for row in rows]}
+        columns.update({name: [getattr(row, name) for row in rows] for name in column_names if name != "sensor_id"})
+        headers = {**cache_headers, "X-Total-Count": str(total_count), "X-Total-Count-Is-Estimate": str(not exact_count).lower()}
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return columnar_response(columns, columnar_format, headers=headers)
+
+    # Same shape as HistoricalPollutionResponse, encoded from the rows without per-row validation
+    return ORJSONResponse({
+        "total_count": total_count,
+        "total_count_is_estimate": not exact_count,
+        "next_cursor": next_cursor,
+        "historical_data": [],
+        "sensors": [
+            {
+                "sensor_id": sensor,
+                "total_count": per_sensor_counts[sensor] if per_sensor_counts is not None else None,
+                "historical_data": [dict(zip(column_names, row)) for row in rows],
+            }
+            for sensor, rows in grouped.items()
+        ],
+    }, headers=cache_headers)
+
 # ------------------------------------------------------
 # 2. Historical Pollution Data API
 # ------------------------------------------------------
 @router.get("/historical_pollution_data", response_model=HistoricalPollutionResponse)
-def get_historical_pollution_data(
-    db: Session = Depends(get_db),
+async def get_historical_pollution_data(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     start_date: Optional[date] = Query(None, description="Start date for filtering historical data (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="End date for filtering historical data (YYYY-MM-DD)"),
     limit: int = Query(10, ge=1, le=100, description="Number of records to fetch"),
-    offset: int = Query(0, ge=0, description="Offset for fetching historical records")
+    offset: int = Query(0, ge=0, description="Offset for fetching historical records"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor; takes precedence over offset"),
+    exact_count: bool = Query(False, description="Run an exact COUNT instead of using the planner's estimate"),
+    sensor_id: Optional[List[int]] = Query(None, description="Sensor ids (repeat the parameter); returns one page per sensor, resumed together through next_cursor"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. date,air_quality_index (default: every response field)"),
+    format: Optional[str] = Query(None, pattern="^(json|arrow|parquet)$", description="Response format: json (default), arrow (IPC stream) or parquet"),
+    accept: Optional[str] = Header(None),
 ):
     """
     Endpoint to fetch historical pollution data from the database.
+    Returns Arrow or Parquet instead of JSON when requested via `format` or the Accept header.
+    `fields` narrows both the SELECT list and each returned record to the named PollutionData columns.
     """
-    historical_data, total_count = fetch_historical_pollution_data(
-        db, start_date=start_date, end_date=end_date, limit=limit, offset=offset
+    start_date, end_date = default_date_range(start_date, end_date)
+    try:
+        column_names = resolve_fields(PollutionData, fields, HISTORICAL_POLLUTION_COLUMNS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Answer revalidations from the table versions alone, before any row is read
+    cache = await conditional_cache(request, db, ["pollution_data"], start_date, end_date)
+    if cache.not_modified:
+        return cache.not_modified_response()
+    response.headers.update(cache.headers)
+
+    columnar_format = negotiate_columnar_format(format, accept)
+    if sensor_id:
+        sensor_ids = sorted(set(sensor_id))
+        page = dict(start_date=start_date, end_date=end_date, limit=limit, offset=offset, cursor=cursor, exact_count=exact_count)
+        if columnar_format:
+            return await _historical_by_sensor_response(db, sensor_ids, column_names, columnar_format, cache.headers, **page)
+        key = result_cache.make_key(
+            "historical_pollution_by_sensor", sensor_ids=sensor_ids, start_date=start_date, end_date=end_date,
+            limit=limit, offset=0 if cursor else offset, cursor=cursor, exact_count=exact_count, fields=column_names
+        )
+        return await _cached_json_response(cache, key, lambda: _historical_by_sensor_response(
+            db, sensor_ids, column_names, None, cache.headers, **page
+        ))
+
+    if columnar_format:
+        columnar = await _historical_columnar_response(
+            db, PollutionData, column_names, columnar_format,
+            start_date=start_date, end_date=end_date, limit=limit, offset=offset,
+            cursor=cursor, exact_count=exact_count
+        )
+        columnar.headers.update(cache.headers)
+        return columnar
+
+    key = result_cache.make_key(
+        "historical_pollution_data", start_date=start_date, end_date=end_date,
+        limit=limit, offset=0 if cursor else offset, cursor=cursor, exact_count=exact_count, fields=column_names
     )
-    return HistoricalPollutionResponse(historical_data=historical_data, total_count=total_count)
+    return await _cached_json_response(cache, key, lambda: _historical_json_response(
+        db, PollutionData, column_names, cache.headers, extra_fields={"sensors": None},
+        start_date=start_date, end_date=end_date, limit=limit, offset=offset,
+        cursor=cursor, exact_count=exact_count
+    ))
 
 # ------------------------------------------------------
 # 2.1 Historical Weather Data API
 # ------------------------------------------------------
 @router.get("/historical_weather_data", response_model=HistoricalWeatherResponse)
-def get_historical_weather_data(
-    db: Session = Depends(get_db),
+async def get_historical_weather_data(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     start_date: Optional[date] = Query(None, description="Start date for filtering historical data (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="End date for filtering historical data (YYYY-MM-DD)"),
     limit: int = Query(10, ge=1, le=100, description="Number of records to fetch"),
-    offset: int = Query(0, ge=0, description="Offset for fetching historical records")
+    offset: int = Query(0, ge=0, description="Offset for fetching historical records"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor; takes precedence over offset"),
+    exact_count: bool = Query(False, description="Run an exact COUNT instead of using the planner's estimate"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. date,temperature (default: every response field)"),
+    format: Optional[str] = Query(None, pattern="^(json|arrow|parquet)$", description="Response format: json (default), arrow (IPC stream) or parquet"),
+    accept: Optional[str] = Header(None),
 ):
     """
     Endpoint to fetch historical weather data from the database.
+    Returns Arrow or Parquet instead of JSON when requested via `format` or the Accept header.
+    `fields` narrows both the SELECT list and each returned record to the named WeatherData columns.
     """
-    print("checking this please")
-    historical_weather_data, total_count = fetch_historical_weather_data(
-        db, start_date=start_date, end_date=end_date, limit=limit, offset=offset
+    start_date, end_date = default_date_range(start_date, end_date)
+    try:
+        column_names = resolve_fields(WeatherData, fields, HISTORICAL_WEATHER_COLUMNS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Answer revalidations from the table versions alone, before any row is read
+    cache = await conditional_cache(request, db, ["weather_data"], start_date, end_date)
+    if cache.not_modified:
+        return cache.not_modified_response()
+    response.headers.update(cache.headers)
+
+    columnar_format = negotiate_columnar_format(format, accept)
+    if columnar_format:
+        columnar = await _historical_columnar_response(
+            db, WeatherData, column_names, columnar_format,
+            start_date=start_date, end_date=end_date, limit=limit, offset=offset,
+            cursor=cursor, exact_count=exact_count
+        )
+        columnar.headers.update(cache.headers)
+        return columnar
+
+    key = result_cache.make_key(
+        "historical_weather_data", start_date=start_date, end_date=end_date,
+        limit=limit, offset=0 if cursor else offset, cursor=cursor, exact_count=exact_count, fields=column_names
     )
-    print(total_count)
-    pass
-    return HistoricalWeatherResponse(historical_data=historical_weather_data, total_count=total_count)
+    return await _cached_json_response(cache, key, lambda: _historical_json_response(
+        db, WeatherData, column_names, cache.headers,
+        start_date=start_date, end_date=end_date, limit=limit, offset=offset,
+        cursor=cursor, exact_count=exact_count
+    ))
 
 # ------------------------------------------------------
 # 3. Pollution Overview API
 # ------------------------------------------------------
 @router.get("/pollution_overview", response_model=PollutionOverviewResponse)
-def get_pollution_overview(
-    db: Session = Depends(get_db),
+async def get_pollution_overview(
     start_date: Optional[date] = Query(None, description="Start date for filtering historical data (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="End date for filtering historical data (YYYY-MM-DD)"),
     limit: int = Query(10, ge=1, le=100, description="Number of records to fetch"),
@@ -79,120 +310,238 @@ def get_pollution_overview(
 ):
     """
     Endpoint to get a combined overview of pollution and weather data.
+    Sources are queried in parallel; a slow or failing source yields a partial response.
     """
-    # Live pollution data
-    live_data = get_live_sensor_data()
-    live_pollution_data = map_live_sensor_data_to_pollution_data(live_data)
-
-    # Historical pollution data
-    historical_pollution_data, total_pollution_count = fetch_historical_pollution_data(
-        db, start_date=start_date, end_date=end_date, limit=limit, offset=offset
-    )
-        # Historical weather data
-    historical_weather_data, total_weather_count = fetch_historical_weather_data(
-        db, start_date=start_date, end_date=end_date, limit=limit, offset=offset
-    )
-
-
-    # Weather data
-    weather_data = get_weather()
-
-    return PollutionOverviewResponse(
-        live_pollution_data=live_pollution_data,
-        historical_pollution_data=HistoricalPollutionResponse(historical_data=historical_pollution_data, total_count=total_pollution_count),
-        historical_weather_data=HistoricalWeatherResponse(historical_data=historical_weather_data, total_count=total_weather_count),
-        weather=weather_data
-    )
+    return await build_pollution_overview(start_date=start_date, end_date=end_date, limit=limit, offset=offset)
 
 # ------------------------------------------------------
 # 4. Weather Data API
 # ------------------------------------------------------
 @router.get("/weather", response_model=WeatherResponse)
-def get_weather_data():
+async def get_weather_data(db: AsyncSession = Depends(get_async_read_db)):
     """
-    Endpoint to fetch current weather data.
+    Endpoint to fetch current weather data: the latest snapshot recorded by the weather collector.
     """
-    weather_data = get_weather()
-    return weather_data
+    return await get_latest_weather_snapshot(db)
 
 # ------------------------------------------------------
 # 5. Correlation Data API
 # ------------------------------------------------------
 @router.get("/pollution-weather-correlation", response_model=CorrelationSummaryResponse)
-def get_pollution_weather_correlation(
-    db: Session = Depends(get_db),
+async def get_pollution_weather_correlation(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     start_date: Optional[date] = Query(None, description="Start date for filtering data (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="End date for filtering data (YYYY-MM-DD)"),
+    format: Optional[str] = Query(None, pattern="^(json|arrow|parquet)$", description="Response format: json (default), arrow (IPC stream) or parquet"),
+    accept: Optional[str] = Header(None),
+):
+    """
+    Endpoint to get correlation insights between weather and pollution data,
+    averaging by date across the full range inside the database.
+    """
+    start_date, end_date = default_date_range(start_date, end_date)
+    # Answer revalidations from the table versions alone, before any row is read
+    cache = await conditional_cache(request, db, ["pollution_data", "weather_data"], start_date, end_date)
+    if cache.not_modified:
+        return cache.not_modified_response()
+    response.headers.update(cache.headers)
+
+    columnar_format = negotiate_columnar_format(format, accept)
+
+    async def correlation_response() -> Response:
+        correlation = await fetch_correlation_summary(db, start_date=start_date, end_date=end_date)
+
+        # Check if there's enough data to calculate correlation
+        if correlation is None:
+            raise HTTPException(status_code=400, detail="Insufficient data to calculate correlation")
+
+        if columnar_format:
+            return columnar_response({
+                "pair": list(correlation.correlation_summary.keys()),
+                "correlation": list(correlation.correlation_summary.values()),
+            }, columnar_format, headers=cache.headers)
+        return ORJSONResponse(correlation.model_dump(mode="json"))
+
+    if columnar_format:
+        return await correlation_response()
+    key = result_cache.make_key("pollution_weather_correlation", start_date=start_date, end_date=end_date)
+    return await _cached_json_response(cache, key, correlation_response)
+
+@router.get("/pollution-weather-correlation/rolling", response_model=RollingCorrelationResponse)
+async def get_rolling_pollution_weather_correlation(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    start_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD), defaults to one year before end_date"),
+    end_date: Optional[date] = Query(None, description="End date, inclusive (YYYY-MM-DD), defaults to today"),
+    window: int = Query(30, ge=3, le=365, description="Rolling window length in days"),
+    max_lag: int = Query(7, ge=0, le=60, description="Largest lag in days scanned in each direction"),
+    min_periods: Optional[int] = Query(None, ge=2, description="Minimum paired days per window/lag (default: half the window)"),
 ):
     """
-    Endpoint to get correlation insights between weather and pollution data, 
-    averaging or grouping by date if there are multiple data points.
+    Endpoint to get how each pollution/weather correlation changes over time (rolling window)
+    and whether the weather metric leads the pollution metric (lag scan) on daily means.
     """
-    # Fetch historical pollution data
-    historical_pollution_data, _ = fetch_historical_pollution_data(
-        db, start_date=start_date, end_date=end_date, limit=100, offset=0
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=365)
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    min_periods = min_periods or max(3, window // 2)
+
+    cache = await conditional_cache(request, db, ["pollution_data", "weather_data"], start_date, end_date)
+    if cache.not_modified:
+        return cache.not_modified_response()
+    response.headers.update(cache.headers)
+
+    # numpy-backed analytics: imported by the routes that use them, not at worker startup
+    from app.services.correlation import analyze_correlations, fetch_daily_series
+
+    async def rolling_response() -> Response:
+        series = await fetch_daily_series(db, start_date, end_date)
+        analysis = analyze_correlations(series, start_date, window, max_lag, min_periods)
+        return ORJSONResponse(RollingCorrelationResponse(
+            start_date=start_date,
+            end_date=end_date,
+            window=window,
+            max_lag=max_lag,
+            **analysis
+        ).model_dump(mode="json"))
+
+    key = result_cache.make_key(
+        "pollution_weather_correlation_rolling", start_date=start_date, end_date=end_date,
+        window=window, max_lag=max_lag, min_periods=min_periods
     )
-    
-    # Fetch historical weather data
-    historical_weather_data, _ = fetch_historical_weather_data(
-        db, start_date=start_date, end_date=end_date, limit=100, offset=0
+    return await _cached_json_response(cache, key, rolling_response)
+
+# ------------------------------------------------------
+# 6. Range Statistics API
+# ------------------------------------------------------
+async def _range_statistics(
+    db: AsyncSession,
+    source: str,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    columnar_format: Optional[str] = None
+):
+    start_date, end_date = default_date_range(start_date, end_date)
+    sample_count, metrics, origin = await fetch_range_statistics(db, source, start_date, end_date)
+
+    if columnar_format:
+        columns = {"metric": list(metrics.keys())}
+        for field in ("count", "mean", "stddev", "min", "max"):
+            columns[field] = [statistics[field] for statistics in metrics.values()]
+        return columnar_response(columns, columnar_format)
+
+    return RangeStatisticsResponse(
+        start_date=start_date,
+        end_date=end_date,
+        sample_count=sample_count,
+        source=origin,
+        metrics=metrics
     )
 
-    # Check if there's enough data to calculate correlation
-    if not historical_pollution_data or not historical_weather_data:
-        raise HTTPException(status_code=400, detail="Insufficient data to calculate correlation")
-
-    # Convert the pollution and weather data into dictionaries for easier processing
-    pollution_data = {
-        "date": [item.date for item in historical_pollution_data],
-        "air_quality_index": [item.air_quality_index for item in historical_pollution_data],
-        "water_quality_index": [item.water_quality_index for item in historical_pollution_data],
-        "temperature": [item.temperature for item in historical_pollution_data],
-    }
-
-    weather_data = {
-        "date": [item.date for item in historical_weather_data],
-        "humidity": [item.humidity for item in historical_weather_data],
-        "rain_mm": [item.rain_mm for item in historical_weather_data],
-    }
-
-    # Create pandas DataFrames from the pollution and weather data
-    pollution_df = pd.DataFrame(pollution_data)
-    weather_df = pd.DataFrame(weather_data)
-
-    # Group by date and average the data (if there are multiple entries per date)
-    pollution_df = pollution_df.groupby("date").mean()
-    weather_df = weather_df.groupby("date").mean()
-
-    # Merge the dataframes on the 'date' column
-    merged_df = pd.merge(pollution_df, weather_df, on="date", how="inner")
-
-    # Calculate correlations between pollution and weather variables
-    correlation_summary = {
-        "air_quality_index_temperature": merged_df["air_quality_index"].corr(merged_df["temperature"]),
-        "air_quality_index_humidity": merged_df["air_quality_index"].corr(merged_df["humidity"]),
-        "air_quality_index_rainfall": merged_df["air_quality_index"].corr(merged_df["rain_mm"]),
-        "water_quality_index_temperature": merged_df["water_quality_index"].corr(merged_df["temperature"]),
-        "water_quality_index_humidity": merged_df["water_quality_index"].corr(merged_df["humidity"]),
-        "water_quality_index_rainfall": merged_df["water_quality_index"].corr(merged_df["rain_mm"]),
-    }
-
-    # Generate insights based on correlations
-    insights = []
-    if correlation_summary["air_quality_index_temperature"] > 0.5:
-        insights.append("Higher temperatures tend to correlate with poorer air quality.")
-    if correlation_summary["air_quality_index_humidity"] < 0:
-        insights.append("Higher humidity tends to correlate with better air quality.")
-    if correlation_summary["air_quality_index_rainfall"] < 0:
-        insights.append("Rainfall tends to reduce air pollution.")
-    if correlation_summary["water_quality_index_temperature"] < 0:
-        insights.append("Higher temperatures tend to correlate with poorer water quality.")
-    if correlation_summary["water_quality_index_humidity"] > 0.5:
-        insights.append("Higher humidity tends to correlate with poorer water quality.")
-    if correlation_summary["water_quality_index_rainfall"] < 0:
-        insights.append("Rainfall tends to improve water quality.")
-
-    return CorrelationSummaryResponse(
-        correlation_summary=correlation_summary,
-        insights=insights
+@router.get("/pollution_statistics", response_model=RangeStatisticsResponse)
+async def get_pollution_statistics(
+    db: AsyncSession = Depends(get_async_read_db),
+    start_date: Optional[date] = Query(None, description="Start date for the statistics (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="End date for the statistics, inclusive (YYYY-MM-DD)"),
+    format: Optional[str] = Query(None, pattern="^(json|arrow|parquet)$", description="Response format: json (default), arrow (IPC stream) or parquet"),
+    accept: Optional[str] = Header(None),
+):
+    """
+    Endpoint to get count/mean/stddev/min/max of every pollution metric over a date range.
+    """
+    return await _range_statistics(db, "pollution", start_date, end_date, negotiate_columnar_format(format, accept))
+
+@router.get("/weather_statistics", response_model=RangeStatisticsResponse)
+async def get_weather_statistics(
+    db: AsyncSession = Depends(get_async_read_db),
+    start_date: Optional[date] = Query(None, description="Start date for the statistics (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="End date for the statistics, inclusive (YYYY-MM-DD)"),
+    format: Optional[str] = Query(None, pattern="^(json|arrow|parquet)$", description="Response format: json (default), arrow (IPC stream) or parquet"),
+    accept: Optional[str] = Header(None),
+):
+    """
+    Endpoint to get count/mean/stddev/min/max of every weather metric over a date range.
+    """
+    return await _range_statistics(db, "weather", start_date, end_date, negotiate_columnar_format(format, accept))
+
+# ------------------------------------------------------
+# 7. Pollution Series API (charting)
+# ------------------------------------------------------
+@router.get("/pollution/series", response_model=PollutionSeriesResponse)
+async def get_pollution_series(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    start_date: Optional[date] = Query(None, description="Start date of the series (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="End date of the series, inclusive (YYYY-MM-DD)"),
+    bucket: str = Query("day", pattern="^(hour|day|week|month)$", description="Aggregation bucket: hour, day, week or month"),
+    max_points: Optional[int] = Query(None, ge=3, le=10000, description="Downsample to at most this many points (LTTB)"),
+    lttb_metric: str = Query("air_quality_index", pattern="^(air_quality_index|water_quality_index|ph_level|temperature)$", description="Metric whose mean shape LTTB preserves"),
+    sensor_id: Optional[List[int]] = Query(None, description="Sensor ids (repeat the parameter); returns one series per sensor"),
+    format: Optional[str] = Query(None, pattern="^(json|arrow|parquet)$", description="Response format: json (default), arrow (IPC stream) or parquet"),
+    accept: Optional[str] = Header(None),
+):
+    """
+    Endpoint to get per-bucket mean/min/max of AQI, WQI, pH and temperature for charting long ranges.
+    """
+    start_date, end_date = default_date_range(start_date, end_date)
+    cache = await conditional_cache(request, db, ["pollution_data"], start_date, end_date)
+    if cache.not_modified:
+        return cache.not_modified_response()
+    response.headers.update(cache.headers)
+
+    # numpy-backed (LTTB): imported on first use, not at worker startup
+    from app.services.series import fetch_pollution_series, fetch_pollution_series_by_sensor
+
+    columnar_format = negotiate_columnar_format(format, accept)
+    if sensor_id:
+        sensor_ids = sorted(set(sensor_id))
+        if len(sensor_ids) > MAX_SENSORS_PER_REQUEST:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_SENSORS_PER_REQUEST} sensor ids per request")
+        series, downsampled = await fetch_pollution_series_by_sensor(
+            db, sensor_ids, start_date, end_date, bucket, max_points=max_points, lttb_metric=f"{lttb_metric}_mean"
+        )
+        if columnar_format:
+            # Flattened: one row per (sensor, bucket) with a sensor_id column
+            columns = {"sensor_id": [sensor for sensor, values in series.items() for _ in values["bucket"]]}
+            for name in next(iter(series.values())):
+                columns[name] = [value for values in series.values() for value in values[name]]
+            return columnar_response(columns, columnar_format, headers=cache.headers)
+
+        return PollutionSeriesResponse(
+            start_date=start_date,
+            end_date=end_date,
+            bucket=bucket,
+            source="raw",
+            downsampled=downsampled,
+            points=[],
+            sensors=[
+                SensorSeries(
+                    sensor_id=sensor,
+                    points=[PollutionSeriesPoint(**dict(zip(values, row))) for row in zip(*values.values())]
+                )
+                for sensor, values in series.items()
+            ]
+        )
+
+    columns, origin, downsampled = await fetch_pollution_series(
+        db, start_date, end_date, bucket, max_points=max_points, lttb_metric=f"{lttb_metric}_mean"
+    )
+
+    if columnar_format:
+        return columnar_response(columns, columnar_format, headers=cache.headers)
+
+    names = list(columns)
+    points = [PollutionSeriesPoint(**dict(zip(names, values))) for values in zip(*columns.values())]
+    return PollutionSeriesResponse(
+        start_date=start_date,
+        end_date=end_date,
+        bucket=bucket,
+        source=origin,
+        downsampled=downsampled,
+        points=points
     )
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.db.dependencies import get_async_db, get_async_read_db
+from app.models.sensor import Sensor
+from app.schemas.sensor import SensorCreate, SensorResponse
+from app.services.sensors import list_sensors, sensor_registry
+
+router = APIRouter()
+
+# ------------------------------------------------------
+# 1. Sensor Registry API
+# ------------------------------------------------------
+@router.get("/sensors", response_model=List[SensorResponse])
+async def get_sensors(
+    db: AsyncSession = Depends(get_async_read_db),
+    active: Optional[bool] = Query(None, description="Only active (true) or retired (false) sensors"),
+):
+    """
+    Endpoint to list registered sensors.
+    """
+    return await list_sensors(db, active=active)
+
+# ------------------------------------------------------
+# 2. Register Sensor API
+# ------------------------------------------------------
+@router.post("/sensors", response_model=SensorResponse, status_code=201)
+async def register_sensor(sensor_in: SensorCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Endpoint to register a new sensor. Its id is what readings reference as sensor_id.
+    """
+    sensor = Sensor(**sensor_in.model_dump())
+    db.add(sensor)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=f"Sensor {sensor_in.code} already exists")
+    await db.refresh(sensor)
+    sensor_registry.add(sensor)
+    return sensor
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException
-from app.services.weather import get_weather
-from app.schemas.weather import WeatherResponse
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict
+from app.db.dependencies import get_async_read_db
+from app.services.weather import get_latest_weather_snapshot, get_weather_cache_stats, weather_collector
+from app.schemas.weather import WeatherCacheStatsResponse, WeatherResponse
 
 router = APIRouter()
 
@@ -8,9 +11,28 @@ router = APIRouter()
 # 4. Weather Data API
 # ------------------------------------------------------
 @router.get("/weather", response_model=WeatherResponse)
-def get_weather_data():
+async def get_weather_data(db: AsyncSession = Depends(get_async_read_db)):
     """
-    Endpoint to fetch current weather data.
+    Endpoint to fetch current weather data: the latest snapshot recorded by the weather collector.
     """
-    weather_data = get_weather()
-    return weather_data
+    return await get_latest_weather_snapshot(db)
+
+# ------------------------------------------------------
+# 4.1 Weather Cache Stats API
+# ------------------------------------------------------
+@router.get("/weather/cache_stats", response_model=WeatherCacheStatsResponse)
+def get_weather_cache_stats_data():
+    """
+    Endpoint to inspect hit/miss/refresh counters of the weather cache.
+    """
+    return get_weather_cache_stats()
+
+# ------------------------------------------------------
+# 4.2 Weather Collector Stats API
+# ------------------------------------------------------
+@router.get("/weather/collector_stats", response_model=Dict[str, int])
+def get_weather_collector_stats():
+    """
+    Endpoint to inspect poll/write counters of the background weather collector.
+    """
+    return weather_collector.stats()
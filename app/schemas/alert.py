@@ -0,0 +1,42 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional
+from datetime import datetime
+
+
+class AlertRuleCreate(BaseModel):
+    name: str
+    metric: str = Field(..., pattern="^(air_quality_index|water_quality_index|ph_level|temperature)$")
+    sensor_id: Optional[int] = None  # None applies the rule to every sensor
+    kind: str = Field("threshold", pattern="^(threshold|rate_of_change)$")
+    operator: str = Field("gt", pattern="^(gt|lt)$")
+    threshold: float
+    window_seconds: Optional[int] = Field(None, gt=0)
+    cooldown_seconds: int = Field(300, ge=0)
+    enabled: bool = True
+
+    @model_validator(mode="after")
+    def window_for_rate_rules(self):
+        if self.kind == "rate_of_change" and not self.window_seconds:
+            raise ValueError("window_seconds is required for rate_of_change rules")
+        return self
+
+class AlertRuleResponse(AlertRuleCreate):
+    id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class AlertResponse(BaseModel):
+    id: int
+    rule_id: int
+    sensor_id: int
+    metric: str
+    value: float
+    threshold: float
+    reading_date: datetime
+    fired_at: datetime
+    message: str
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import date
+
+
+class RollingCorrelationResponse(BaseModel):
+    start_date: date
+    end_date: date
+    window: int  # Days per rolling window
+    max_lag: int
+    days: List[date]  # Last day of each rolling window
+    rolling_correlation: Dict[str, List[Optional[float]]]  # pair -> one value per entry in `days`
+    lags: List[int]  # Positive lag: the weather metric leads the pollution metric by that many days
+    lag_correlation: Dict[str, List[Optional[float]]]  # pair -> one value per entry in `lags`
+    best_lag: Dict[str, Optional[int]]  # Lag with the strongest absolute correlation
@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional
+from datetime import datetime
+from app.models.sensor import DEFAULT_SENSOR_ID
+
+
+class PollutionReadingIn(BaseModel):
+    sensor_id: int = DEFAULT_SENSOR_ID  # sensors.id of the reporting sensor
+    air_quality_index: int = Field(..., ge=0, le=500)
+    water_quality_index: int = Field(..., ge=0, le=100)
+    ph_level: float = Field(..., ge=0, le=14)
+    temperature: float = Field(..., ge=-50, le=60)
+    date: Optional[datetime] = None  # Defaults to the time the reading is accepted
+
+    @field_validator("date")
+    @classmethod
+    def to_naive_local(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # pollution_data.date is TIMESTAMP WITHOUT TIME ZONE in server local time, like datetime.now()
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone().replace(tzinfo=None)
+        return value
+
+class IngestResponse(BaseModel):
+    accepted: int
+    buffered: int
+
+class IngestStatsResponse(BaseModel):
+    accepted: int
+    rejected: int
+    flushed: int
+    failed: int
+    dropped: int
+    batches: int
+    buffered: int
@@ -1,9 +1,10 @@
 from pydantic import BaseModel
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 
 class PollutionDataResponse(BaseModel):
-    sensor_id: int
+    sensor_id: Optional[int] = None  # None when the reporting device is not registered
+    sensor_code: Optional[str] = None
     air_quality_index: int
     water_quality_index: int
     temperature: float
@@ -14,11 +15,12 @@ class PollutionDataResponse(BaseModel):
         from_attributes = True
 
 class PollutionHistoricalDataResponse(BaseModel):
+    sensor_id: Optional[int] = None
     air_quality_index: int
     water_quality_index: int
     temperature: float
     ph_level: Optional[float] = None
-    date: date
+    date: datetime  # Readings carry a time of day (ingest, multiple sensors per day)
 
     class Config:
         from_attributes = True
\ No newline at end of file
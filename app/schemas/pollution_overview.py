@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 from .pollution import PollutionDataResponse, PollutionHistoricalDataResponse
 from .weather import WeatherHistoricalDataResponse, WeatherResponse
 
@@ -12,9 +12,19 @@ class HistoricalPollutionData(PollutionHistoricalDataResponse):
     class Config:
         from_attributes = True
 
+class SensorPollutionPage(BaseModel):
+    sensor_id: int
+    total_count: Optional[int] = None  # Only computed with exact_count
+    historical_data: List[HistoricalPollutionData]
+
 class HistoricalPollutionResponse(BaseModel):
     total_count: int
+    total_count_is_estimate: bool = False
+    next_cursor: Optional[str] = None
     historical_data: List[HistoricalPollutionData]
+    # Set when sensor ids are requested: one page per sensor (historical_data is then empty) and
+    # next_cursor resumes every sensor that has more rows
+    sensors: Optional[List[SensorPollutionPage]] = None
 
     class Config:
         from_attributes = True
@@ -25,17 +35,21 @@ class HistoricalPollutionResponse(BaseModel):
 
 class HistoricalWeatherResponse(BaseModel):
     total_count: int
+    total_count_is_estimate: bool = False
+    next_cursor: Optional[str] = None
     historical_data: List[WeatherHistoricalDataResponse]
 
 class PollutionOverviewResponse(BaseModel):
-    live_pollution_data: LivePollutionData
-    historical_pollution_data: HistoricalPollutionResponse
-    historical_weather_data: HistoricalWeatherResponse
-    weather: WeatherResponse
+    # Sections are null when their source timed out or failed, see section_status
+    live_pollution_data: Optional[LivePollutionData] = None
+    historical_pollution_data: Optional[HistoricalPollutionResponse] = None
+    historical_weather_data: Optional[HistoricalWeatherResponse] = None
+    weather: Optional[WeatherResponse] = None
+    section_status: Dict[str, str] = {}  # section name -> "ok" | "timeout" | "error"
 
     class Config:
         from_attributes = True
 
 class CorrelationSummaryResponse(BaseModel):
-    correlation_summary: Dict[str, float]
+    correlation_summary: Dict[str, Optional[float]]
     insights: List[str]
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class SensorCreate(BaseModel):
+    code: str
+    name: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    active: bool = True
+
+class SensorResponse(SensorCreate):
+    id: int
+    installed_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, datetime
+
+
+class PollutionSeriesPoint(BaseModel):
+    bucket: datetime
+    sample_count: int
+    air_quality_index_mean: Optional[float] = None
+    air_quality_index_min: Optional[float] = None
+    air_quality_index_max: Optional[float] = None
+    water_quality_index_mean: Optional[float] = None
+    water_quality_index_min: Optional[float] = None
+    water_quality_index_max: Optional[float] = None
+    ph_level_mean: Optional[float] = None
+    ph_level_min: Optional[float] = None
+    ph_level_max: Optional[float] = None
+    temperature_mean: Optional[float] = None
+    temperature_min: Optional[float] = None
+    temperature_max: Optional[float] = None
+
+class SensorSeries(BaseModel):
+    sensor_id: int
+    points: List[PollutionSeriesPoint]
+
+class PollutionSeriesResponse(BaseModel):
+    start_date: date
+    end_date: date
+    bucket: str
+    source: str  # "rollup", "rollup+raw" (days not yet refreshed read raw) or "raw" (rollups disabled, per sensor)
+    downsampled: bool  # True when LTTB reduced the buckets to max_points
+    points: List[PollutionSeriesPoint]
+    # Set when sensor ids are requested: one series per sensor (points is then empty)
+    sensors: Optional[List[SensorSeries]] = None
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+from datetime import date
+
+
+class MetricStatistics(BaseModel):
+    count: int
+    mean: Optional[float] = None
+    stddev: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+class RangeStatisticsResponse(BaseModel):
+    start_date: date
+    end_date: date
+    sample_count: int
+    source: str  # "rollup", "rollup+raw" (days not yet refreshed read raw) or "raw" (rollups disabled)
+    metrics: Dict[str, MetricStatistics]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
-from datetime import date
+from datetime import datetime
 
 
 class WeatherResponse(BaseModel):
@@ -19,7 +19,7 @@ class WeatherResponse(BaseModel):
         from_attributes = True
 
 class WeatherHistoricalDataResponse(BaseModel):
-    date: date
+    date: datetime
     temperature: float
     humidity: int
     wind_speed: float
@@ -27,4 +27,11 @@ class WeatherHistoricalDataResponse(BaseModel):
     weather_description: str
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+class WeatherCacheStatsResponse(BaseModel):
+    hits: int
+    stale_hits: int
+    misses: int
+    refreshes: int
+    errors: int
+    age_seconds: Optional[float] = None
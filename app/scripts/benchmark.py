@@ -0,0 +1,257 @@
+"""
+Benchmark every v1 endpoint in-process and save throughput/latency percentiles as JSON.
+
+    poetry run python -m app.scripts.benchmark --seed-rows 100000 --concurrency 16 --requests 500
+
+Runs against the database configured in .env (Postgres: the queries rely on partitions,
+triggers and corr()). --seed-rows TRUNCATEs the data tables first, so point it at a
+benchmark database, never at one whose data you want to keep.
+"""
+import argparse
+import asyncio
+import io
+import json
+import platform
+import subprocess
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from app.core.config import CORE_SETTINGS
+from app.db.partitions import create_partitions_for_range
+from app.db.sessions import AsyncSessionLocal, engine
+from app.schemas.weather import WeatherResponse
+from app.scripts.populate_data import BULK_COLUMNS, ensure_bulk_sensors, generate_bulk_chunk
+from app.services.rollups import refresh_dirty_rollups
+from app.services.weather import weather_cache, weather_collector
+
+# Tables emptied before seeding (raw data plus everything derived from it)
+SEEDED_TABLES = ("pollution_data", "weather_data", "pollution_rollup", "weather_rollup", "rollup_dirty_days")
+
+# Sensors requested together by the per-sensor scenarios
+MAX_BENCHMARK_SENSORS = 5
+
+def fake_weather() -> WeatherResponse:
+    """
+    Local stand-in for the OpenWeather call so runs don't depend on the network or an API key.
+    """
+    return WeatherResponse(
+        city="Pokhara",
+        temperature=24.5,
+        feels_like=25.1,
+        humidity=68,
+        weather_description="scattered clouds",
+        wind_speed=2.4,
+        sunrise=1729210000,
+        sunset=1729252000,
+        country="NP",
+    )
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+def seed_dataset(rows: int, days: int, chunk_rows: int, seed: int, sensors: int = 1) -> None:
+    """
+    Replace the data tables with `rows` generated readings each, spread evenly over the last `days` days,
+    then rebuild the rollups and refresh planner statistics. Pollution readings are split across
+    sensors 1..sensors (one reading per sensor per timestamp).
+    """
+    # Without a partition per seeded month the rows would land in the default partitions
+    with engine.begin() as conn:
+        for table in ("pollution_data", "weather_data"):
+            create_partitions_for_range(conn, table, (datetime.now() - timedelta(days=days)).date(), date.today())
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(f"TRUNCATE {', '.join(SEEDED_TABLES)}")
+        ensure_bulk_sensors(cursor, sensors)
+        for table in ("pollution_data", "weather_data"):
+            table_sensors = sensors if table == "pollution_data" else 1
+            timestamps = max(1, rows // table_sensors)
+            step = np.timedelta64(max(1, days * 86_400_000 // timestamps), "ms")
+            start = np.datetime64(datetime.now(), "ms") - step * timestamps
+            per_chunk = max(1, chunk_rows // table_sensors)
+            copy_sql = f"COPY {table} ({', '.join(BULK_COLUMNS[table])}) FROM STDIN WITH (FORMAT csv)"
+            started = time.perf_counter()
+            for i, first in enumerate(range(0, timestamps, per_chunk)):
+                csv_text, _ = generate_bulk_chunk(table, start, step, first, min(first + per_chunk, timestamps), table_sensors, seed + i)
+                cursor.copy_expert(copy_sql, io.StringIO(csv_text))
+            connection.commit()
+            print(f"Seeded {timestamps * table_sensors} rows into {table} in {time.perf_counter() - started:.1f}s.")
+    finally:
+        connection.close()
+
+    async def refresh():
+        async with AsyncSessionLocal() as db:
+            await refresh_dirty_rollups(db)
+    asyncio.run(refresh())
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE pollution_data, weather_data, pollution_rollup, weather_rollup")
+        conn.commit()
+
+def build_scenarios(days: int, sensors: int = 1) -> Dict[str, dict]:
+    """
+    One request template per route in app/routers/v1. The live SSE/WebSocket streams never finish
+    and are left out; their per-tick cost is the same as /live_pollution_data. POST /sensors and
+    POST /alerts/rules create a record per call and are left out too.
+    """
+    end = date.today()
+    week = {"start_date": (end - timedelta(days=7)).isoformat(), "end_date": end.isoformat()}
+    full = {"start_date": (end - timedelta(days=days)).isoformat(), "end_date": end.isoformat()}
+    readings = [
+        {"air_quality_index": 80 + i % 50, "water_quality_index": 60, "ph_level": 7.2, "temperature": 21.5,
+         "date": datetime.now().isoformat()}
+        for i in range(100)
+    ]
+    sensor_ids = list(range(1, min(sensors, MAX_BENCHMARK_SENSORS) + 1))
+    return {
+        "live_pollution_data": {"method": "GET", "url": "/api/v1/live_pollution_data"},
+        "historical_pollution_data": {"method": "GET", "url": "/api/v1/historical_pollution_data", "params": {**week, "limit": 100}},
+        "historical_pollution_data_exact": {"method": "GET", "url": "/api/v1/historical_pollution_data", "params": {**week, "limit": 100, "exact_count": "true"}},
+        "historical_pollution_data_arrow": {"method": "GET", "url": "/api/v1/historical_pollution_data", "params": {**week, "limit": 100, "format": "arrow"}},
+        "historical_pollution_data_parquet": {"method": "GET", "url": "/api/v1/historical_pollution_data", "params": {**week, "limit": 100, "format": "parquet"}},
+        "historical_pollution_by_sensor": {"method": "GET", "url": "/api/v1/historical_pollution_data", "params": {**week, "limit": 100, "sensor_id": sensor_ids}},
+        "historical_weather_data": {"method": "GET", "url": "/api/v1/historical_weather_data", "params": {**week, "limit": 100}},
+        "pollution_overview": {"method": "GET", "url": "/api/v1/pollution_overview", "params": {**week, "limit": 100}},
+        "weather": {"method": "GET", "url": "/api/v1/weather"},
+        "weather_cache_stats": {"method": "GET", "url": "/api/v1/weather/cache_stats"},
+        "weather_collector_stats": {"method": "GET", "url": "/api/v1/weather/collector_stats"},
+        "pollution_weather_correlation": {"method": "GET", "url": "/api/v1/pollution-weather-correlation", "params": full},
+        "pollution_weather_correlation_arrow": {"method": "GET", "url": "/api/v1/pollution-weather-correlation", "params": {**full, "format": "arrow"}},
+        "pollution_weather_correlation_rolling": {"method": "GET", "url": "/api/v1/pollution-weather-correlation/rolling", "params": full},
+        "pollution_statistics": {"method": "GET", "url": "/api/v1/pollution_statistics", "params": full},
+        "pollution_statistics_parquet": {"method": "GET", "url": "/api/v1/pollution_statistics", "params": {**full, "format": "parquet"}},
+        "weather_statistics": {"method": "GET", "url": "/api/v1/weather_statistics", "params": full},
+        "pollution_series_day": {"method": "GET", "url": "/api/v1/pollution/series", "params": {**full, "bucket": "day"}},
+        "pollution_series_hour_lttb": {"method": "GET", "url": "/api/v1/pollution/series", "params": {**full, "bucket": "hour", "max_points": 500}},
+        "pollution_series_by_sensor": {"method": "GET", "url": "/api/v1/pollution/series", "params": {**full, "bucket": "day", "sensor_id": sensor_ids}},
+        "sensors": {"method": "GET", "url": "/api/v1/sensors"},
+        "export_pollution_csv": {"method": "GET", "url": "/api/v1/export/pollution", "params": {**week, "format": "csv"}},
+        "export_pollution_ndjson": {"method": "GET", "url": "/api/v1/export/pollution", "params": {**week, "format": "ndjson"}},
+        "export_weather_ndjson": {"method": "GET", "url": "/api/v1/export/weather", "params": {**week, "format": "ndjson"}},
+        "ingest_pollution": {"method": "POST", "url": "/api/v1/ingest/pollution", "json": readings},
+        "ingest_stats": {"method": "GET", "url": "/api/v1/ingest/stats"},
+        "alerts": {"method": "GET", "url": "/api/v1/alerts", "params": {"limit": 100}},
+        "alert_rules": {"method": "GET", "url": "/api/v1/alerts/rules"},
+    }
+
+def summarize(latencies: List[float], errors: int, wall_seconds: float) -> Dict[str, float]:
+    values = np.array(latencies) * 1000.0
+    p50, p95, p99 = np.percentile(values, [50, 95, 99]) if len(values) else (None, None, None)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": len(latencies) / wall_seconds if wall_seconds else None,
+        "mean_ms": float(values.mean()) if len(values) else None,
+        "p50_ms": float(p50) if p50 is not None else None,
+        "p95_ms": float(p95) if p95 is not None else None,
+        "p99_ms": float(p99) if p99 is not None else None,
+        "max_ms": float(values.max()) if len(values) else None,
+    }
+
+async def run_scenario(client: httpx.AsyncClient, scenario: dict, requests: int, concurrency: int, warmup: int) -> Dict[str, float]:
+    """
+    Issue `requests` copies of one request with `concurrency` in flight; returns summary statistics.
+    """
+    for _ in range(warmup):
+        await client.request(**scenario)
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                response = await client.request(**scenario)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+async def run_benchmark(args) -> dict:
+    # Imported here so seeding doesn't pay for building the app
+    from app.main import app
+
+    weather_cache._fetch = fake_weather
+    weather_cache.clear()
+    # The collector would write weather_data mid-run, invalidating caches and rollups
+    weather_collector._fetch = fake_weather
+    CORE_SETTINGS.WEATHER_COLLECTOR_ENABLED = False
+
+    scenarios = build_scenarios(args.days, args.sensors)
+    selected = args.only or list(scenarios)
+    results = {}
+    async with app.router.lifespan_context(app):
+        # Unhandled app exceptions become 500s (counted as errors) instead of aborting the run
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            for name in selected:
+                results[name] = await run_scenario(client, scenarios[name], args.requests, args.concurrency, args.warmup)
+                summary = results[name]
+                if not summary["requests"]:
+                    print(f"{name:34} every request failed  errors {summary['errors']}")
+                    continue
+                print(f"{name:34} {summary['throughput_rps']:9.1f} req/s  p50 {summary['p50_ms']:8.2f} ms  "
+                      f"p95 {summary['p95_ms']:8.2f} ms  p99 {summary['p99_ms']:8.2f} ms  errors {summary['errors']}")
+    return results
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the v1 API endpoints in-process.")
+    parser.add_argument("--seed-rows", type=int, help="Replace the data tables with this many generated rows each (1000 to 10000000)")
+    parser.add_argument("--sensors", type=int, default=1, help="Sensors the seeded pollution readings are split across")
+    parser.add_argument("--days", type=int, default=365, help="Days of history the seeded rows are spread over")
+    parser.add_argument("--chunk-rows", type=int, default=100000, help="Rows per COPY batch while seeding")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the generated dataset")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight per endpoint")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per endpoint before timing")
+    parser.add_argument("--only", nargs="+", help="Run only these scenarios (names as printed)")
+    parser.add_argument("--output", help="JSON file for the results (default: benchmark-<commit>.json)")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    if args.seed_rows is not None:
+        if not 1000 <= args.seed_rows <= 10_000_000:
+            raise SystemExit("--seed-rows must be between 1000 and 10000000")
+        seed_dataset(args.seed_rows, args.days, args.chunk_rows, args.seed, args.sensors)
+
+    results = asyncio.run(run_benchmark(args))
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "seed_rows": args.seed_rows,
+        "days": args.days,
+        "sensors": args.sensors,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "results": results,
+    }
+    output = args.output or f"benchmark-{(commit or 'unknown')[:12]}.json"
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
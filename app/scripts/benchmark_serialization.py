@@ -0,0 +1,94 @@
+"""
+Compare the historical JSON paths without a database: ORM entities validated into the
+response schemas and encoded with the stdlib, against row tuples encoded with orjson.
+
+    poetry run python -m app.scripts.benchmark_serialization --rows 100 100000
+
+For the end-to-end effect (query included) run app.scripts.benchmark, whose
+historical_* scenarios use limit=100 and export_* scenarios stream whole weeks.
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+import orjson
+
+from app.models.pollution_data import PollutionData
+from app.models.weather_data import WeatherData
+from app.schemas.pollution_overview import HistoricalPollutionResponse, HistoricalWeatherResponse
+from app.services.pollution import HISTORICAL_POLLUTION_COLUMNS, HISTORICAL_WEATHER_COLUMNS
+
+def _pollution_values(i: int, start: datetime) -> Dict:
+    return {
+        "id": i, "sensor_id": 1 + i % 20, "air_quality_index": random.randint(0, 500),
+        "water_quality_index": random.randint(0, 100), "temperature": round(random.uniform(-5, 40), 2),
+        "ph_level": round(random.uniform(5, 9), 2), "date": start + timedelta(seconds=i),
+    }
+
+def _weather_values(i: int, start: datetime) -> Dict:
+    return {
+        "id": i, "temperature": round(random.uniform(-5, 40), 2), "feels_like": round(random.uniform(-5, 40), 2),
+        "humidity": random.randint(0, 100), "weather_description": "scattered clouds",
+        "wind_speed": round(random.uniform(0, 15), 2), "rain_mm": None, "sunrise": 1700000000,
+        "sunset": 1700040000, "city": "Pokhara", "country": "NP", "date": start + timedelta(seconds=i),
+    }
+
+def orm_path(model, response_model, make_values, rows: int) -> Callable[[], bytes]:
+    """
+    Previous path: full entities, from_attributes validation, stdlib encoding of the dumped model.
+    """
+    start = datetime(2024, 1, 1)
+    entities = [model(**make_values(i, start)) for i in range(rows)]
+
+    def run() -> bytes:
+        response = response_model(historical_data=entities, total_count=rows, total_count_is_estimate=True)
+        return json.dumps(response.model_dump(mode="json"), separators=(",", ":")).encode()
+    return run
+
+def tuple_path(column_names, make_values, rows: int) -> Callable[[], bytes]:
+    """
+    Fast path: only the response columns as tuples, zipped into dicts and encoded by orjson.
+    """
+    start = datetime(2024, 1, 1)
+    tuples = [tuple(values[name] for name in column_names) for values in (make_values(i, start) for i in range(rows))]
+
+    def run() -> bytes:
+        return orjson.dumps({
+            "total_count": rows,
+            "total_count_is_estimate": True,
+            "next_cursor": None,
+            "historical_data": [dict(zip(column_names, row)) for row in tuples],
+        })
+    return run
+
+def best_of(run: Callable[[], bytes], repeat: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark historical JSON serialization paths.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 100000], help="Page sizes to measure")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args(argv)
+    random.seed(0)
+
+    datasets = {
+        "pollution": (PollutionData, HistoricalPollutionResponse, HISTORICAL_POLLUTION_COLUMNS, _pollution_values),
+        "weather": (WeatherData, HistoricalWeatherResponse, HISTORICAL_WEATHER_COLUMNS, _weather_values),
+    }
+    for name, (model, response_model, column_names, make_values) in datasets.items():
+        for rows in args.rows:
+            orm = best_of(orm_path(model, response_model, make_values, rows), args.repeat)
+            fast = best_of(tuple_path(column_names, make_values, rows), args.repeat)
+            print(f"{name:10} rows={rows:<8} orm+pydantic+json {orm * 1000:10.2f} ms   "
+                  f"tuples+orjson {fast * 1000:10.2f} ms   speedup {orm / fast:6.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,20 @@
-from sqlalchemy import create_engine, text
-from app.core.config import CORE_SETTINGS
+import asyncio
+from sqlalchemy import text
+from app.db.sessions import engine, read_replicas
 
-# Create a database engine
-engine = create_engine(CORE_SETTINGS.DATABASE_URL)
+async def check_replicas():
+    for index, replica in enumerate(read_replicas.engines):
+        try:
+            async with replica.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            print(f"Read replica {index} is available.")
+        except Exception as e:
+            print(f"Failed to connect to read replica {index}. Error: {e}")
+        finally:
+            await replica.dispose()
 
 try:
-    # Connect to the database
+    # Connect to the database, using the application's engine and pool settings
     with engine.connect() as conn:
         # Use a text() object to execute raw SQL
         result = conn.execute(text("SELECT 1")).fetchone()
@@ -16,3 +25,5 @@ try:
             print("Unexpected result from the database. Please check your configuration.")
 except Exception as e:
     print(f"Failed to connect to the database. Error: {e}")
+
+asyncio.run(check_replicas())
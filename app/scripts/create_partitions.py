@@ -0,0 +1,17 @@
+import argparse
+from app.db.partitions import create_future_partitions
+from app.db.sessions import engine
+
+def main():
+    parser = argparse.ArgumentParser(description="Create monthly partitions for pollution_data and weather_data ahead of time.")
+    parser.add_argument("--months-ahead", type=int, default=3, help="Number of months after the current one to prepare")
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        created = create_future_partitions(conn, months_ahead=args.months_ahead)
+
+    for table, count in created.items():
+        print(f"{table}: {count} new partition(s) created.")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,17 @@
+import argparse
+import io
+import os
+import time
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from faker import Faker
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+from typing import Iterator, Tuple
 from sqlalchemy.orm import Session
-from app.db.sessions import SessionLocal
+from app.db.partitions import create_partitions_for_range
+from app.db.sessions import SessionLocal, engine
 from app.models.pollution_data import PollutionData
 from app.models.weather_data import WeatherData
 from sqlalchemy import func
@@ -169,7 +179,176 @@ def populate_data_for_year(start_year: int) -> bool:
         print("There was an error populating the data.")
         return False
 
+# ------------------------------------------------------
+# Fast bulk loader (non-interactive)
+# ------------------------------------------------------
+GRANULARITY_STEPS = {
+    "day": np.timedelta64(1, "D"),
+    "hour": np.timedelta64(1, "h"),
+    "minute": np.timedelta64(1, "m"),
+}
+
+BULK_COLUMNS = {
+    "pollution_data": ["date", "sensor_id", "air_quality_index", "water_quality_index", "ph_level", "temperature"],
+    "weather_data": [
+        "date", "temperature", "feels_like", "humidity", "weather_description", "wind_speed",
+        "rain_mm", "sunrise", "sunset", "city", "country",
+    ],
+}
+
+# Small vocabularies drawn once so the workers can pick text columns with vectorized choice()
+WORDS = [fake.word() for _ in range(50)]
+CITIES = [fake.city() for _ in range(20)]
+COUNTRIES = [fake.country() for _ in range(20)]
+
+def generate_bulk_chunk(table: str, start: np.datetime64, step: np.timedelta64, first: int, last: int, sensors: int, seed: int) -> Tuple[str, int]:
+    """
+    Generate timestamps [first, last) of `table` (one row per sensor per timestamp) as CSV text for COPY.
+    Pollution rows carry sensor ids 1..sensors; weather rows are not per sensor but keep the same volume.
+    Runs in a worker process; every column is drawn with one NumPy call for the whole chunk.
+    """
+    rng = np.random.default_rng(seed)
+    dates = np.repeat(start + np.arange(first, last) * step, sensors)
+    n = len(dates)
+
+    if table == "pollution_data":
+        frame = pd.DataFrame({
+            "date": dates,
+            "sensor_id": np.tile(np.arange(1, sensors + 1), last - first),
+            "air_quality_index": rng.integers(0, 501, n),
+            "water_quality_index": rng.integers(0, 101, n),
+            "ph_level": rng.uniform(6.5, 8.5, n).round(2),
+            "temperature": rng.uniform(-10.0, 40.0, n).round(1),
+        })
+    else:
+        rain = rng.uniform(0.0, 100.0, n).round(2)
+        frame = pd.DataFrame({
+            "date": dates,
+            "temperature": rng.uniform(-10.0, 60.0, n).round(2),
+            "feels_like": rng.uniform(-10.0, 60.0, n).round(2),
+            "humidity": rng.integers(0, 101, n),
+            "weather_description": rng.choice(WORDS, n),
+            "wind_speed": rng.uniform(0.0, 15.0, n).round(2),
+            # Roughly 30% of readings have rain, the rest are NULL (empty CSV field)
+            "rain_mm": np.where(rng.random(n) < 0.3, rain, np.nan),
+            "sunrise": rng.integers(1600000000, 1700000000, n),
+            "sunset": rng.integers(1700000000, 1800000000, n),
+            "city": rng.choice(CITIES, n),
+            "country": rng.choice(COUNTRIES, n),
+        })
+
+    return frame.to_csv(index=False, header=False, columns=BULK_COLUMNS[table]), n
+
+def ensure_bulk_sensors(cursor, sensors: int) -> None:
+    """
+    Register sensors 1..sensors (those missing get a "bulk-<id>" code) so generated readings satisfy
+    the pollution_data.sensor_id foreign key.
+    """
+    cursor.execute(
+        "INSERT INTO sensors (id, code) "
+        "SELECT n, 'bulk-' || lpad(n::text, 3, '0') FROM generate_series(1, %s) AS n "
+        "ON CONFLICT DO NOTHING",
+        (sensors,),
+    )
+    cursor.execute("SELECT setval('sensors_id_seq', (SELECT max(id) FROM sensors))")
+
+def _chunk_results(table: str, start: np.datetime64, step: np.timedelta64, total: int, args) -> Iterator[Tuple[str, int]]:
+    """
+    Yield generated CSV chunks in order. With workers > 1 the chunks are produced by a process
+    pool, keeping at most 2 * workers chunks in flight so memory stays bounded.
+    """
+    per_chunk = max(1, args.chunk_rows // args.sensors)
+    bounds = [(first, min(first + per_chunk, total)) for first in range(0, total, per_chunk)]
+    tasks = [(table, start, step, first, last, args.sensors, args.seed + i) for i, (first, last) in enumerate(bounds)]
+
+    if args.workers <= 1:
+        for task in tasks:
+            yield generate_bulk_chunk(*task)
+        return
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(generate_bulk_chunk, *task))
+            if len(pending) >= 2 * args.workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def bulk_load_table(table: str, model, args) -> int:
+    """
+    Stream generated rows for `table` into Postgres with COPY, committing every chunk.
+    Rows stop just before the oldest existing record so reruns don't overlap existing data.
+    """
+    db = SessionLocal()
+    try:
+        oldest_date = get_oldest_record_date(db, model)
+    finally:
+        db.close()
+
+    step = GRANULARITY_STEPS[args.granularity]
+    start = np.datetime64(date(args.start_year, 1, 1), "s")
+    end = np.datetime64(oldest_date, "s") if oldest_date else np.datetime64(datetime.now(), "s")
+    total = int((end - start) // step) + (0 if oldest_date else 1)
+    if total <= 0:
+        print(f"{table}: data already exists from {oldest_date}, nothing to add from {args.start_year}.")
+        return 0
+
+    # Partitions only exist from the oldest loaded month on; older months would land in the default partition
+    last = (start + (total - 1) * step).astype(datetime)
+    with engine.begin() as conn:
+        created = create_partitions_for_range(conn, table, date(args.start_year, 1, 1), last.date())
+    print(f"{table}: created {created} monthly partitions.")
+
+    copy_sql = f"COPY {table} ({', '.join(BULK_COLUMNS[table])}) FROM STDIN WITH (FORMAT csv)"
+    connection = engine.raw_connection()
+    rows_written = 0
+    started = time.perf_counter()
+    try:
+        cursor = connection.cursor()
+        if table == "pollution_data":
+            ensure_bulk_sensors(cursor, args.sensors)
+            connection.commit()
+        for csv_text, rows in _chunk_results(table, start, step, total, args):
+            cursor.copy_expert(copy_sql, io.StringIO(csv_text))
+            connection.commit()
+            rows_written += rows
+            elapsed = time.perf_counter() - started
+            print(f"{table}: {rows_written} rows, {rows_written / elapsed:,.0f} rows/sec", end="\r")
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"{table}: {rows_written} rows loaded in {elapsed:.1f}s ({rows_written / max(elapsed, 1e-9):,.0f} rows/sec).")
+    return rows_written
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Populate pollution and weather history with fake data.")
+    parser.add_argument("--start-year", type=int, help="First year to generate; omit to be prompted interactively")
+    parser.add_argument("--granularity", choices=sorted(GRANULARITY_STEPS), default="day", help="Time between generated readings")
+    parser.add_argument("--sensors", type=int, default=1, help="Sensors (ids 1..N) with a reading per timestamp")
+    parser.add_argument("--chunk-rows", type=int, default=100000, help="Rows per COPY batch")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes generating rows")
+    parser.add_argument("--tables", nargs="+", choices=sorted(BULK_COLUMNS), default=sorted(BULK_COLUMNS), help="Tables to load")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for reproducible datasets")
+    return parser.parse_args(argv)
+
+def bulk_populate(args) -> int:
+    """
+    Non-interactive loader: vectorized generation plus COPY. Returns total rows written.
+    """
+    models = {"pollution_data": PollutionData, "weather_data": WeatherData}
+    return sum(bulk_load_table(table, models[table], args) for table in args.tables)
+
 if __name__ == "__main__":
+    args = parse_args()
+    if args.start_year is not None:
+        bulk_populate(args)
+        raise SystemExit(0)
+
     print("Starting database population...")
 
     # Prompt the user to enter the year for adding data
@@ -0,0 +1,13 @@
+import asyncio
+from app.db.sessions import AsyncSessionLocal
+from app.services.rollups import refresh_dirty_rollups
+
+async def main():
+    async with AsyncSessionLocal() as db:
+        refreshed = await refresh_dirty_rollups(db)
+
+    for source, days in refreshed.items():
+        print(f"{source}: rollups rebuilt for {days} day(s).")
+
+if __name__ == "__main__":
+    asyncio.run(main())
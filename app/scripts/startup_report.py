@@ -0,0 +1,148 @@
+"""
+Report how long a worker takes to boot: import time per module and time to first request.
+
+    poetry run python -m app.scripts.startup_report --budget-ms 1500
+
+Each measurement runs in a fresh interpreter so nothing is already imported. The import
+breakdown comes from `python -X importtime -c "import app.main"`; time to first request is
+measured from process spawn through the lifespan startup to the first response (in-process,
+httpx + ASGI transport). Exits with status 1 when time to first request exceeds --budget-ms.
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# Default route for the first request: answers without touching the database
+DEFAULT_PATH = "/metrics"
+
+def parse_importtime(output: str) -> List[Tuple[str, float, float]]:
+    """
+    (module, self_ms, cumulative_ms) for every line of -X importtime output.
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # Header line
+        modules.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return modules
+
+def measure_imports() -> List[Tuple[str, float, float]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Importing app.main failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+def measure_first_request(path: str) -> Dict[str, float]:
+    """
+    Spawn a worker-like process and return milliseconds from spawn to each startup phase.
+    """
+    spawned = time.time()
+    result = subprocess.run(
+        [sys.executable, "-m", "app.scripts.startup_report", "--child", "--path", path],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Startup run failed:\n{result.stderr[-2000:]}")
+    # The child prints other output (e.g. startup warnings) before its JSON line
+    phases = json.loads(result.stdout.strip().splitlines()[-1])
+    status = phases.pop("status")
+    timings = {phase: (stamp - spawned) * 1000 for phase, stamp in phases.items()}
+    timings["status"] = status
+    return timings
+
+async def _child(path: str) -> None:
+    import httpx
+
+    from app.main import app
+    imported = time.time()
+
+    async with app.router.lifespan_context(app):
+        started = time.time()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+            response = await client.get(path)
+        first_response = time.time()
+
+    print(json.dumps({
+        "imported": imported,
+        "lifespan_started": started,
+        "first_response": first_response,
+        "status": response.status_code,
+    }))
+
+def print_imports(modules: List[Tuple[str, float, float]], top: int) -> None:
+    by_package: Dict[str, float] = defaultdict(float)
+    for name, self_ms, _ in modules:
+        by_package[name.split(".")[0]] += self_ms
+    total = sum(by_package.values())
+
+    print(f"Import of app.main: {total:.1f} ms across {len(modules)} modules\n")
+    print("Slowest packages (self time summed):")
+    for package, self_ms in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {package:40} {self_ms:9.1f} ms")
+
+    print("\nSlowest modules (self time, cumulative includes the imports they trigger):")
+    for name, self_ms, cumulative_ms in sorted(modules, key=lambda module: -module[1])[:top]:
+        print(f"  {name:40} {self_ms:9.1f} ms  (cumulative {cumulative_ms:9.1f} ms)")
+
+    print("\nApplication modules (cumulative):")
+    for name, _, cumulative_ms in sorted(modules, key=lambda module: -module[2]):
+        if name == "app" or name.startswith("app."):
+            print(f"  {name:40} {cumulative_ms:9.1f} ms")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure worker import time and time to first request.")
+    parser.add_argument("--path", default=DEFAULT_PATH, help="Route requested first (default: /metrics)")
+    parser.add_argument("--runs", type=int, default=3, help="Startup runs; the median is reported")
+    parser.add_argument("--top", type=int, default=15, help="Packages/modules listed in the import breakdown")
+    parser.add_argument("--budget-ms", type=float, help="Fail (exit 1) when time to first request exceeds this")
+    parser.add_argument("--output", help="Also write the report as JSON to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    if args.child:
+        asyncio.run(_child(args.path))
+        return
+
+    modules = measure_imports()
+    print_imports(modules, args.top)
+
+    runs = [measure_first_request(args.path) for _ in range(args.runs)]
+    median = {
+        phase: sorted(run[phase] for run in runs)[len(runs) // 2]
+        for phase in ("imported", "lifespan_started", "first_response")
+    }
+    print(f"\nStartup (median of {len(runs)} runs, from process spawn, GET {args.path} -> {runs[-1]['status']}):")
+    print(f"  {'interpreter + imports':40} {median['imported']:9.1f} ms")
+    print(f"  {'lifespan startup done':40} {median['lifespan_started']:9.1f} ms")
+    print(f"  {'first response':40} {median['first_response']:9.1f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "modules": [{"module": name, "self_ms": self_ms, "cumulative_ms": cumulative_ms} for name, self_ms, cumulative_ms in modules],
+                "runs": runs,
+                "median_ms": median,
+                "budget_ms": args.budget_ms,
+            }, f, indent=2)
+        print(f"Report written to {args.output}")
+
+    if args.budget_ms is not None and median["first_response"] > args.budget_ms:
+        print(f"Time to first request {median['first_response']:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
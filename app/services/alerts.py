@@ -0,0 +1,266 @@
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import column, exists, insert, select, values
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import CORE_SETTINGS
+from app.core.metrics import REGISTRY
+from app.db.sessions import AsyncSessionLocal
+from app.models.alert import ALERT_METRICS, Alert, AlertRule
+from app.schemas.ingest import PollutionReadingIn
+
+logger = logging.getLogger(__name__)
+
+# Columns written for each fired alert (fired_at comes from the server default)
+ALERT_INSERT_COLUMNS = ("rule_id", "sensor_id", "metric", "value", "threshold", "reading_date", "message")
+
+def _insert_alerts_query(alerts: Sequence[Dict]):
+    """
+    INSERT ... SELECT of the fired alerts whose rule still exists: a rule deleted after the alert
+    was queued would otherwise fail the whole batch on the alerts.rule_id foreign key.
+    """
+    fired = values(
+        *[column(name, Alert.__table__.c[name].type) for name in ALERT_INSERT_COLUMNS], name="fired"
+    ).data([tuple(alert[name] for name in ALERT_INSERT_COLUMNS) for alert in alerts])
+    rows = select(fired).where(exists().where(AlertRule.id == fired.c.rule_id))
+    return insert(Alert).from_select(ALERT_INSERT_COLUMNS, rows).returning(Alert.id)
+
+class CompiledRule:
+    """
+    Plain-attribute copy of an AlertRule, so evaluation never touches the ORM.
+    """
+    __slots__ = ("id", "name", "metric", "sensor_id", "kind", "above", "threshold", "window", "cooldown")
+
+    def __init__(self, rule: AlertRule):
+        self.id = rule.id
+        self.name = rule.name
+        self.metric = rule.metric
+        self.sensor_id = rule.sensor_id
+        self.kind = rule.kind
+        self.above = rule.operator == "gt"
+        self.threshold = rule.threshold
+        self.window = timedelta(seconds=rule.window_seconds or 0)
+        self.cooldown = timedelta(seconds=rule.cooldown_seconds)
+
+    def breached(self, value: float) -> bool:
+        return value > self.threshold if self.above else value < self.threshold
+
+class AlertEngine:
+    """
+    Evaluates incoming readings against the alert rules without reading pollution_data.
+
+    Rules are indexed by (metric, sensor_id) plus (metric, None) for rules that apply to every
+    sensor, so each reading only visits the rules that can match it. Rate-of-change rules keep a
+    per-(rule, sensor) deque of recent (date, value) pairs trimmed to the rule's window.
+
+    A rule fires once when a sensor enters the breached state and re-arms when it leaves it
+    (deduplication); it also stays silent for `cooldown_seconds` after firing. This state lives in
+    the process, so every reading of a sensor has to reach the same engine: with alerts enabled,
+    run the app as a single worker. Otherwise rate-of-change rules see only part of each sensor's
+    readings and alerts are duplicated across workers. Fired alerts are
+    queued and written in batches by a background task; batches that fail transiently are
+    requeued, keeping at most `max_pending` alerts.
+    """
+
+    def __init__(self, flush_interval: float, reload_interval: float, batch_size: int = 1000, max_pending: int = 10000):
+        self.flush_interval = flush_interval
+        self.reload_interval = reload_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._index: Dict[Tuple[str, Optional[int]], List[CompiledRule]] = {}
+        # Per (rule id, sensor id) state, kept across rule reloads
+        self._windows: Dict[Tuple[int, int], deque] = {}
+        self._active: Dict[Tuple[int, int], bool] = {}
+        self._last_fired: Dict[Tuple[int, int], datetime] = {}
+        self._pending: List[Dict] = []
+        self._task = None
+        self._stats = {"evaluated": 0, "fired": 0, "suppressed": 0, "written": 0, "failed": 0, "dropped": 0, "rules": 0}
+
+    def set_rules(self, rules: Sequence[AlertRule]) -> None:
+        index: Dict[Tuple[str, Optional[int]], List[CompiledRule]] = {}
+        for rule in rules:
+            if rule.enabled:
+                index.setdefault((rule.metric, rule.sensor_id), []).append(CompiledRule(rule))
+        self._index = index
+        self._stats["rules"] = sum(len(compiled) for compiled in index.values())
+        # Forget windows, breach state and cooldowns of rules that were deleted or disabled
+        rule_ids = {rule.id for compiled in index.values() for rule in compiled}
+        for state in (self._windows, self._active, self._last_fired):
+            for key in [key for key in state if key[0] not in rule_ids]:
+                del state[key]
+
+    async def load_rules(self) -> None:
+        async with AsyncSessionLocal() as db:
+            self.set_rules((await db.scalars(select(AlertRule))).all())
+
+    def evaluate(self, readings: Sequence[PollutionReadingIn]) -> int:
+        """
+        Check readings against the matching rules and queue any alerts. Returns the number fired.
+        """
+        if not self._index:
+            return 0
+        fired = 0
+        now = datetime.now()
+        for reading in readings:
+            reading_date = reading.date or now
+            for metric in ALERT_METRICS:
+                rules = self._index.get((metric, reading.sensor_id), []) + self._index.get((metric, None), [])
+                if not rules:
+                    continue
+                value = getattr(reading, metric)
+                for rule in rules:
+                    self._stats["evaluated"] += 1
+                    if self._check(rule, reading.sensor_id, value, reading_date):
+                        fired += 1
+        return fired
+
+    def _check(self, rule: CompiledRule, sensor_id: int, value: float, reading_date: datetime) -> bool:
+        key = (rule.id, sensor_id)
+        observed = value
+        if rule.kind == "rate_of_change":
+            window = self._windows.get(key)
+            if window is None:
+                window = self._windows[key] = deque()
+            # Late readings can't be placed in the window; ignore them for rate rules
+            if window and reading_date < window[-1][0]:
+                return False
+            window.append((reading_date, value))
+            while window[0][0] < reading_date - rule.window:
+                window.popleft()
+            observed = value - window[0][1]
+
+        if not rule.breached(observed):
+            self._active[key] = False
+            return False
+        if self._active.get(key):
+            # Still in the same breach: already alerted
+            return False
+        self._active[key] = True
+
+        last_fired = self._last_fired.get(key)
+        if last_fired is not None and reading_date - last_fired < rule.cooldown:
+            self._stats["suppressed"] += 1
+            return False
+        self._last_fired[key] = reading_date
+
+        direction = "above" if rule.above else "below"
+        what = "change" if rule.kind == "rate_of_change" else "value"
+        self._pending.append({
+            "rule_id": rule.id,
+            "sensor_id": sensor_id,
+            "metric": rule.metric,
+            "value": observed,
+            "threshold": rule.threshold,
+            "reading_date": reading_date,
+            "message": f"{rule.name}: {rule.metric} {what} {observed:g} {direction} {rule.threshold:g} (sensor {sensor_id})",
+        })
+        self._stats["fired"] += 1
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "pending": len(self._pending)}
+
+    async def flush(self) -> int:
+        """
+        Write the queued alerts, batch_size per INSERT. Returns alerts written.
+        Alerts of deleted rules are dropped; when a batch fails, it and the rest are requeued.
+        """
+        alerts, self._pending = self._pending, []
+        written = 0
+        for start in range(0, len(alerts), self.batch_size):
+            batch = alerts[start:start + self.batch_size]
+            try:
+                async with AsyncSessionLocal() as db:
+                    inserted = len((await db.execute(_insert_alerts_query(batch))).all())
+                    await db.commit()
+            except (IntegrityError, DataError) as e:
+                # Retrying can't succeed; the remaining batches are still written
+                self._stats["dropped"] += len(batch)
+                logger.error("Dropped %d alerts rejected by the database: %s", len(batch), e)
+                continue
+            except Exception as e:
+                self._stats["failed"] += len(batch)
+                logger.warning("Failed to write %d alerts, requeued: %s", len(batch), e)
+                self._requeue(alerts[start:])
+                break
+            self._stats["written"] += inserted
+            self._stats["dropped"] += len(batch) - inserted
+            written += inserted
+        return written
+
+    def _requeue(self, alerts: List[Dict]) -> None:
+        pending = alerts + self._pending
+        overflow = len(pending) - self.max_pending
+        if overflow > 0:
+            # Alerts fired while the write was failing: keep the newest max_pending
+            self._stats["dropped"] += overflow
+            logger.error("Alert queue full after failed writes, dropped %d alerts", overflow)
+            pending = pending[overflow:]
+        self._pending = pending
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_reload = loop.time() + self.reload_interval
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+            if loop.time() >= next_reload:
+                next_reload = loop.time() + self.reload_interval
+                try:
+                    await self.load_rules()
+                except Exception as e:
+                    logger.warning("Failed to reload alert rules: %s", e)
+
+    async def start(self) -> None:
+        if self._task is None:
+            try:
+                await self.load_rules()
+            except Exception as e:
+                logger.warning("Failed to load alert rules: %s", e)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+alert_engine = AlertEngine(
+    flush_interval=CORE_SETTINGS.ALERT_FLUSH_INTERVAL_SECONDS,
+    reload_interval=CORE_SETTINGS.ALERT_RULES_RELOAD_SECONDS,
+    max_pending=CORE_SETTINGS.ALERT_MAX_PENDING,
+)
+
+REGISTRY.gauge_callback(
+    "alert_engine",
+    "Alert engine counters, pending alerts and active rule count.",
+    ("stat",),
+    lambda: {(key,): value for key, value in alert_engine.stats().items()},
+)
+
+async def fetch_alerts(
+    db: AsyncSession,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    sensor_ids: Optional[Sequence[int]] = None,
+    rule_id: Optional[int] = None,
+    limit: int = 50,
+    offset: int = 0
+) -> List[Alert]:
+    """
+    Most recent alerts first, optionally filtered by time range, sensors and rule.
+    """
+    query = select(Alert).order_by(Alert.fired_at.desc(), Alert.id.desc())
+    if start_date:
+        query = query.where(Alert.fired_at >= start_date)
+    if end_date:
+        query = query.where(Alert.fired_at < end_date)
+    if sensor_ids:
+        query = query.where(Alert.sensor_id.in_(sensor_ids))
+    if rule_id is not None:
+        query = query.where(Alert.rule_id == rule_id)
+    return (await db.scalars(query.offset(offset).limit(limit))).all()
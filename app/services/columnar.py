@@ -0,0 +1,49 @@
+from typing import Dict, Optional
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+COLUMNAR_MEDIA_TYPES = {
+    "arrow": ARROW_STREAM_MEDIA_TYPE,
+    "parquet": PARQUET_MEDIA_TYPE,
+}
+
+def negotiate_columnar_format(requested_format: Optional[str], accept: Optional[str]) -> Optional[str]:
+    """
+    Pick "arrow" or "parquet" from the `format` query parameter or the Accept header.
+    Returns None when the client wants the default JSON response.
+    """
+    if requested_format:
+        return requested_format if requested_format in COLUMNAR_MEDIA_TYPES else None
+    if accept:
+        for name, media_type in COLUMNAR_MEDIA_TYPES.items():
+            if media_type in accept:
+                return name
+    return None
+
+def columnar_response(columns: Dict[str, list], columnar_format: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Serialize {column: values} as an Arrow IPC stream or a Parquet file.
+    """
+    # pyarrow is an optional dependency (the "analytics" extra), only needed for these formats
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise HTTPException(status_code=406, detail="Arrow/Parquet responses require the pyarrow package")
+
+    table = pa.Table.from_pydict(columns)
+    sink = pa.BufferOutputStream()
+    if columnar_format == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, sink)
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    return Response(
+        content=sink.getvalue().to_pybytes(),
+        media_type=COLUMNAR_MEDIA_TYPES[columnar_format],
+        headers=headers,
+    )
@@ -0,0 +1,132 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import CORE_SETTINGS
+from app.services.pollution import CORRELATION_PAIRS, _raw_daily_means
+from app.services.rollups import fetch_dirty_days, rollup_daily_means
+
+DAILY_SERIES_METRICS = ("air_quality_index", "water_quality_index", "temperature", "humidity", "rain_mm")
+
+async def fetch_daily_series(db: AsyncSession, start_date: date, end_date: date) -> Dict[str, np.ndarray]:
+    """
+    Dense per-day means from start_date to end_date (inclusive), one float array per metric.
+    Days without readings are NaN so lags line up with calendar days.
+    """
+    if CORE_SETTINGS.ROLLUPS_ENABLED:
+        dirty = await fetch_dirty_days(db, start_date, end_date, ["pollution", "weather"])
+        pollution_daily, weather_daily = rollup_daily_means(start_date, end_date, dirty)
+    else:
+        pollution_daily, weather_daily = _raw_daily_means(start_date, end_date)
+
+    query = select(
+        func.coalesce(pollution_daily.c.day, weather_daily.c.day).label("day"),
+        pollution_daily.c.air_quality_index,
+        pollution_daily.c.water_quality_index,
+        pollution_daily.c.temperature,
+        weather_daily.c.humidity,
+        weather_daily.c.rain_mm,
+    ).select_from(
+        pollution_daily.join(weather_daily, pollution_daily.c.day == weather_daily.c.day, full=True)
+    )
+    rows = (await db.execute(query)).all()
+
+    days = (end_date - start_date).days + 1
+    series = {metric: np.full(days, np.nan) for metric in DAILY_SERIES_METRICS}
+    for row in rows:
+        day = row.day.date() if isinstance(row.day, datetime) else row.day
+        index = (day - start_date).days
+        if 0 <= index < days:
+            for metric in DAILY_SERIES_METRICS:
+                value = getattr(row, metric)
+                if value is not None:
+                    series[metric][index] = float(value)
+    return series
+
+def _windowed_sums(values: np.ndarray, window: int) -> np.ndarray:
+    # Sum of every length-`window` slice from one cumulative sum: O(n) regardless of the window
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    return cumulative[window:] - cumulative[:-window]
+
+def rolling_correlation(x: np.ndarray, y: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """
+    Pearson correlation of x and y over every trailing window, ignoring NaN pairs.
+    Element i covers x[i:i + window]. Windows with fewer than `min_periods` pairs or zero variance are NaN.
+    """
+    if len(x) < window:
+        return np.array([])
+    valid = ~(np.isnan(x) | np.isnan(y))
+    # Centre first so the sum-of-squares differences don't lose precision
+    x = np.where(valid, x - np.nanmean(x), 0.0) if valid.any() else np.zeros_like(x)
+    y = np.where(valid, y - np.nanmean(y), 0.0) if valid.any() else np.zeros_like(y)
+
+    n = _windowed_sums(valid.astype(float), window)
+    sx, sy = _windowed_sums(x, window), _windowed_sums(y, window)
+    sxx, syy, sxy = _windowed_sums(x * x, window), _windowed_sums(y * y, window), _windowed_sums(x * y, window)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sy / n
+        var_x = sxx - sx * sx / n
+        var_y = syy - sy * sy / n
+        r = cov / np.sqrt(var_x * var_y)
+    r[(n < min_periods) | (var_x <= 1e-12) | (var_y <= 1e-12)] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+def _correlation(x: np.ndarray, y: np.ndarray, min_periods: int) -> float:
+    valid = ~(np.isnan(x) | np.isnan(y))
+    if valid.sum() < min_periods:
+        return np.nan
+    x, y = x[valid] - x[valid].mean(), y[valid] - y[valid].mean()
+    denominator = np.sqrt((x * x).sum() * (y * y).sum())
+    return float((x * y).sum() / denominator) if denominator > 0 else np.nan
+
+def lag_correlation(x: np.ndarray, y: np.ndarray, max_lag: int, min_periods: int) -> Tuple[List[int], np.ndarray]:
+    """
+    Correlation of x[t] with y[t - lag] for lag in -max_lag..max_lag.
+    A positive lag means y leads x by `lag` days (e.g. rainfall today vs AQI in `lag` days).
+    """
+    lags = list(range(-max_lag, max_lag + 1))
+    values = np.empty(len(lags))
+    for i, lag in enumerate(lags):
+        if abs(lag) >= len(x):
+            # No overlapping days at this lag (range shorter than max_lag)
+            values[i] = np.nan
+        elif lag >= 0:
+            values[i] = _correlation(x[lag:], y[:len(y) - lag], min_periods)
+        else:
+            values[i] = _correlation(x[:lag], y[-lag:], min_periods)
+    return lags, values
+
+def _to_list(values: np.ndarray) -> List[Optional[float]]:
+    return [None if np.isnan(value) else float(value) for value in values]
+
+def analyze_correlations(
+    series: Dict[str, np.ndarray],
+    start_date: date,
+    window: int,
+    max_lag: int,
+    min_periods: int
+) -> dict:
+    """
+    Rolling and lagged correlations for every pair in CORRELATION_PAIRS (pollution metric, weather metric).
+    """
+    days = len(next(iter(series.values())))
+    rolling, lagged, best_lag = {}, {}, {}
+    lags: List[int] = []
+    for name, (pollution_metric, weather_metric) in CORRELATION_PAIRS.items():
+        x, y = series[pollution_metric], series[weather_metric]
+        rolling[name] = _to_list(rolling_correlation(x, y, window, min_periods))
+        lags, values = lag_correlation(x, y, max_lag, min_periods)
+        lagged[name] = _to_list(values)
+        best_lag[name] = None if np.isnan(values).all() else lags[int(np.nanargmax(np.abs(values)))]
+
+    # Each rolling value is labelled with the last day of its window
+    window_end_days = [start_date + timedelta(days=i + window - 1) for i in range(max(days - window + 1, 0))]
+    return {
+        "days": window_end_days,
+        "rolling_correlation": rolling,
+        "lags": lags,
+        "lag_correlation": lagged,
+        "best_lag": best_lag,
+    }
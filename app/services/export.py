@@ -0,0 +1,59 @@
+import csv
+import io
+from datetime import date, timedelta
+from typing import AsyncIterator, Optional, Union
+import orjson
+from sqlalchemy import select
+from app.core.config import CORE_SETTINGS
+from app.db.sessions import read_session
+from app.services.pollution import default_date_range
+
+# Supported export formats and their media types
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def _export_query(model, start_date: date, end_date: date):
+    columns = list(model.__table__.columns)
+    return (
+        select(*columns)
+        # date is a timestamp: readings during end_date itself are included
+        .where(model.date >= start_date, model.date < end_date + timedelta(days=1))
+        .order_by(model.date, model.id)
+        # Server-side cursor: rows arrive in fixed-size batches instead of being buffered in full
+        .execution_options(yield_per=CORE_SETTINGS.EXPORT_BATCH_SIZE)
+    )
+
+async def stream_export(
+    model,
+    export_format: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> AsyncIterator[Union[str, bytes]]:
+    """
+    Yield the rows of `model` in the date range as NDJSON or CSV, one chunk per fetched batch.
+    Opens its own session because the response body is produced after the request's dependencies exit.
+    """
+    start_date, end_date = default_date_range(start_date, end_date)
+    query = _export_query(model, start_date, end_date)
+    names = [column.name for column in query.selected_columns]
+
+    async with read_session() as db:
+        result = await db.stream(query)
+
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(names)
+            yield buffer.getvalue()
+
+        async for rows in result.partitions():
+            if export_format == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows(rows)
+                yield buffer.getvalue()
+            else:
+                # orjson encodes dates/datetimes natively and returns bytes, no str round trip
+                yield b"".join(orjson.dumps(dict(zip(names, row))) + b"\n" for row in rows)
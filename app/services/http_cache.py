@@ -0,0 +1,67 @@
+import hashlib
+from datetime import date
+from typing import Dict, Optional, Sequence
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import CORE_SETTINGS
+from app.models.data_version import DataVersion
+
+async def fetch_data_versions(db: AsyncSession, tables: Sequence[str]) -> Dict[str, int]:
+    """
+    Current write version of each table (a primary-key lookup, no row data is read).
+    """
+    rows = await db.execute(select(DataVersion.table_name, DataVersion.version).where(DataVersion.table_name.in_(tables)))
+    return dict(rows.all())
+
+class ConditionalCache:
+    """
+    ETag and Cache-Control for one response.
+
+    The strong ETag hashes the path, the query string, the Accept header, the resolved date
+    range and the write version of every table the response reads, so it changes exactly
+    when the underlying data (or the representation) can.
+    """
+
+    def __init__(self, request: Request, versions: Dict[str, int], start_date: date, end_date: date):
+        # Kept for the result cache, which tags entries with the same versions
+        self.versions = versions
+        key = "|".join([
+            request.url.path,
+            "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items())),
+            request.headers.get("accept", ""),
+            f"{start_date}:{end_date}",
+            ",".join(f"{table}={version}" for table, version in sorted(versions.items())),
+        ])
+        self.etag = '"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+        # Ranges that ended before today cannot gain rows from live sensors: let caches keep them
+        if end_date < date.today():
+            self.cache_control = f"public, max-age={CORE_SETTINGS.HTTP_CACHE_CLOSED_RANGE_MAX_AGE_SECONDS}"
+        else:
+            self.cache_control = "no-cache"
+        self._if_none_match = request.headers.get("if-none-match")
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"ETag": self.etag, "Cache-Control": self.cache_control, "Vary": "Accept"}
+
+    @property
+    def not_modified(self) -> bool:
+        if not self._if_none_match:
+            return False
+        candidates = [tag.strip() for tag in self._if_none_match.split(",")]
+        return "*" in candidates or self.etag in candidates
+
+    def not_modified_response(self) -> Response:
+        return Response(status_code=304, headers=self.headers)
+
+async def conditional_cache(
+    request: Request,
+    db: AsyncSession,
+    tables: Sequence[str],
+    start_date: date,
+    end_date: date
+) -> ConditionalCache:
+    versions = await fetch_data_versions(db, tables)
+    return ConditionalCache(request, versions, start_date, end_date)
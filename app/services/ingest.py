@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, Sequence
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from app.core.config import CORE_SETTINGS
+from app.core.metrics import REGISTRY
+from app.db.sessions import AsyncSessionLocal
+from app.models.pollution_data import PollutionData
+from app.schemas.ingest import PollutionReadingIn
+
+logger = logging.getLogger(__name__)
+
+class PollutionIngestBuffer:
+    """
+    In-process write buffer for sensor readings.
+
+    Readings are appended to a list and written by a single flusher task in large
+    batched INSERTs, whenever `batch_size` readings are waiting or `flush_interval`
+    seconds have passed. When `max_size` readings are already waiting, offer() refuses
+    the batch so the API can push back on the client instead of growing without bound.
+    Batches that fail to write (database unavailable) go back to the front of the buffer
+    and are retried on the next flush. Readings are only dropped, and counted as `dropped`,
+    when a batch is rejected by a constraint or the requeued backlog exceeds `max_size`.
+    All methods run on the event loop, so the list needs no lock.
+    """
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: List[Dict] = []
+        self._ready = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._task = None
+        self._stats = {"accepted": 0, "rejected": 0, "flushed": 0, "failed": 0, "dropped": 0, "batches": 0}
+
+    def offer(self, readings: Sequence[PollutionReadingIn]) -> bool:
+        """
+        Queue readings for the next flush. Returns False (and queues nothing) if the buffer is full.
+        """
+        if len(self._pending) + len(readings) > self.max_size:
+            self._stats["rejected"] += len(readings)
+            return False
+
+        now = datetime.now()
+        for reading in readings:
+            row = reading.model_dump()
+            if row["date"] is None:
+                row["date"] = now
+            self._pending.append(row)
+
+        self._stats["accepted"] += len(readings)
+        if len(self._pending) >= self.batch_size:
+            self._ready.set()
+        return True
+
+    @property
+    def buffered(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "buffered": len(self._pending)}
+
+    async def flush(self) -> int:
+        """
+        Write everything currently buffered, batch_size rows per INSERT. Returns rows written.
+        When a batch fails, it and the rest are requeued ahead of newer readings.
+        """
+        rows, self._pending = self._pending, []
+        self._ready.clear()
+        written = 0
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            try:
+                async with AsyncSessionLocal() as db:
+                    # One executemany: asyncpg pipelines the prepared INSERT for every row
+                    await db.execute(insert(PollutionData), batch)
+                    await db.commit()
+            except asyncio.CancelledError:
+                # The batch may or may not have committed; keeping it is safer than losing accepted readings
+                self._requeue(rows[start:])
+                raise
+            except (IntegrityError, DataError) as e:
+                # Retrying can't succeed; the rest of the buffer is still written
+                self._stats["dropped"] += len(batch)
+                logger.error("Dropped %d pollution readings rejected by the database: %s", len(batch), e)
+                continue
+            except Exception as e:
+                self._stats["failed"] += len(batch)
+                logger.warning("Failed to flush %d pollution readings, requeued: %s", len(batch), e)
+                self._requeue(rows[start:])
+                break
+            self._stats["flushed"] += len(batch)
+            self._stats["batches"] += 1
+            written += len(batch)
+        return written
+
+    def _requeue(self, rows: List[Dict]) -> None:
+        pending = rows + self._pending
+        overflow = len(pending) - self.max_size
+        if overflow > 0:
+            # Readings accepted while the write was failing: keep the newest max_size
+            self._stats["dropped"] += overflow
+            logger.error("Ingest buffer full after failed flushes, dropped %d pollution readings", overflow)
+            pending = pending[overflow:]
+        self._pending = pending
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._pending and not self._stopping.is_set():
+                failed = self._stats["failed"]
+                await self.flush()
+                if self._stats["failed"] > failed:
+                    # Don't retry on every new offer while the database is down
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+                    except asyncio.TimeoutError:
+                        pass
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Let the flusher finish its current write, then write whatever is still buffered.
+        The task is not cancelled, so a write in progress is never abandoned.
+        """
+        if self._task is not None:
+            self._stopping.set()
+            self._ready.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._pending:
+            await self.flush()
+        if self._pending:
+            logger.error("Shutting down with %d pollution readings not written", len(self._pending))
+
+pollution_ingest_buffer = PollutionIngestBuffer(
+    max_size=CORE_SETTINGS.INGEST_MAX_BUFFERED_READINGS,
+    batch_size=CORE_SETTINGS.INGEST_BATCH_SIZE,
+    flush_interval=CORE_SETTINGS.INGEST_FLUSH_INTERVAL_SECONDS,
+)
+
+REGISTRY.gauge_callback(
+    "ingest_buffer",
+    "Pollution ingest buffer counters and current depth.",
+    ("stat",),
+    lambda: {(key,): value for key, value in pollution_ingest_buffer.stats().items()},
+)
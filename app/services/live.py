@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Set
+from starlette.concurrency import run_in_threadpool
+from app.core.config import CORE_SETTINGS
+from app.core.metrics import REGISTRY
+from app.schemas.pollution_overview import LivePollutionData
+from app.services.pollution import read_live_pollution_data
+
+logger = logging.getLogger(__name__)
+
+class LiveBroadcaster:
+    """
+    Reads the live sensor once per interval and fans each reading out to every subscriber.
+
+    Each subscriber owns a bounded queue. When a slow client lets its queue fill up the
+    oldest reading is dropped, so one slow consumer never blocks the others or grows memory.
+    Readings are JSON-encoded once per publish, not once per subscriber.
+    """
+
+    def __init__(self, interval: float, queue_size: int):
+        self.interval = interval
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._latest: Optional[LivePollutionData] = None
+        self._latest_json: Optional[str] = None
+        self._published_at = 0.0
+        self._task = None
+        self._stats = {"published": 0, "dropped": 0}
+
+    @property
+    def latest(self) -> Optional[LivePollutionData]:
+        """
+        Most recent reading, or None once it is older than two intervals (nobody is streaming).
+        """
+        if time.monotonic() - self._published_at > 2 * self.interval:
+            return None
+        return self._latest
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        # New subscribers see the current reading immediately instead of waiting a full interval
+        if self._latest_json is not None:
+            queue.put_nowait(self._latest_json)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def publish(self, reading: LivePollutionData) -> None:
+        message = reading.model_dump_json()
+        self._latest, self._latest_json = reading, message
+        self._published_at = time.monotonic()
+        self._stats["published"] += 1
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()  # drop-oldest
+                self._stats["dropped"] += 1
+            queue.put_nowait(message)
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "subscribers": len(self._subscribers)}
+
+    async def _run(self) -> None:
+        while True:
+            # Only touch the sensor while someone is listening
+            if self._subscribers:
+                try:
+                    self.publish(LivePollutionData(**await run_in_threadpool(read_live_pollution_data)))
+                except Exception as e:
+                    logger.warning("Live sensor read failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+live_broadcaster = LiveBroadcaster(
+    interval=CORE_SETTINGS.LIVE_STREAM_INTERVAL_SECONDS,
+    queue_size=CORE_SETTINGS.LIVE_STREAM_QUEUE_SIZE,
+)
+
+REGISTRY.gauge_callback(
+    "live_broadcaster",
+    "Live broadcaster counters and subscriber count.",
+    ("stat",),
+    lambda: {(key,): value for key, value in live_broadcaster.stats().items()},
+)
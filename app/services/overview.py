@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from app.core.config import CORE_SETTINGS
+from app.db.sessions import read_session
+from app.schemas.pollution_overview import HistoricalPollutionResponse, HistoricalWeatherResponse, PollutionOverviewResponse
+from app.schemas.weather import WeatherResponse
+from app.models.pollution_data import PollutionData
+from app.models.weather_data import WeatherData
+from app.services.pollution import (
+    HISTORICAL_POLLUTION_COLUMNS,
+    HISTORICAL_WEATHER_COLUMNS,
+    fetch_historical_rows_async,
+    read_live_pollution_data,
+)
+from app.services.weather import get_latest_weather_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Status reported per overview section
+SECTION_OK = "ok"
+SECTION_TIMEOUT = "timeout"
+SECTION_ERROR = "error"
+
+async def _run_section(name: str, make_coro: Callable[[], Awaitable[Any]], timeout: float) -> Tuple[str, Any, str]:
+    """
+    Run one overview source under its own timeout. Failures are reported, never raised,
+    so one slow or broken source cannot take the whole overview down.
+    """
+    try:
+        return name, await asyncio.wait_for(make_coro(), timeout=timeout), SECTION_OK
+    except asyncio.TimeoutError:
+        logger.warning("Overview section %r timed out after %ss", name, timeout)
+        return name, None, SECTION_TIMEOUT
+    except Exception as e:
+        logger.warning("Overview section %r failed: %s", name, e)
+        return name, None, SECTION_ERROR
+
+async def _live_pollution():
+    return await run_in_threadpool(read_live_pollution_data)
+
+async def _historical_pollution(start_date, end_date, limit, offset) -> HistoricalPollutionResponse:
+    # Each concurrent query needs its own session: an AsyncSession is not safe to share between tasks
+    async with read_session() as db:
+        rows, total_count, next_cursor = await fetch_historical_rows_async(
+            db, PollutionData, HISTORICAL_POLLUTION_COLUMNS, start_date=start_date, end_date=end_date, limit=limit, offset=offset
+        )
+    return HistoricalPollutionResponse(
+        historical_data=[dict(zip(HISTORICAL_POLLUTION_COLUMNS, row)) for row in rows],
+        total_count=total_count,
+        total_count_is_estimate=True,
+        next_cursor=next_cursor
+    )
+
+async def _historical_weather(start_date, end_date, limit, offset) -> HistoricalWeatherResponse:
+    async with read_session() as db:
+        rows, total_count, next_cursor = await fetch_historical_rows_async(
+            db, WeatherData, HISTORICAL_WEATHER_COLUMNS, start_date=start_date, end_date=end_date, limit=limit, offset=offset
+        )
+    return HistoricalWeatherResponse(
+        historical_data=[dict(zip(HISTORICAL_WEATHER_COLUMNS, row)) for row in rows],
+        total_count=total_count,
+        total_count_is_estimate=True,
+        next_cursor=next_cursor
+    )
+
+async def _weather() -> WeatherResponse:
+    async with read_session() as db:
+        return await get_latest_weather_snapshot(db)
+
+async def build_pollution_overview(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 10,
+    offset: int = 0
+) -> PollutionOverviewResponse:
+    """
+    Fetch all overview sections concurrently so latency tracks the slowest source rather than the sum.
+    Sections that time out or fail are returned as null with their status in `section_status`.
+    """
+    db_timeout = CORE_SETTINGS.OVERVIEW_DB_TIMEOUT_SECONDS
+    sections = await asyncio.gather(
+        _run_section("live_pollution_data", _live_pollution, CORE_SETTINGS.OVERVIEW_LIVE_TIMEOUT_SECONDS),
+        _run_section(
+            "historical_pollution_data",
+            lambda: _historical_pollution(start_date, end_date, limit, offset),
+            db_timeout
+        ),
+        _run_section(
+            "historical_weather_data",
+            lambda: _historical_weather(start_date, end_date, limit, offset),
+            db_timeout
+        ),
+        # Collected snapshot; only calls OpenWeather (behind the weather cache) when none is recent
+        _run_section("weather", _weather, CORE_SETTINGS.OVERVIEW_WEATHER_TIMEOUT_SECONDS),
+    )
+
+    results: Dict[str, Any] = {name: result for name, result, _ in sections}
+    section_status = {name: status for name, _, status in sections}
+    return PollutionOverviewResponse(**results, section_status=section_status)
@@ -1,18 +1,23 @@
-import pandas as pd
+import base64
+import json
 import random
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import date, timedelta
+from sqlalchemy import Date, DateTime, Integer, Row, cast, column, func, select, text, true, tuple_, values
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional, Sequence, Tuple
+from datetime import date, datetime, timedelta
+from app.core.config import CORE_SETTINGS
 from app.models.pollution_data import PollutionData
+from app.models.sensor import Sensor
 from app.schemas.pollution import PollutionDataResponse
-from app.schemas.pollution_overview import CorrelationSummaryResponse, HistoricalWeatherResponse
+from app.schemas.pollution_overview import CorrelationSummaryResponse
 from app.models.weather_data import WeatherData
-from app.schemas.weather import WeatherHistoricalDataResponse, WeatherResponse
+from app.services.rollups import fetch_dirty_days, rollup_daily_means
+from app.services.sensors import sensor_registry
 
 # Simulated live data fetch (this will simulate the data you receive from the sensor)
 def get_live_sensor_data():
     # Simulate fetching live data from an API or mock source
-    print(f"Fetching live sensor data")
     return {
         "sensor_id": "phewa-001",
         "timestamp": "2024-10-28T12:00:00Z",
@@ -24,9 +29,11 @@ def get_live_sensor_data():
 
 # Mapping the live data to the PollutionDataResponse
 def map_live_sensor_data_to_pollution_data(live_data):
-    # Here, we are assuming the 'sensor_id' can be mapped to 'id', and 'temperature' is default
+    # The device reports its code (e.g. "phewa-001"); the sensor registry maps it to sensors.id,
+    # None when the sensor isn't registered (sensor_code still identifies the device)
     return {
-        "sensor_id": int(live_data["sensor_id"].split("-")[-1]),  # Extract an ID based on sensor_id
+        "sensor_id": sensor_registry.lookup(live_data["sensor_id"]),
+        "sensor_code": live_data["sensor_id"],
         "air_quality_index": live_data["air_quality_index"],
         "water_quality_index": live_data["water_quality_index"],
         "temperature": 22.0,  # Assuming a default temperature or fetching it from somewhere
@@ -34,90 +41,350 @@ def map_live_sensor_data_to_pollution_data(live_data):
         "date": live_data["date"]
     }
 
-def fetch_historical_pollution_data(
-    db: Session,
-    start_date: Optional[date] = None,
-    end_date: Optional[date] = None,
-    limit: int = 10,
-    offset: int = 0
-) -> List[PollutionDataResponse]:
+def read_live_pollution_data():
+    """
+    Read the sensor and map the reading. Blocking (the registry may reload), so async callers use a threadpool.
+    """
+    return map_live_sensor_data_to_pollution_data(get_live_sensor_data())
+
+# Columns exposed by the historical response schemas, in response order
+HISTORICAL_POLLUTION_COLUMNS = ("sensor_id", "air_quality_index", "water_quality_index", "temperature", "ph_level", "date")
+HISTORICAL_WEATHER_COLUMNS = ("date", "temperature", "humidity", "wind_speed", "rain_mm", "weather_description")
+
+def resolve_fields(model, fields: Optional[str], default_columns: Sequence[str]) -> Tuple[str, ...]:
+    """
+    Parse a comma-separated `fields` projection into column names of `model`, in the requested order.
+    Returns default_columns when fields is empty. Raises ValueError naming any unknown field.
+    """
+    if not fields:
+        return tuple(default_columns)
+    requested = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    if not requested:
+        return tuple(default_columns)
+    allowed = set(model.__table__.columns.keys())
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(model.__table__.columns.keys())}")
+    return tuple(requested)
+
+def encode_cursor(record) -> str:
+    """
+    Encode the (date, id) position of a record as an opaque pagination cursor.
+    """
+    raw = f"{record.date.isoformat()}|{record.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor. Raises ValueError if it is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_date, raw_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(raw_date), int(raw_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def encode_sensor_cursor(positions: Dict[int, Row]) -> Optional[str]:
+    """
+    Encode the last (date, id) of each sensor that has more rows as one opaque cursor.
+    Sensors left out are exhausted and are skipped by the next page.
     """
-    Fetch historical pollution data with pagination and optional default date range.
+    if not positions:
+        return None
+    raw = json.dumps({str(sensor_id): [row.date.isoformat(), row.id] for sensor_id, row in positions.items()})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_sensor_cursor(cursor: str) -> Dict[int, Tuple[datetime, int]]:
+    """
+    Decode a cursor produced by encode_sensor_cursor. Raises ValueError if it is malformed.
     """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return {int(sensor_id): (datetime.fromisoformat(raw_date), int(raw_id)) for sensor_id, (raw_date, raw_id) in raw.items()}
+    except (ValueError, TypeError, AttributeError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def default_date_range(start_date: Optional[date], end_date: Optional[date]) -> Tuple[date, date]:
     # Default date range: last 30 days
     if not start_date:
         start_date = date.today() - timedelta(days=30)
     if not end_date:
         end_date = date.today()
+    return start_date, end_date
 
-    query = db.query(PollutionData).filter(
-        PollutionData.date >= start_date,
-        PollutionData.date <= end_date
+def _historical_query(model, start_date: Optional[date], end_date: Optional[date]):
+    """
+    Build the date-filtered select shared by the historical fetch functions.
+    """
+    start_date, end_date = default_date_range(start_date, end_date)
+
+    # date is a timestamp: readings during end_date itself are included
+    return select(model).where(
+        model.date >= start_date,
+        model.date < end_date + timedelta(days=1)
     )
 
-    # Fetch total count for pagination metadata
-    total_count = query.count()
+def _page_query(model, query, limit: int, offset: int, cursor: Optional[str]):
+    """
+    Order by (date, id) and apply either keyset (cursor) or offset pagination.
+    """
+    query = query.order_by(model.date, model.id)
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        # Row-value comparison lets Postgres seek straight to the position via the (date, id) index
+        query = query.where(tuple_(model.date, model.id) > tuple_(cursor_date, cursor_id))
+    else:
+        query = query.offset(offset)
+    return query.limit(limit)
 
-    # Apply limit and offset for pagination
-    historical_data = query.offset(offset).limit(limit).all()
+def _next_cursor(historical_data, limit: int) -> Optional[str]:
+    # A short page means there is nothing left to fetch
+    if len(historical_data) < limit:
+        return None
+    return encode_cursor(historical_data[-1])
 
-    return historical_data, total_count
+def _count_query(query):
+    return select(func.count()).select_from(query.subquery())
 
-def fetch_historical_weather_data(
-    db: Session,
+def _estimate_count_query(query):
+    """
+    EXPLAIN the range query so the planner's row estimate can stand in for COUNT(*).
+    The query keeps its bound parameters: it is compiled with named placeholders (IN lists
+    expanded) and the values are bound again on the text() statement.
+    """
+    compiled = query.compile(dialect=postgresql.dialect(paramstyle="named"), compile_kwargs={"render_postcompile": True})
+    return text("EXPLAIN (FORMAT JSON) " + str(compiled)).bindparams(**compiled.params)
+
+def _plan_rows(plan) -> int:
+    # psycopg2 decodes the json column, asyncpg hands back the raw string
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+async def fetch_historical_rows_async(
+    db: AsyncSession,
+    model,
+    column_names: Sequence[str],
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     limit: int = 10,
-    offset: int = 0
-) -> List[WeatherHistoricalDataResponse]:
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    exact_count: bool = False
+) -> Tuple[List[tuple], int, Optional[str]]:
     """
-    Fetch historical pollution data with pagination and optional default date range.
+    Fast path of the historical fetches: selects only `column_names` and returns the page as
+    plain tuples in that order, skipping ORM entities and per-row schema models.
     """
-    # Default date range: last 30 days
-    if not start_date:
-        start_date = date.today() - timedelta(days=30)
-    if not end_date:
-        end_date = date.today()
+    query = _historical_query(model, start_date, end_date)
+
+    # Fetch total count for pagination metadata
+    if exact_count:
+        total_count = await db.scalar(_count_query(query))
+    else:
+        total_count = _plan_rows(await db.scalar(_estimate_count_query(query)))
 
-    query = db.query(WeatherData).filter(
-        WeatherData.date >= start_date,
-        WeatherData.date <= end_date
+    # id and date are selected too (after the requested columns, unless requested) so the next cursor can be derived from the last row
+    cursor_columns = [getattr(model, name) for name in ("id", "date") if name not in column_names]
+    page_query = _page_query(model, query, limit, offset, cursor).with_only_columns(
+        *[getattr(model, name) for name in column_names], *cursor_columns
     )
+    rows = (await db.execute(page_query)).all()
 
-    # Fetch total count for pagination metadata
-    total_count = query.count()
+    width = len(column_names)
+    return [tuple(row[:width]) for row in rows], total_count, _next_cursor(rows, limit)
 
-    # Apply limit and offset for pagination
-    historical_data = query.offset(offset).limit(limit).all()
+async def fetch_historical_columns_async(
+    db: AsyncSession,
+    model,
+    column_names: Sequence[str],
+    **kwargs
+) -> Tuple[Dict[str, list], int, Optional[str]]:
+    """
+    Columnar variant of fetch_historical_rows_async: the page as {column: values}.
+    """
+    rows, total_count, next_cursor = await fetch_historical_rows_async(db, model, column_names, **kwargs)
+    values = list(zip(*rows)) if rows else [() for _ in column_names]
+    columns = {name: list(column) for name, column in zip(column_names, values)}
+    return columns, total_count, next_cursor
 
-    return historical_data, total_count
+async def fetch_historical_pollution_by_sensor_async(
+    db: AsyncSession,
+    sensor_ids: Sequence[int],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 10,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    exact_count: bool = False,
+    column_names: Sequence[str] = HISTORICAL_POLLUTION_COLUMNS
+) -> Tuple[Dict[int, List[Row]], Optional[str], int, Optional[Dict[int, int]]]:
+    """
+    One page per sensor for many sensors in a single statement: each requested sensor drives a
+    LATERAL subquery that walks the (sensor_id, date) index for its own `limit` rows.
+    `cursor` is the combined cursor of a previous page (see encode_sensor_cursor): each sensor
+    resumes from its own position and exhausted sensors return no rows.
+    Rows hold `column_names` in that order (followed by the cursor columns), not ORM entities.
+    Returns ({sensor_id: rows}, next_cursor, total_count, {sensor_id: count} when exact_count else None).
+    """
+    query = _historical_query(PollutionData, start_date, end_date)
+    sensor_query = query.where(PollutionData.sensor_id.in_(sensor_ids))
 
-def fetch_correlation_summary(db: Session, start_date: Optional[date], end_date: Optional[date]):
-    historical_data, _ = fetch_historical_pollution_data(db, start_date, end_date, limit=100, offset=0)
+    per_sensor_counts = None
+    if exact_count:
+        counts = await db.execute(
+            sensor_query.with_only_columns(PollutionData.sensor_id, func.count()).group_by(PollutionData.sensor_id)
+        )
+        per_sensor_counts = {sensor_id: 0 for sensor_id in sensor_ids}
+        per_sensor_counts.update({sensor_id: count for sensor_id, count in counts})
+        total_count = sum(per_sensor_counts.values())
+    else:
+        total_count = _plan_rows(await db.scalar(_estimate_count_query(sensor_query)))
 
-    data = {
-        "temperature": [item.temperature for item in historical_data],
-        # "humidity": [item.humidity for item in historical_data],
-        # "rainfall": [item.rainfall for item in historical_data],
-        "aqi": [item.air_quality_index for item in historical_data],
-        # "pm2_5": [item.pm2_5 for item in historical_data],
-    }
+    grouped: Dict[int, List[Row]] = {sensor_id: [] for sensor_id in sensor_ids}
+    if cursor:
+        positions = {
+            sensor_id: position for sensor_id, position in decode_sensor_cursor(cursor).items() if sensor_id in grouped
+        }
+        if not positions:
+            return grouped, None, total_count, per_sensor_counts
+        # Each sensor's position travels with it into the LATERAL page
+        requested = values(
+            column("sensor_id", Integer), column("cursor_date", DateTime), column("cursor_id", Integer), name="requested"
+        ).data([(sensor_id, cursor_date, cursor_id) for sensor_id, (cursor_date, cursor_id) in positions.items()])
+        page_query = (
+            query.where(
+                PollutionData.sensor_id == requested.c.sensor_id,
+                tuple_(PollutionData.date, PollutionData.id) > tuple_(requested.c.cursor_date, requested.c.cursor_id),
+            )
+            .order_by(PollutionData.date, PollutionData.id)
+            .limit(limit)
+        )
+    else:
+        requested = select(Sensor.id.label("sensor_id")).where(Sensor.id.in_(sensor_ids)).subquery("requested")
+        page_query = _page_query(
+            PollutionData, query.where(PollutionData.sensor_id == requested.c.sensor_id), limit, offset, None
+        )
+    page = page_query.lateral("page")
+    cursor_columns = [page.c[name] for name in ("id", "date") if name not in column_names]
+    # sensor_id is taken from the driving table so rows can be grouped whatever columns are requested
+    rows = (await db.execute(
+        select(*[page.c[name] for name in column_names], *cursor_columns, requested.c.sensor_id.label("page_sensor_id"))
+        .select_from(requested.join(page, true()))
+        .order_by(requested.c.sensor_id, page.c.date, page.c.id)
+    )).all()
 
-    df = pd.DataFrame(data)
+    for row in rows:
+        grouped[row.page_sensor_id].append(row)
+    # A full page means the sensor may have more rows
+    next_cursor = encode_sensor_cursor({
+        sensor_id: sensor_rows[-1] for sensor_id, sensor_rows in grouped.items() if len(sensor_rows) == limit
+    })
+    return grouped, next_cursor, total_count, per_sensor_counts
 
-    correlation_summary = {
-        "rainfall_aqi": df["rainfall"].corr(df["aqi"]),
-        "temperature_aqi": df["temperature"].corr(df["aqi"]),
-        "humidity_pm2_5": df["humidity"].corr(df["pm2_5"]),
-    }
+# Correlation pairs reported by the correlation endpoint: name -> (pollution metric, weather metric)
+CORRELATION_PAIRS = {
+    "air_quality_index_temperature": ("air_quality_index", "temperature"),
+    "air_quality_index_humidity": ("air_quality_index", "humidity"),
+    "air_quality_index_rainfall": ("air_quality_index", "rain_mm"),
+    "water_quality_index_temperature": ("water_quality_index", "temperature"),
+    "water_quality_index_humidity": ("water_quality_index", "humidity"),
+    "water_quality_index_rainfall": ("water_quality_index", "rain_mm"),
+}
+
+def _raw_daily_means(start_date: date, end_date: date):
+    """
+    Per-day averages computed from the raw tables: (pollution_daily, weather_daily) subqueries keyed by `day`.
+    Temperature comes from the pollution sensor, humidity and rainfall from the weather table.
+    """
+    range_end = end_date + timedelta(days=1)
+
+    pollution_day = cast(PollutionData.date, Date)
+    pollution_daily = (
+        select(
+            pollution_day.label("day"),
+            func.avg(PollutionData.air_quality_index).label("air_quality_index"),
+            func.avg(PollutionData.water_quality_index).label("water_quality_index"),
+            func.avg(PollutionData.temperature).label("temperature"),
+        )
+        .where(PollutionData.date >= start_date, PollutionData.date < range_end)
+        .group_by(pollution_day)
+        .subquery("pollution_daily")
+    )
+
+    weather_day = cast(WeatherData.date, Date)
+    weather_daily = (
+        select(
+            weather_day.label("day"),
+            func.avg(WeatherData.humidity).label("humidity"),
+            func.avg(WeatherData.rain_mm).label("rain_mm"),
+        )
+        .where(WeatherData.date >= start_date, WeatherData.date < range_end)
+        .group_by(weather_day)
+        .subquery("weather_daily")
+    )
+    return pollution_daily, weather_daily
+
+def _correlation_query(pollution_daily, weather_daily):
+    """
+    Single statement that joins the per-day means and computes every corr() pair.
+    """
+    columns = {**pollution_daily.c, **{"humidity": weather_daily.c.humidity, "rain_mm": weather_daily.c.rain_mm}}
+    return select(
+        func.count().label("days"),
+        *[func.corr(columns[x], columns[y]).label(name) for name, (x, y) in CORRELATION_PAIRS.items()]
+    ).select_from(
+        pollution_daily.join(weather_daily, pollution_daily.c.day == weather_daily.c.day)
+    )
+
+def build_correlation_insights(correlation_summary: Dict[str, Optional[float]]) -> List[str]:
+    """
+    Turn correlation coefficients into human readable insights. Pairs without a coefficient are skipped.
+    """
+    def corr(name: str) -> float:
+        value = correlation_summary.get(name)
+        return 0.0 if value is None else value
 
     insights = []
-    if correlation_summary["rainfall_aqi"] < 0:
-        insights.append("Pollution tends to decrease on rainy days.")
-    if correlation_summary["temperature_aqi"] > 0.5:
+    if corr("air_quality_index_temperature") > 0.5:
         insights.append("Higher temperatures tend to correlate with poorer air quality.")
+    if corr("air_quality_index_humidity") < 0:
+        insights.append("Higher humidity tends to correlate with better air quality.")
+    if corr("air_quality_index_rainfall") < 0:
+        insights.append("Rainfall tends to reduce air pollution.")
+    if corr("water_quality_index_temperature") < 0:
+        insights.append("Higher temperatures tend to correlate with poorer water quality.")
+    if corr("water_quality_index_humidity") > 0.5:
+        insights.append("Higher humidity tends to correlate with poorer water quality.")
+    if corr("water_quality_index_rainfall") < 0:
+        insights.append("Rainfall tends to improve water quality.")
+    return insights
+
+async def fetch_correlation_summary(
+    db: AsyncSession,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Optional[CorrelationSummaryResponse]:
+    """
+    Compute pollution/weather correlations over the whole date range in one database round-trip.
+    Daily means come from the rollups, with days not yet refreshed aggregated from the raw tables.
+    Returns None when the two tables share no days in the range.
+    """
+    start_date, end_date = default_date_range(start_date, end_date)
+    if CORE_SETTINGS.ROLLUPS_ENABLED:
+        dirty = await fetch_dirty_days(db, start_date, end_date, ["pollution", "weather"])
+        daily_means = rollup_daily_means(start_date, end_date, dirty)
+    else:
+        daily_means = _raw_daily_means(start_date, end_date)
 
+    row = (await db.execute(_correlation_query(*daily_means))).one()
+    if not row.days:
+        return None
+
+    correlation_summary = {name: getattr(row, name) for name in CORRELATION_PAIRS}
     return CorrelationSummaryResponse(
         correlation_summary=correlation_summary,
-        insights=insights
-    )
\ No newline at end of file
+        insights=build_correlation_insights(correlation_summary)
+    )
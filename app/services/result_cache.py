@@ -0,0 +1,170 @@
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+from app.core.config import CORE_SETTINGS
+from app.core.metrics import REGISTRY
+
+# Rough per-entry bookkeeping (OrderedDict node, tuple, key/value object headers) counted against max_bytes
+ENTRY_OVERHEAD_BYTES = 200
+
+class CacheBackend(ABC):
+    """
+    Storage behind ResultCache: version tag and encoded body per key.
+
+    Values are bytes and the methods are async so a shared store (e.g. Redis) can implement
+    the same interface and serve every worker from one cache.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, version: str, value: bytes) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def clear(self) -> None:
+        ...
+
+    def stats(self) -> Dict[str, int]:
+        return {}
+
+class InMemoryLRUBackend(CacheBackend):
+    """
+    Per-process LRU bounded by the total size of keys and values. The least recently used
+    entries are evicted until a new value fits; a value larger than the bound is not stored.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"evictions": 0, "oversized": 0}
+
+    @staticmethod
+    def _size(key: str, value: bytes) -> int:
+        return len(key) + len(value) + ENTRY_OVERHEAD_BYTES
+
+    async def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    async def set(self, key: str, version: str, value: bytes) -> None:
+        size = self._size(key, value)
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                self._stats["oversized"] += 1
+                return
+            while self._bytes + size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+            self._entries[key] = (version, value)
+            self._bytes += size
+
+    async def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= self._size(key, entry[1])
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+class ResultCache:
+    """
+    Encoded query results keyed on the normalized query and tagged with the data_versions
+    of the tables they read.
+
+    Every write to pollution_data/weather_data bumps its version (statement trigger), whichever
+    worker, script or migration made it, so an entry whose tag no longer matches the versions
+    read for the current request is stale: it is dropped and recomputed (an invalidation).
+    """
+
+    def __init__(self, backend: CacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "stores": 0}
+
+    @staticmethod
+    def make_key(namespace: str, **params) -> str:
+        """
+        Stable key for a query: parameters sorted by name, dates in ISO form, sequences comma-joined.
+        Callers pass resolved values (defaulted date range, validated fields) so equivalent requests share a key.
+        """
+        parts = [namespace]
+        for name, value in sorted(params.items()):
+            if isinstance(value, (date, datetime)):
+                value = value.isoformat()
+            elif isinstance(value, (list, tuple)):
+                value = ",".join(str(item) for item in value)
+            parts.append(f"{name}={value}")
+        return "|".join(parts)
+
+    @staticmethod
+    def version_tag(versions: Dict[str, int]) -> str:
+        return ",".join(f"{table}={version}" for table, version in sorted(versions.items()))
+
+    async def get(self, key: str, versions: Dict[str, int]) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        entry = await self.backend.get(key)
+        if entry is not None:
+            tag, value = entry
+            if tag == self.version_tag(versions):
+                self._stats["hits"] += 1
+                return value
+            await self.backend.delete(key)
+            self._stats["invalidations"] += 1
+        self._stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, versions: Dict[str, int], value: bytes) -> None:
+        if not self.enabled:
+            return
+        await self.backend.set(key, self.version_tag(versions), value)
+        self._stats["stores"] += 1
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            **self.backend.stats(),
+            "hit_ratio": self._stats["hits"] / lookups if lookups else 0.0,
+        }
+
+result_cache = ResultCache(
+    InMemoryLRUBackend(max_bytes=CORE_SETTINGS.RESULT_CACHE_MAX_BYTES),
+    enabled=CORE_SETTINGS.RESULT_CACHE_ENABLED,
+)
+
+REGISTRY.gauge_callback(
+    "result_cache",
+    "Query result cache hits/misses/invalidations/evictions, size and hit ratio.",
+    ("stat",),
+    lambda: {(key,): value for key, value in result_cache.stats().items()},
+)
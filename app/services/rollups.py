@@ -0,0 +1,243 @@
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import String, and_, delete, func, insert, literal, literal_column, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import CORE_SETTINGS
+from app.db.sessions import AsyncSessionLocal
+from app.models.pollution_data import PollutionData
+from app.models.rollups import (
+    POLLUTION_ROLLUP_METRICS,
+    POLLUTION_ROLLUP_PRODUCTS,
+    ROLLUP_GRANULARITIES,
+    WEATHER_ROLLUP_METRICS,
+    PollutionRollup,
+    RollupDirtyDay,
+    WeatherRollup,
+)
+from app.models.weather_data import WeatherData
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock taken by the worker refreshing the rollups this round
+ROLLUP_REFRESH_LOCK_KEY = 0x726F6C6C
+
+def _bucket(model, granularity: str):
+    # Inline the unit so the SELECT and GROUP BY expressions are identical (bound params would differ)
+    return func.date_trunc(literal_column(f"'{granularity}'"), model.date)
+
+def _pollution_rollup_select(granularity: str, start: datetime, end: datetime):
+    bucket = _bucket(PollutionData, granularity)
+    columns = [literal(granularity, String()).label("granularity"), bucket.label("bucket"), func.count().label("sample_count")]
+    for metric in POLLUTION_ROLLUP_METRICS:
+        column = getattr(PollutionData, metric)
+        columns += [
+            func.sum(column).label(f"{metric}_sum"),
+            func.sum(column * column).label(f"{metric}_sumsq"),
+            func.min(column).label(f"{metric}_min"),
+            func.max(column).label(f"{metric}_max"),
+        ]
+    for x, y in POLLUTION_ROLLUP_PRODUCTS:
+        columns.append(func.sum(getattr(PollutionData, x) * getattr(PollutionData, y)).label(f"{x}_{y}_sum"))
+    return select(*columns).where(PollutionData.date >= start, PollutionData.date < end).group_by(bucket)
+
+def _weather_rollup_select(granularity: str, start: datetime, end: datetime):
+    bucket = _bucket(WeatherData, granularity)
+    columns = [literal(granularity, String()).label("granularity"), bucket.label("bucket"), func.count().label("sample_count")]
+    for metric in WEATHER_ROLLUP_METRICS:
+        column = getattr(WeatherData, metric)
+        columns += [
+            func.count(column).label(f"{metric}_count"),
+            func.sum(column).label(f"{metric}_sum"),
+            func.sum(column * column).label(f"{metric}_sumsq"),
+            func.min(column).label(f"{metric}_min"),
+            func.max(column).label(f"{metric}_max"),
+        ]
+    return select(*columns).where(WeatherData.date >= start, WeatherData.date < end).group_by(bucket)
+
+# source name (as written by the dirty-day triggers) -> (rollup model, rollup select builder)
+ROLLUP_SOURCES = {
+    "pollution": (PollutionRollup, _pollution_rollup_select),
+    "weather": (WeatherRollup, _weather_rollup_select),
+}
+
+def _day_ranges(days: Sequence[date]) -> List[Tuple[datetime, datetime]]:
+    """
+    Collapse days into contiguous [start, end) datetime ranges so each run is rebuilt with one statement.
+    """
+    ranges = []
+    for day in sorted(days):
+        if ranges and ranges[-1][1] == day:
+            ranges[-1][1] = day + timedelta(days=1)
+        else:
+            ranges.append([day, day + timedelta(days=1)])
+    return [(datetime.combine(start, time.min), datetime.combine(end, time.min)) for start, end in ranges]
+
+async def refresh_dirty_rollups(db: AsyncSession) -> Dict[str, int]:
+    """
+    Rebuild the hourly and daily rollups of every day marked dirty, and only those days.
+    Returns the number of days refreshed per source.
+    """
+    refreshed = {}
+    for source, (rollup_model, rollup_select) in ROLLUP_SOURCES.items():
+        # Claim the dirty days; rows written meanwhile mark their day dirty again for the next run
+        days = (await db.scalars(
+            delete(RollupDirtyDay).where(RollupDirtyDay.source == source).returning(RollupDirtyDay.day)
+        )).all()
+
+        for start, end in _day_ranges(days):
+            await db.execute(delete(rollup_model).where(rollup_model.bucket >= start, rollup_model.bucket < end))
+            for granularity in ROLLUP_GRANULARITIES:
+                query = rollup_select(granularity, start, end)
+                await db.execute(
+                    insert(rollup_model).from_select([column.name for column in query.selected_columns], query)
+                )
+        refreshed[source] = len(days)
+
+    await db.commit()
+    return refreshed
+
+async def run_rollup_refresher(interval_seconds: float) -> None:
+    """
+    Background loop that keeps the rollups current. Started from the application lifespan on
+    every worker: a transaction-level advisory lock lets one of them refresh per round, the
+    others skip it (the lock is released when the refresh commits).
+    """
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                if await db.scalar(select(func.pg_try_advisory_xact_lock(ROLLUP_REFRESH_LOCK_KEY))):
+                    await refresh_dirty_rollups(db)
+        except Exception:
+            logger.exception("Rollup refresh failed")
+        await asyncio.sleep(interval_seconds)
+
+async def fetch_dirty_days(db: AsyncSession, start_date: date, end_date: date, sources: Sequence[str]) -> Dict[str, List[date]]:
+    """
+    Days in the range, per source, with raw changes not yet folded into the rollups.
+    """
+    rows = await db.execute(select(RollupDirtyDay.source, RollupDirtyDay.day).where(
+        RollupDirtyDay.source.in_(sources),
+        RollupDirtyDay.day >= start_date,
+        RollupDirtyDay.day <= end_date,
+    ))
+    dirty = {source: [] for source in sources}
+    for source, day in rows:
+        dirty[source].append(day)
+    return dirty
+
+def current_rollup(source: str, granularity: str, start_date: date, end_date: date, dirty_days: Sequence[date]):
+    """
+    Up-to-date rollup rows between start_date and end_date (inclusive), shaped like the rollup table:
+    the stored rows of clean days plus, for the dirty days only, the same aggregates computed from
+    the raw table. A dirty today costs one day of raw rows instead of the whole range.
+    """
+    rollup_model, rollup_select = ROLLUP_SOURCES[source]
+    start, end = datetime.combine(start_date, time.min), datetime.combine(end_date + timedelta(days=1), time.min)
+    dirty_ranges = _day_ranges(dirty_days)
+
+    names = [column.name for column in rollup_select(granularity, start, end).selected_columns]
+    stored = select(*[getattr(rollup_model, name) for name in names]).where(
+        rollup_model.granularity == granularity,
+        rollup_model.bucket >= start,
+        rollup_model.bucket < end,
+    )
+    if dirty_ranges:
+        stored = stored.where(~or_(*[
+            and_(rollup_model.bucket >= range_start, rollup_model.bucket < range_end)
+            for range_start, range_end in dirty_ranges
+        ]))
+    raw = [rollup_select(granularity, range_start, range_end) for range_start, range_end in dirty_ranges]
+    return union_all(stored, *raw).subquery(f"{source}_{granularity}_rollup")
+
+def rollup_origin(dirty: Dict[str, List[date]]) -> str:
+    return "rollup+raw" if any(dirty.values()) else "rollup"
+
+def rollup_daily_means(start_date: date, end_date: date, dirty: Dict[str, List[date]]):
+    """
+    Per-day means from the current daily rollups (see current_rollup), shaped like the raw per-day
+    averages used by the correlation query: (pollution_daily, weather_daily) subqueries keyed by `day`.
+    """
+    pollution = current_rollup("pollution", "day", start_date, end_date, dirty["pollution"])
+    pollution_daily = (
+        select(
+            pollution.c.bucket.label("day"),
+            *[
+                (pollution.c[f"{metric}_sum"] / pollution.c.sample_count).label(metric)
+                for metric in ("air_quality_index", "water_quality_index", "temperature")
+            ]
+        )
+        .subquery("pollution_daily")
+    )
+    weather = current_rollup("weather", "day", start_date, end_date, dirty["weather"])
+    weather_daily = (
+        select(
+            weather.c.bucket.label("day"),
+            *[
+                (weather.c[f"{metric}_sum"] / func.nullif(weather.c[f"{metric}_count"], 0)).label(metric)
+                for metric in ("humidity", "rain_mm")
+            ]
+        )
+        .subquery("weather_daily")
+    )
+    return pollution_daily, weather_daily
+
+def _metric_statistics(count, total, total_sq, minimum, maximum) -> Dict[str, Optional[float]]:
+    count = int(count or 0)
+    if not count:
+        return {"count": 0, "mean": None, "stddev": None, "min": None, "max": None}
+    mean = total / count
+    # Sample standard deviation from the running sums; clamp tiny negative rounding errors
+    stddev = (max(total_sq - total * total / count, 0.0) / (count - 1)) ** 0.5 if count > 1 else None
+    return {"count": count, "mean": mean, "stddev": stddev, "min": minimum, "max": maximum}
+
+async def fetch_range_statistics(
+    db: AsyncSession,
+    source: str,
+    start_date: date,
+    end_date: date
+) -> Tuple[int, Dict[str, Dict[str, Optional[float]]], str]:
+    """
+    Count/mean/stddev/min/max per metric over a date range.
+    Reads O(days) rollup rows, aggregating only the dirty days from the raw table; with
+    rollups disabled the whole range is aggregated from the raw table.
+    Returns (sample_count, metrics, origin) where origin is "rollup", "rollup+raw" or "raw".
+    """
+    if source == "pollution":
+        raw_model, metrics = PollutionData, POLLUTION_ROLLUP_METRICS
+    else:
+        raw_model, metrics = WeatherData, WEATHER_ROLLUP_METRICS
+
+    if CORE_SETTINGS.ROLLUPS_ENABLED:
+        dirty = await fetch_dirty_days(db, start_date, end_date, [source])
+        daily = current_rollup(source, "day", start_date, end_date, dirty[source])
+        columns = [func.sum(daily.c.sample_count)]
+        for metric in metrics:
+            count_column = daily.c.get(f"{metric}_count", daily.c.sample_count)
+            columns += [
+                func.sum(count_column),
+                func.sum(daily.c[f"{metric}_sum"]),
+                func.sum(daily.c[f"{metric}_sumsq"]),
+                func.min(daily.c[f"{metric}_min"]),
+                func.max(daily.c[f"{metric}_max"]),
+            ]
+        row = (await db.execute(select(*columns))).one()
+        origin = rollup_origin(dirty)
+    else:
+        columns = [func.count()]
+        for metric in metrics:
+            column = getattr(raw_model, metric)
+            columns += [func.count(column), func.sum(column), func.sum(column * column), func.min(column), func.max(column)]
+        row = (await db.execute(select(*columns).where(
+            raw_model.date >= start_date,
+            raw_model.date < end_date + timedelta(days=1),
+        ))).one()
+        origin = "raw"
+
+    values = [float(value) if value is not None else None for value in row[1:]]
+    statistics = {
+        metric: _metric_statistics(*values[i * 5:(i + 1) * 5])
+        for i, metric in enumerate(metrics)
+    }
+    return int(row[0] or 0), statistics, origin
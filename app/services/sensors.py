@@ -0,0 +1,76 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.sessions import AsyncSessionLocal, SessionLocal
+from app.models.sensor import Sensor
+
+logger = logging.getLogger(__name__)
+
+class SensorRegistry:
+    """
+    In-process copy of the sensors table (code -> id) so readings can be mapped and validated
+    without a query each. An unknown code or id triggers a reload, at most once per `reload_interval`.
+    """
+
+    def __init__(self, reload_interval: float = 30.0):
+        self.reload_interval = reload_interval
+        self._ids_by_code: Dict[str, int] = {}
+        self._loaded_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def _replace(self, rows) -> None:
+        with self._lock:
+            self._ids_by_code = {code: sensor_id for sensor_id, code in rows}
+            self._loaded_at = time.monotonic()
+
+    def _stale(self) -> bool:
+        return time.monotonic() - self._loaded_at >= self.reload_interval
+
+    def reload(self) -> None:
+        with SessionLocal() as db:
+            self._replace(db.execute(select(Sensor.id, Sensor.code)).all())
+
+    async def reload_async(self) -> None:
+        async with AsyncSessionLocal() as db:
+            self._replace((await db.execute(select(Sensor.id, Sensor.code))).all())
+
+    def add(self, sensor: Sensor) -> None:
+        with self._lock:
+            self._ids_by_code[sensor.code] = sensor.id
+
+    def lookup(self, code: str) -> Optional[int]:
+        """
+        Registry id for a device code, or None when the code is not registered or the sensors
+        table can't be read. Queries only for an unknown code once the copy is stale.
+        """
+        sensor_id = self._ids_by_code.get(code)
+        if sensor_id is None and self._stale():
+            try:
+                self.reload()
+            except Exception as e:
+                logger.warning("Failed to load the sensor registry: %s", e)
+                # Don't retry on every call while the database is unavailable
+                self._loaded_at = time.monotonic()
+            sensor_id = self._ids_by_code.get(code)
+        return sensor_id
+
+    async def unknown_ids(self, sensor_ids: Iterable[int]) -> Set[int]:
+        """
+        The subset of `sensor_ids` that is not registered.
+        """
+        unknown = set(sensor_ids) - set(self._ids_by_code.values())
+        if unknown and self._stale():
+            await self.reload_async()
+            unknown -= set(self._ids_by_code.values())
+        return unknown
+
+sensor_registry = SensorRegistry()
+
+async def list_sensors(db: AsyncSession, active: Optional[bool] = None) -> List[Sensor]:
+    query = select(Sensor).order_by(Sensor.id)
+    if active is not None:
+        query = query.where(Sensor.active == active)
+    return (await db.scalars(query)).all()
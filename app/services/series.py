@@ -0,0 +1,159 @@
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import CORE_SETTINGS
+from app.models.pollution_data import PollutionData
+from app.models.rollups import POLLUTION_ROLLUP_METRICS
+from app.services.rollups import current_rollup, fetch_dirty_days, rollup_origin
+
+SERIES_BUCKETS = ("hour", "day", "week", "month")
+SERIES_METRICS = POLLUTION_ROLLUP_METRICS
+
+# Column order of a series row after `bucket` and `sample_count`
+SERIES_COLUMNS = [f"{metric}_{stat}" for metric in SERIES_METRICS for stat in ("mean", "min", "max")]
+
+def _date_trunc(bucket: str, column):
+    # Unit inlined so the SELECT and GROUP BY expressions compile identically
+    return func.date_trunc(literal_column(f"'{bucket}'"), column)
+
+def _raw_series_query(bucket: str, start: date, end: date, sensor_ids: Optional[Sequence[int]] = None):
+    """
+    Per-bucket aggregates from the raw table. With sensor_ids, one series per sensor
+    (rows led by sensor_id) from the same statement, served by the (sensor_id, date) index.
+    """
+    bucket_column = _date_trunc(bucket, PollutionData.date)
+    columns = [bucket_column.label("bucket"), func.count().label("sample_count")]
+    for metric in SERIES_METRICS:
+        column = getattr(PollutionData, metric)
+        columns += [
+            func.avg(column).label(f"{metric}_mean"),
+            func.min(column).label(f"{metric}_min"),
+            func.max(column).label(f"{metric}_max"),
+        ]
+    query = select(*columns).where(PollutionData.date >= start, PollutionData.date < end)
+    if sensor_ids:
+        return (
+            query.add_columns(PollutionData.sensor_id)
+            .where(PollutionData.sensor_id.in_(sensor_ids))
+            .group_by(PollutionData.sensor_id, bucket_column)
+            .order_by(PollutionData.sensor_id, bucket_column)
+        )
+    return query.group_by(bucket_column).order_by(bucket_column)
+
+def _rollup_series_query(bucket: str, start_date: date, end_date: date, dirty_days: Sequence[date]):
+    """
+    Same shape as the raw query, re-aggregated from the current hourly (bucket=hour) or daily rollups.
+    """
+    granularity = "hour" if bucket == "hour" else "day"
+    rollup = current_rollup("pollution", granularity, start_date, end_date, dirty_days)
+    bucket_column = _date_trunc(bucket, rollup.c.bucket)
+    sample_count = func.sum(rollup.c.sample_count)
+    columns = [bucket_column.label("bucket"), sample_count.label("sample_count")]
+    for metric in SERIES_METRICS:
+        columns += [
+            (func.sum(rollup.c[f"{metric}_sum"]) / sample_count).label(f"{metric}_mean"),
+            func.min(rollup.c[f"{metric}_min"]).label(f"{metric}_min"),
+            func.max(rollup.c[f"{metric}_max"]).label(f"{metric}_max"),
+        ]
+    return select(*columns).group_by(bucket_column).order_by(bucket_column)
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indexes of `threshold` points that keep the visual shape of y(x).
+    The first and last points are always kept; each bucket in between contributes the point forming
+    the largest triangle with the previously kept point and the mean of the next bucket.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = x.astype(float)
+    y = y.astype(float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    kept = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        next_x = x[next_lo:next_hi].mean()
+        next_y = y[next_lo:next_hi].mean()
+        # Twice the triangle area for every candidate in the bucket at once
+        area = np.abs((x[kept] - next_x) * (y[lo:hi] - y[kept]) - (x[kept] - x[lo:hi]) * (next_y - y[kept]))
+        kept = lo + int(np.argmax(area))
+        selected[i + 1] = kept
+    return selected
+
+def _series_columns(rows, max_points: Optional[int], lttb_metric: str) -> Tuple[Dict[str, list], bool]:
+    """
+    Series rows as {column: values}, reduced to max_points rows by LTTB on `lttb_metric` when longer.
+    """
+    names = ["bucket", "sample_count"] + SERIES_COLUMNS
+    columns: Dict[str, List] = {name: [row[i] for row in rows] for i, name in enumerate(names)}
+
+    downsampled = False
+    if max_points is not None and len(rows) > max_points:
+        x = np.array(columns["bucket"], dtype="datetime64[s]").astype(np.int64)
+        y = np.array(columns[lttb_metric], dtype=float)
+        keep = lttb(x, y, max_points)
+        columns = {name: [values[i] for i in keep] for name, values in columns.items()}
+        downsampled = True
+
+    for name in SERIES_COLUMNS:
+        columns[name] = [float(value) if value is not None else None for value in columns[name]]
+    columns["sample_count"] = [int(value) for value in columns["sample_count"]]
+    return columns, downsampled
+
+async def fetch_pollution_series(
+    db: AsyncSession,
+    start_date: date,
+    end_date: date,
+    bucket: str,
+    max_points: Optional[int] = None,
+    lttb_metric: str = "air_quality_index_mean"
+) -> Tuple[Dict[str, list], str, bool]:
+    """
+    Per-bucket mean/min/max of every pollution metric between start_date and end_date (inclusive).
+    Served from the rollups, with days not yet refreshed aggregated from the raw table.
+    With max_points, whole rows are picked by LTTB on `lttb_metric` so all columns stay aligned.
+    Returns (columns, origin, downsampled).
+    """
+    end = end_date + timedelta(days=1)
+    if CORE_SETTINGS.ROLLUPS_ENABLED:
+        dirty = await fetch_dirty_days(db, start_date, end_date, ["pollution"])
+        query, origin = _rollup_series_query(bucket, start_date, end_date, dirty["pollution"]), rollup_origin(dirty)
+    else:
+        query, origin = _raw_series_query(bucket, start_date, end), "raw"
+
+    rows = (await db.execute(query)).all()
+    columns, downsampled = _series_columns(rows, max_points, lttb_metric)
+    return columns, origin, downsampled
+
+async def fetch_pollution_series_by_sensor(
+    db: AsyncSession,
+    sensor_ids: Sequence[int],
+    start_date: date,
+    end_date: date,
+    bucket: str,
+    max_points: Optional[int] = None,
+    lttb_metric: str = "air_quality_index_mean"
+) -> Tuple[Dict[int, Dict[str, list]], bool]:
+    """
+    fetch_pollution_series for many sensors in one query, grouped per sensor.
+    Always aggregates the raw table (the rollups are not kept per sensor); LTTB runs per sensor.
+    Returns ({sensor_id: columns}, downsampled).
+    """
+    rows = (await db.execute(_raw_series_query(bucket, start_date, end_date + timedelta(days=1), sensor_ids))).all()
+
+    rows_by_sensor: Dict[int, list] = {sensor_id: [] for sensor_id in sensor_ids}
+    for row in rows:
+        rows_by_sensor.setdefault(row.sensor_id, []).append(row)
+
+    series, downsampled = {}, False
+    for sensor_id, sensor_rows in rows_by_sensor.items():
+        series[sensor_id], sensor_downsampled = _series_columns(sensor_rows, max_points, lttb_metric)
+        downsampled = downsampled or sensor_downsampled
+    return series, downsampled
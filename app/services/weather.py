@@ -1,8 +1,24 @@
+import asyncio
+import logging
 import os
+import random
+import threading
+import time
 import requests
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
 from dotenv import load_dotenv
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import CORE_SETTINGS
+from app.core.metrics import OUTBOUND_REQUEST_DURATION, REGISTRY
+from app.db.sessions import AsyncSessionLocal
+from app.models.weather_data import WeatherData
 from app.schemas.weather import WeatherResponse
 
+logger = logging.getLogger(__name__)
+
 load_dotenv()
 
 API_KEY = os.getenv("WEATHER_API_KEY")
@@ -12,9 +28,19 @@ BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
 LATITUDE = 28.2099
 LONGITUDE = 83.9805
 
-def get_weather() -> WeatherResponse:
+def _fetch_weather_from_api() -> WeatherResponse:
     """Fetch weather data from OpenWeather API for Phewa Lake."""
-    response = requests.get(BASE_URL, params={"lat": LATITUDE, "lon": LONGITUDE, "appid": API_KEY, "units": "metric"})
+    started = time.perf_counter()
+    try:
+        response = requests.get(
+            BASE_URL,
+            params={"lat": LATITUDE, "lon": LONGITUDE, "appid": API_KEY, "units": "metric"},
+            timeout=CORE_SETTINGS.WEATHER_API_TIMEOUT_SECONDS,
+        )
+    except requests.RequestException:
+        OUTBOUND_REQUEST_DURATION.observe(time.perf_counter() - started, "openweather", "error")
+        raise
+    OUTBOUND_REQUEST_DURATION.observe(time.perf_counter() - started, "openweather", str(response.status_code))
     if response.status_code == 200:
         data = response.json()
         return WeatherResponse(
@@ -24,9 +50,267 @@ def get_weather() -> WeatherResponse:
             humidity=data["main"]["humidity"],
             weather_description=data["weather"][0]["description"],
             wind_speed=data["wind"]["speed"],  # Adding the missing field
+            rain_mm=data.get("rain", {}).get("1h", 0.0),  # Only present while it rains
             sunrise=data["sys"]["sunrise"],  # Adding the missing field
             sunset=data["sys"]["sunset"],  # Adding the missing field
             country=data["sys"]["country"],  # Adding the missing field
         )
     else:
         raise ValueError(f"Failed to fetch weather data: {response.status_code}")
+
+class _Flight:
+    """
+    A single in-progress upstream fetch that concurrent callers wait on.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Optional[WeatherResponse] = None
+        self.error: Optional[Exception] = None
+
+class WeatherCache:
+    """
+    Process-wide TTL cache for the current weather with stale-while-revalidate.
+
+    - Within `ttl` seconds of the last fetch the cached value is returned (hit).
+    - Within a further `stale_ttl` seconds the stale value is returned immediately
+      and a single background refresh is started (stale hit).
+    - Otherwise callers block on the upstream fetch (miss). Concurrent misses
+      share one fetch instead of each calling OpenWeather (single-flight).
+    """
+
+    def __init__(self, fetch: Callable[[], WeatherResponse], ttl: float, stale_ttl: float):
+        self._fetch = fetch
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        self._value: Optional[WeatherResponse] = None
+        self._fetched_at = 0.0
+        self._flight: Optional[_Flight] = None
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+
+    def get(self) -> WeatherResponse:
+        with self._lock:
+            if self._value is not None:
+                age = time.monotonic() - self._fetched_at
+                if age < self.ttl:
+                    self._stats["hits"] += 1
+                    return self._value
+                if age < self.ttl + self.stale_ttl:
+                    self._stats["stale_hits"] += 1
+                    if self._flight is None:
+                        flight = self._flight = _Flight()
+                        threading.Thread(target=self._refresh, args=(flight,), daemon=True).start()
+                    return self._value
+
+            self._stats["misses"] += 1
+            flight = self._flight
+            leader = flight is None
+            if leader:
+                flight = self._flight = _Flight()
+
+        if leader:
+            self._refresh(flight)
+        else:
+            flight.done.wait()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _refresh(self, flight: _Flight) -> None:
+        try:
+            value = self._fetch()
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+                self._flight = None
+            flight.error = e
+        else:
+            with self._lock:
+                self._stats["refreshes"] += 1
+                self._value = value
+                self._fetched_at = time.monotonic()
+                self._flight = None
+            flight.value = value
+        finally:
+            flight.done.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._value = None
+            self._fetched_at = 0.0
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["age_seconds"] = time.monotonic() - self._fetched_at if self._value is not None else None
+        return stats
+
+weather_cache = WeatherCache(
+    fetch=_fetch_weather_from_api,
+    ttl=CORE_SETTINGS.WEATHER_CACHE_TTL_SECONDS,
+    stale_ttl=CORE_SETTINGS.WEATHER_CACHE_STALE_SECONDS,
+)
+
+REGISTRY.gauge_callback(
+    "weather_cache_events",
+    "Weather cache hit/miss/refresh counters since startup.",
+    ("event",),
+    lambda: {(event,): value for event, value in weather_cache.stats().items() if event != "age_seconds"},
+)
+
+def get_weather() -> WeatherResponse:
+    """Return the current weather for Phewa Lake, served from the shared cache."""
+    return weather_cache.get()
+
+def get_weather_cache_stats() -> Dict[str, Optional[float]]:
+    """Return hit/miss/refresh counters for the weather cache."""
+    return weather_cache.stats()
+
+class WeatherCollector:
+    """
+    Background poller that records the current weather into weather_data.
+
+    Every `interval` seconds (with +/-10% jitter so several deployments don't poll in step)
+    the current conditions are fetched with `fetch` (OpenWeather by default) and queued; queued snapshots are
+    written `batch_size` rows per INSERT. After a failed poll the next attempt is delayed by
+    an exponential backoff starting at `retry_delay`, capped at `max_backoff` and drawn at
+    random from its upper half (jitter). Snapshots that fail to write are kept for the next
+    flush. The latest snapshot is also kept in memory so /weather can serve it before it is
+    written.
+    """
+
+    def __init__(self, fetch: Callable[[], WeatherResponse], interval: float, batch_size: int, retry_delay: float, max_backoff: float):
+        if interval <= 0:
+            raise ValueError(f"Weather collector interval must be positive, got {interval}")
+        self._fetch = fetch
+        self.interval = interval
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_backoff = max_backoff
+        self._pending: List[Dict] = []
+        self._latest: Optional[Dict] = None
+        self._failures = 0
+        self._stopping = asyncio.Event()
+        self._task = None
+        self._stats = {"polls": 0, "poll_errors": 0, "written": 0, "write_errors": 0}
+
+    @property
+    def latest(self) -> Optional[Dict]:
+        return self._latest
+
+    def next_delay(self) -> float:
+        if self._failures == 0:
+            return self.interval * random.uniform(0.9, 1.1)
+        backoff = min(self.max_backoff, self.retry_delay * 2 ** (self._failures - 1))
+        return random.uniform(backoff / 2, backoff)
+
+    async def poll(self) -> bool:
+        """
+        Fetch the current weather and queue it as a snapshot. Returns False if the fetch failed.
+        """
+        self._stats["polls"] += 1
+        try:
+            # Blocking HTTP client, keep it off the event loop
+            weather = await run_in_threadpool(self._fetch)
+        except Exception as e:
+            self._failures += 1
+            self._stats["poll_errors"] += 1
+            logger.warning("Failed to collect weather snapshot: %s", e)
+            return False
+        self._failures = 0
+        self._latest = {**weather.model_dump(), "date": datetime.now()}
+        self._pending.append(self._latest)
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        return True
+
+    async def flush(self) -> int:
+        rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(WeatherData), rows)
+                await db.commit()
+        except asyncio.CancelledError:
+            self._pending = rows + self._pending
+            raise
+        except Exception as e:
+            self._stats["write_errors"] += 1
+            logger.warning("Failed to write %d weather snapshots, retrying with the next flush: %s", len(rows), e)
+            # Retry with the next flush, without growing past a day of snapshots
+            self._pending = (rows + self._pending)[-max(self.batch_size, int(86400 / self.interval)):]
+            return 0
+        self._stats["written"] += len(rows)
+        return len(rows)
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "pending": len(self._pending), "consecutive_failures": self._failures}
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            await self.poll()
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.next_delay())
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop polling once the current poll (and its write) completes, then write the snapshots still queued.
+        """
+        if self._task is not None:
+            self._stopping.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+        if self._pending:
+            logger.error("Shutting down with %d weather snapshots not written", len(self._pending))
+
+weather_collector = WeatherCollector(
+    fetch=_fetch_weather_from_api,
+    interval=CORE_SETTINGS.WEATHER_COLLECTOR_INTERVAL_SECONDS,
+    batch_size=CORE_SETTINGS.WEATHER_COLLECTOR_BATCH_SIZE,
+    retry_delay=CORE_SETTINGS.WEATHER_COLLECTOR_RETRY_SECONDS,
+    max_backoff=CORE_SETTINGS.WEATHER_COLLECTOR_MAX_BACKOFF_SECONDS,
+)
+
+REGISTRY.gauge_callback(
+    "weather_collector",
+    "Weather collector poll/write counters and queued snapshots.",
+    ("stat",),
+    lambda: {(key,): value for key, value in weather_collector.stats().items()},
+)
+
+async def get_latest_weather_snapshot(db: AsyncSession) -> WeatherResponse:
+    """
+    Return the most recent collected snapshot no older than WEATHER_SNAPSHOT_MAX_AGE_SECONDS,
+    from the collector or from weather_data (other workers, before a restart). Falls back to
+    the cached OpenWeather call when there is none.
+    """
+    cutoff = datetime.now() - timedelta(seconds=CORE_SETTINGS.WEATHER_SNAPSHOT_MAX_AGE_SECONDS)
+    latest = weather_collector.latest
+    if latest is not None and latest["date"] >= cutoff:
+        return WeatherResponse(**latest)
+
+    snapshot = await db.scalar(
+        select(WeatherData)
+        # Only the newest partitions qualify, served backwards from the (date, id) index
+        .where(WeatherData.date >= cutoff, WeatherData.city.is_not(None))
+        .order_by(WeatherData.date.desc(), WeatherData.id.desc())
+        .limit(1)
+    )
+    if snapshot is not None:
+        try:
+            return WeatherResponse.model_validate(snapshot)
+        except ValueError:
+            # Incomplete row (not written by the collector)
+            pass
+    return await run_in_threadpool(get_weather)
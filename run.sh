@@ -56,5 +56,8 @@ fi
 
 echo "Database '$DB_NAME' is available for connection."
 
+echo "Applying database migrations..."
+alembic upgrade head || exit 1
+
 echo "Starting FastAPI application..."
 uvicorn app.main:app --reload
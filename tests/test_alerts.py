@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+from app.models.alert import AlertRule
+from app.schemas.ingest import PollutionReadingIn
+from app.services.alerts import AlertEngine
+
+START = datetime(2024, 1, 1, 12, 0)
+
+def rule(rule_id: int, **overrides) -> AlertRule:
+    options = dict(
+        id=rule_id, name=f"rule {rule_id}", metric="air_quality_index", sensor_id=None, kind="threshold",
+        operator="gt", threshold=150.0, window_seconds=None, cooldown_seconds=0, enabled=True,
+    )
+    options.update(overrides)
+    return AlertRule(**options)
+
+def reading(aqi: float, minutes: int = 0, sensor_id: int = 1) -> PollutionReadingIn:
+    return PollutionReadingIn(
+        sensor_id=sensor_id, air_quality_index=aqi, water_quality_index=60, ph_level=7.2, temperature=21.5,
+        date=START + timedelta(minutes=minutes),
+    )
+
+def engine_with(*rules: AlertRule) -> AlertEngine:
+    engine = AlertEngine(flush_interval=1.0, reload_interval=60.0)
+    engine.set_rules(rules)
+    return engine
+
+def test_reload_forgets_state_of_removed_rules():
+    engine = engine_with(rule(1), rule(2, kind="rate_of_change", operator="gt", threshold=50.0, window_seconds=600))
+    engine.evaluate([reading(200, 0), reading(300, 5)])
+    assert {key[0] for key in engine._active} == {1, 2}
+    assert {key[0] for key in engine._windows} == {2}
+
+    engine.set_rules([rule(1), rule(2, enabled=False, kind="rate_of_change", window_seconds=600)])
+
+    assert {key[0] for key in engine._active} == {1}
+    assert {key[0] for key in engine._last_fired} == {1}
+    assert engine._windows == {}
+
+def test_threshold_fires_once_per_breach_and_rearms():
+    engine = engine_with(rule(1))
+    assert engine.evaluate([reading(100, 0), reading(200, 1), reading(210, 2), reading(220, 3)]) == 1
+    # Back under the threshold re-arms the rule
+    assert engine.evaluate([reading(120, 4), reading(180, 5)]) == 1
+    assert [alert["value"] for alert in engine._pending] == [200, 180]
+
+def test_breaches_are_tracked_per_sensor():
+    engine = engine_with(rule(1))
+    assert engine.evaluate([reading(200, 0, sensor_id=1), reading(200, 0, sensor_id=2), reading(210, 1, sensor_id=1)]) == 2
+
+def test_sensor_specific_rule_ignores_other_sensors():
+    engine = engine_with(rule(1, sensor_id=2))
+    assert engine.evaluate([reading(200, 0, sensor_id=1)]) == 0
+    assert engine.evaluate([reading(200, 0, sensor_id=2)]) == 1
+
+def test_cooldown_suppresses_refire():
+    engine = engine_with(rule(1, cooldown_seconds=600))
+    assert engine.evaluate([reading(200, 0), reading(100, 1), reading(200, 2)]) == 1
+    assert engine.stats()["suppressed"] == 1
+    # After the cooldown the next breach fires again
+    assert engine.evaluate([reading(100, 12), reading(200, 13)]) == 1
+
+def test_lt_operator():
+    engine = engine_with(rule(1, operator="lt", threshold=20.0))
+    assert engine.evaluate([reading(30, 0), reading(10, 1)]) == 1
+
+def test_rate_of_change_within_window():
+    engine = engine_with(rule(1, kind="rate_of_change", threshold=50.0, window_seconds=600))
+    # +40 over 5 minutes: below the threshold
+    assert engine.evaluate([reading(100, 0), reading(140, 5)]) == 0
+    # +60 against the oldest reading still in the 10 minute window
+    assert engine.evaluate([reading(160, 9)]) == 1
+    assert engine._pending[-1]["value"] == 60
+
+def test_rate_of_change_drops_readings_outside_window():
+    engine = engine_with(rule(1, kind="rate_of_change", threshold=50.0, window_seconds=600))
+    # The 100 reading has left the window by minute 20, so the change is measured from 140
+    assert engine.evaluate([reading(100, 0), reading(140, 15), reading(170, 20)]) == 0
+
+def test_rate_of_change_ignores_late_readings():
+    engine = engine_with(rule(1, kind="rate_of_change", threshold=50.0, window_seconds=600))
+    engine.evaluate([reading(100, 5)])
+    assert engine.evaluate([reading(200, 1)]) == 0
+    assert len(engine._windows[(1, 1)]) == 1
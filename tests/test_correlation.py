@@ -0,0 +1,68 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.correlation import DAILY_SERIES_METRICS, analyze_correlations, lag_correlation, rolling_correlation
+
+def _series(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(100, 20, n)
+    y = 0.5 * x + rng.normal(0, 10, n)
+    return x, y
+
+def test_rolling_correlation_matches_pandas():
+    x, y = _series(60)
+    expected = pd.Series(x).rolling(14).corr(pd.Series(y)).to_numpy()[13:]
+    np.testing.assert_allclose(rolling_correlation(x, y, 14, 7), expected, rtol=1e-9)
+
+def test_rolling_correlation_skips_nan_pairs_and_sparse_windows():
+    x, y = _series(30)
+    x[5:12] = np.nan
+    result = rolling_correlation(x, y, 10, 5)
+    for i, value in enumerate(result):
+        window = slice(i, i + 10)
+        valid = ~np.isnan(x[window])
+        if valid.sum() < 5:
+            assert np.isnan(value)
+        else:
+            assert value == pytest.approx(np.corrcoef(x[window][valid], y[window][valid])[0, 1])
+
+def test_rolling_correlation_shorter_than_window():
+    x, y = _series(5)
+    assert len(rolling_correlation(x, y, 30, 15)) == 0
+
+def test_lag_correlation_matches_pandas_shift():
+    x, y = _series(90, seed=1)
+    lags, values = lag_correlation(x, y, 7, 10)
+    assert lags == list(range(-7, 8))
+    for lag, value in zip(lags, values):
+        expected = pd.Series(x).corr(pd.Series(y).shift(lag), min_periods=10)
+        assert value == pytest.approx(expected)
+
+def test_lag_correlation_finds_leading_series():
+    rng = np.random.default_rng(2)
+    y = rng.normal(0, 1, 120)
+    x = np.concatenate((rng.normal(0, 1, 3), y[:-3]))
+    lags, values = lag_correlation(x, y, 7, 10)
+    assert lags[int(np.nanargmax(values))] == 3
+
+@pytest.mark.parametrize("days", [1, 2, 4, 7, 8, 14])
+def test_lag_correlation_range_shorter_than_max_lag(days):
+    x, y = _series(days)
+    lags, values = lag_correlation(x, y, 7, 2)
+    assert len(values) == len(lags) == 15
+    for lag, value in zip(lags, values):
+        if abs(lag) >= days or days - abs(lag) < 2:
+            assert np.isnan(value)
+
+def test_analyze_correlations_short_range():
+    rng = np.random.default_rng(3)
+    series = {metric: rng.normal(50, 10, 4) for metric in DAILY_SERIES_METRICS}
+    analysis = analyze_correlations(series, date(2024, 1, 1), window=30, max_lag=7, min_periods=2)
+    assert analysis["days"] == []
+    assert len(analysis["lags"]) == 15
+    for name, values in analysis["lag_correlation"].items():
+        assert len(values) == 15
+        assert values[0] is None and values[-1] is None
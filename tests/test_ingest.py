@@ -0,0 +1,67 @@
+import asyncio
+
+from sqlalchemy.exc import OperationalError
+
+from app.schemas.ingest import PollutionReadingIn
+from app.services import ingest
+
+READING = PollutionReadingIn(air_quality_index=80, water_quality_index=60, ph_level=7.2, temperature=21.5)
+
+class FakeSession:
+    """
+    Stands in for AsyncSessionLocal: records written rows, optionally slowly or failing.
+    """
+    written = []
+    delay = 0.0
+    fail = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, rows):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise OperationalError("INSERT", {}, Exception("connection refused"))
+        FakeSession.written.extend(rows)
+
+    async def commit(self):
+        pass
+
+def _fake_session(monkeypatch, delay=0.0, fail=False):
+    monkeypatch.setattr(FakeSession, "written", [])
+    monkeypatch.setattr(FakeSession, "delay", delay)
+    monkeypatch.setattr(FakeSession, "fail", fail)
+    monkeypatch.setattr(ingest, "AsyncSessionLocal", FakeSession)
+
+def test_stop_waits_for_write_in_progress(monkeypatch):
+    _fake_session(monkeypatch, delay=0.2)
+
+    async def scenario():
+        buffer = ingest.PollutionIngestBuffer(max_size=100, batch_size=2, flush_interval=0.05)
+        buffer.start()
+        assert buffer.offer([READING] * 3)
+        await asyncio.sleep(0.05)
+        await buffer.stop()
+        return buffer
+
+    buffer = asyncio.run(scenario())
+    assert len(FakeSession.written) == 3
+    assert buffer.buffered == 0
+
+def test_failed_flush_requeues(monkeypatch):
+    _fake_session(monkeypatch, fail=True)
+    buffer = ingest.PollutionIngestBuffer(max_size=100, batch_size=2, flush_interval=0.05)
+    buffer.offer([READING] * 3)
+
+    assert asyncio.run(buffer.flush()) == 0
+    assert buffer.buffered == 3
+    assert buffer.stats()["failed"] == 2
+
+def test_offer_rejects_when_full():
+    buffer = ingest.PollutionIngestBuffer(max_size=2, batch_size=10, flush_interval=1.0)
+    assert buffer.offer([READING] * 2)
+    assert not buffer.offer([READING])
+    assert buffer.stats()["rejected"] == 1
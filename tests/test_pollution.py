@@ -0,0 +1,51 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.pollution_data import PollutionData
+from app.services.pollution import (
+    HISTORICAL_POLLUTION_COLUMNS,
+    decode_cursor,
+    decode_sensor_cursor,
+    encode_cursor,
+    encode_sensor_cursor,
+    resolve_fields,
+)
+
+def record(when: datetime, record_id: int) -> SimpleNamespace:
+    return SimpleNamespace(date=when, id=record_id)
+
+def test_cursor_round_trip():
+    when = datetime(2024, 3, 9, 14, 30, 5, 123456)
+    cursor = encode_cursor(record(when, 42))
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (when, 42)
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "bm9waXBl", "MjAyNC0wMS0wMXx4"])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+def test_sensor_cursor_round_trip():
+    positions = {3: record(datetime(2024, 1, 2, 3, 4), 9), 11: record(datetime(2024, 1, 3), 12)}
+    decoded = decode_sensor_cursor(encode_sensor_cursor(positions))
+    assert decoded == {3: (datetime(2024, 1, 2, 3, 4), 9), 11: (datetime(2024, 1, 3), 12)}
+
+def test_sensor_cursor_is_none_when_every_sensor_is_exhausted():
+    assert encode_sensor_cursor({}) is None
+
+def test_single_cursor_is_not_a_sensor_cursor():
+    with pytest.raises(ValueError):
+        decode_sensor_cursor(encode_cursor(record(datetime(2024, 1, 1), 1)))
+
+def test_resolve_fields_defaults():
+    assert resolve_fields(PollutionData, None, HISTORICAL_POLLUTION_COLUMNS) == HISTORICAL_POLLUTION_COLUMNS
+    assert resolve_fields(PollutionData, " , ", HISTORICAL_POLLUTION_COLUMNS) == HISTORICAL_POLLUTION_COLUMNS
+
+def test_resolve_fields_keeps_order_and_drops_duplicates():
+    assert resolve_fields(PollutionData, "date, air_quality_index,date", HISTORICAL_POLLUTION_COLUMNS) == ("date", "air_quality_index")
+
+def test_resolve_fields_rejects_unknown_columns():
+    with pytest.raises(ValueError, match="humidity"):
+        resolve_fields(PollutionData, "date,humidity", HISTORICAL_POLLUTION_COLUMNS)
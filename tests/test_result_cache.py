@@ -0,0 +1,62 @@
+import asyncio
+from datetime import date
+
+from app.services.result_cache import ENTRY_OVERHEAD_BYTES, InMemoryLRUBackend, ResultCache
+
+def _size(key: str, value: bytes) -> int:
+    return len(key) + len(value) + ENTRY_OVERHEAD_BYTES
+
+def test_lru_evicts_least_recently_used_to_fit():
+    async def scenario():
+        backend = InMemoryLRUBackend(max_bytes=3 * _size("a", b"x" * 100))
+        for key in "abc":
+            await backend.set(key, "v1", b"x" * 100)
+        # Reading "a" makes "b" the least recently used
+        await backend.get("a")
+        await backend.set("d", "v1", b"x" * 100)
+        return backend, [await backend.get(key) is not None for key in "abcd"]
+
+    backend, present = asyncio.run(scenario())
+    assert present == [True, False, True, True]
+    stats = backend.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 3 * _size("a", b"x" * 100) <= stats["max_bytes"]
+
+def test_lru_skips_values_larger_than_the_bound():
+    async def scenario():
+        backend = InMemoryLRUBackend(max_bytes=1000)
+        await backend.set("small", "v1", b"x" * 10)
+        await backend.set("big", "v1", b"x" * 1000)
+        return backend, await backend.get("big"), await backend.get("small")
+
+    backend, big, small = asyncio.run(scenario())
+    assert big is None and small is not None
+    assert backend.stats()["oversized"] == 1
+
+def test_lru_replacing_a_key_updates_its_size():
+    async def scenario():
+        backend = InMemoryLRUBackend(max_bytes=10_000)
+        await backend.set("k", "v1", b"x" * 500)
+        await backend.set("k", "v2", b"x" * 100)
+        return backend
+
+    backend = asyncio.run(scenario())
+    assert backend.stats()["bytes"] == _size("k", b"x" * 100)
+    assert backend.stats()["entries"] == 1
+
+def test_result_cache_invalidates_on_version_change():
+    async def scenario():
+        cache = ResultCache(InMemoryLRUBackend(max_bytes=10_000))
+        await cache.set("key", {"pollution_data": 1}, b"body")
+        hit = await cache.get("key", {"pollution_data": 1})
+        stale = await cache.get("key", {"pollution_data": 2})
+        return cache, hit, stale
+
+    cache, hit, stale = asyncio.run(scenario())
+    assert hit == b"body" and stale is None
+    assert cache.stats()["invalidations"] == 1
+
+def test_make_key_is_order_independent():
+    first = ResultCache.make_key("q", start_date=date(2024, 1, 1), sensor_ids=[1, 2], limit=10)
+    second = ResultCache.make_key("q", limit=10, sensor_ids=[1, 2], start_date=date(2024, 1, 1))
+    assert first == second == "q|limit=10|sensor_ids=1,2|start_date=2024-01-01"
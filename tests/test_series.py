@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from app.services.series import lttb
+
+def test_lttb_returns_everything_when_not_reducing():
+    x = np.arange(10)
+    y = np.arange(10.0)
+    np.testing.assert_array_equal(lttb(x, y, 10), np.arange(10))
+    np.testing.assert_array_equal(lttb(x, y, 50), np.arange(10))
+    # Fewer than 3 points can't keep both ends plus a bucket
+    np.testing.assert_array_equal(lttb(x, y, 2), np.arange(10))
+
+@pytest.mark.parametrize("n", [4, 5, 7, 10, 33, 100, 1001])
+def test_lttb_picks_one_point_per_bucket(n):
+    rng = np.random.default_rng(n)
+    x = np.arange(n) * 3600
+    y = rng.normal(size=n)
+    for threshold in sorted({3, 4, n // 2, n - 1} - {n}):
+        if threshold < 3:
+            continue
+        selected = lttb(x, y, threshold)
+        assert len(selected) == threshold
+        assert selected[0] == 0 and selected[-1] == n - 1
+        # Strictly increasing: every bucket is non-empty and contributes exactly one point
+        assert (np.diff(selected) > 0).all()
+        edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+        for i, index in enumerate(selected[1:-1]):
+            assert edges[i] <= index < edges[i + 1]
+
+def test_lttb_keeps_spikes():
+    y = np.zeros(500)
+    y[137], y[402] = 50.0, -40.0
+    selected = lttb(np.arange(500), y, 20)
+    assert 137 in selected and 402 in selected
+
+def test_lttb_one_point_short_of_the_input():
+    y = np.array([0.0, 5.0, 0.0, 0.0, 9.0, 0.0])
+    selected = lttb(np.arange(6), y, 5)
+    assert list(selected) == sorted(set(selected))
+    assert 4 in selected
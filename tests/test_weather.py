@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.weather import WeatherResponse
+from app.services import weather
+
+def fake_weather() -> WeatherResponse:
+    return WeatherResponse(
+        temperature=24.0, feels_like=25.1, humidity=68, weather_description="scattered clouds",
+        wind_speed=2.4, sunrise=1729210000, sunset=1729252000, city="Pokhara", country="NP",
+    )
+
+class SlowSession:
+    written = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, rows):
+        await asyncio.sleep(0.2)
+        SlowSession.written.extend(rows)
+
+    async def commit(self):
+        pass
+
+def _collector(**overrides) -> weather.WeatherCollector:
+    options = dict(fetch=fake_weather, interval=3600.0, batch_size=1, retry_delay=1.0, max_backoff=60.0)
+    options.update(overrides)
+    return weather.WeatherCollector(**options)
+
+def test_collector_stop_keeps_snapshot_being_written(monkeypatch):
+    monkeypatch.setattr(SlowSession, "written", [])
+    monkeypatch.setattr(weather, "AsyncSessionLocal", SlowSession)
+
+    async def scenario():
+        collector = _collector()
+        collector.start()
+        await asyncio.sleep(0.05)
+        await collector.stop()
+        return collector
+
+    collector = asyncio.run(scenario())
+    assert len(SlowSession.written) == 1
+    assert collector.stats()["pending"] == 0
+
+def test_collector_rejects_non_positive_interval():
+    with pytest.raises(ValueError):
+        _collector(interval=0)
+
+def test_collector_backoff_grows_and_is_capped():
+    collector = _collector(retry_delay=10.0, max_backoff=40.0)
+    collector._failures = 1
+    assert 5.0 <= collector.next_delay() <= 10.0
+    collector._failures = 10
+    assert 20.0 <= collector.next_delay() <= 40.0
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+def _cache(monkeypatch, fetch, ttl=300.0, stale_ttl=600.0):
+    clock = Clock()
+    monkeypatch.setattr(weather, "time", SimpleNamespace(monotonic=clock.monotonic, perf_counter=time.perf_counter))
+    return weather.WeatherCache(fetch=fetch, ttl=ttl, stale_ttl=stale_ttl), clock
+
+def test_cache_serves_within_ttl(monkeypatch):
+    calls = []
+    cache, clock = _cache(monkeypatch, lambda: calls.append(1) or fake_weather())
+    cache.get()
+    clock.now += 299
+    cache.get()
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+def test_cache_serves_stale_and_refreshes_in_background(monkeypatch):
+    calls = []
+    cache, clock = _cache(monkeypatch, lambda: calls.append(1) or fake_weather())
+    first = cache.get()
+    clock.now += 400
+    assert cache.get() is first
+    # The background refresh thread replaces the value
+    for _ in range(100):
+        if cache.stats()["refreshes"] == 2:
+            break
+        time.sleep(0.01)
+    assert len(calls) == 2
+    assert cache.stats()["stale_hits"] == 1
+
+def test_cache_refetches_after_stale_window(monkeypatch):
+    calls = []
+    cache, clock = _cache(monkeypatch, lambda: calls.append(1) or fake_weather())
+    cache.get()
+    clock.now += 901
+    cache.get()
+    assert len(calls) == 2
+    assert cache.stats()["misses"] == 2
+
+def test_concurrent_misses_share_one_fetch(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        release.wait(timeout=5)
+        return fake_weather()
+
+    cache, _ = _cache(monkeypatch, slow_fetch)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert len(calls) == 1
+    assert len(results) == 8
+
+def test_fetch_error_reaches_every_waiter_and_is_not_cached(monkeypatch):
+    def failing_fetch():
+        raise ValueError("Failed to fetch weather data: 500")
+
+    cache, _ = _cache(monkeypatch, failing_fetch)
+    with pytest.raises(ValueError):
+        cache.get()
+    cache._fetch = fake_weather
+    assert cache.get().city == "Pokhara"
+    assert cache.stats()["errors"] == 1